@@ -1,7 +1,9 @@
-from .api import api
-from .macro.apply import apply
-from .macro.destroy import destroy
-from .macro.init import init
-from .namespace import namespace
-
-list_groups = [api, namespace, apply, destroy, init]
+# Top-level commands: name -> (import path, short help). Modules are imported
+# only when a command resolves to them (see Babylon.utils.lazy_group).
+COMMANDS = {
+    "api": ("Babylon.commands.api:api", "Cosmotech API"),
+    "namespace": ("Babylon.commands.namespace:namespace", "Babylon namespace"),
+    "apply": ("Babylon.commands.macro.apply:apply", "Macro Apply"),
+    "destroy": ("Babylon.commands.macro.destroy:destroy", "Macro Destroy"),
+    "init": ("Babylon.commands.macro.init:init", "Scaffolds a new Babylon project structure using YAML templates."),
+}
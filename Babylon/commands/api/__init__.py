@@ -1,19 +1,20 @@
 from click import group
 
-from .dataset import datasets
-from .meta import about
-from .organization import organizations
-from .run import runs
-from .runner import runners
-from .solution import solutions
-from .workspace import workspaces
+from Babylon.utils.lazy_group import LazyGroup
 
+API_COMMANDS = {
+    "organizations": ("Babylon.commands.api.organization:organizations", "Organization - Cosmotech API"),
+    "solutions": ("Babylon.commands.api.solution:solutions", "Solution - Cosmotech API"),
+    "workspaces": ("Babylon.commands.api.workspace:workspaces", "Workspace - Cosmotech API"),
+    "datasets": ("Babylon.commands.api.dataset:datasets", "Dataset - Cosmotech API"),
+    "runners": ("Babylon.commands.api.runner:runners", "Runner - Cosmotech API"),
+    "runs": ("Babylon.commands.api.run:runs", "Run - Cosmotech API"),
+    "about": ("Babylon.commands.api.meta:about", "Get API about information"),
+    "batch": ("Babylon.commands.api.batch:batch", "Run API operations listed in a JSONL or YAML file."),
+}
 
-@group()
+
+@group(cls=LazyGroup, lazy_commands=API_COMMANDS)
 def api():
     """Cosmotech API"""
     pass
-
-
-for _command in [organizations, solutions, workspaces, datasets, runners, runs, about]:
-    api.add_command(_command)
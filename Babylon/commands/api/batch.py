@@ -0,0 +1,229 @@
+"""
+``babylon api batch``: run a list of API operations in a single process.
+
+Each operation names an ``api`` sub-command as ``<group>.<command>`` (for
+instance ``datasets.create`` or ``runners.start``) and gives its parameters
+with the same names as the command options::
+
+    {"id": "org", "op": "organizations.create", "params": {"payload": {"name": "My org"}}}
+    {"op": "solutions.create", "params": {"organization_id": "$ops[org].id", "payload_file": "solution.yaml"}}
+
+``payload_file`` is resolved relative to the operations file; ``payload``
+gives the payload inline instead. ``$ops[N]`` (0-based position) or
+``$ops[<id>]`` refers to the data returned by an earlier operation, followed
+by an optional path such as ``.id`` or ``.security.accessControlList[0].id``.
+
+The Keycloak token, the configuration and the pooled API client are shared
+by every operation. With ``--concurrency`` above 1, operations that do not
+reference each other (directly or through ``after``) run in parallel.
+"""
+
+import json
+from logging import getLogger
+from pathlib import Path
+from re import compile
+from tempfile import TemporaryDirectory
+from typing import Any
+
+from click import Command, File, Group, IntRange, argument, command, get_current_context, option
+from click import Path as ClickPath
+
+from Babylon.utils.credentials import get_keycloak_token
+from Babylon.utils.decorators import injectcontext
+from Babylon.utils.environment import Environment
+from Babylon.utils.executor import FAILED, SUCCEEDED, Node, run_graph
+from Babylon.utils.response import CommandResponse
+from Babylon.utils.yaml_utils import safe_dump, safe_load
+
+logger = getLogger(__name__)
+env = Environment()
+
+# Whole reference: ``$ops[3].id`` or ``$ops[create_org].security.accessControlList[0]``
+_REF_RE = compile(r"\$ops\[([\w\-]+)\]((?:\.[\w\-]+|\[\d+\])*)")
+_PATH_PART_RE = compile(r"\.([\w\-]+)|\[(\d+)\]")
+_RESERVED_PARAMS = {"context", "tenant", "output_format", "output_file"}
+
+
+class BatchError(ValueError):
+    """Invalid operation list or unresolvable reference."""
+
+
+def load_operations(path: Path) -> list[dict]:
+    """Read operations from a JSONL file or a YAML list."""
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() in {".yaml", ".yml"}:
+        operations = safe_load(text) or []
+    else:
+        operations = [json.loads(line) for line in text.splitlines() if line.strip() and not line.lstrip().startswith("#")]
+    if not isinstance(operations, list) or not all(isinstance(op, dict) and op.get("op") for op in operations):
+        raise BatchError("Each operation must be a mapping with an 'op' key")
+    return operations
+
+
+def operation_keys(operations: list[dict]) -> dict[str, int]:
+    """Map every way of referring to an operation (position and ``id``) to its position."""
+    keys = {str(index): index for index in range(len(operations))}
+    for index, operation in enumerate(operations):
+        if "id" in operation:
+            op_id = str(operation["id"])
+            if op_id in keys:
+                raise BatchError(f"Duplicate operation id '{op_id}'")
+            keys[op_id] = index
+    return keys
+
+
+def _references(value: Any) -> set[str]:
+    if isinstance(value, str):
+        return {match.group(1) for match in _REF_RE.finditer(value)}
+    if isinstance(value, dict):
+        return set().union(*(_references(v) for v in value.values())) if value else set()
+    if isinstance(value, list):
+        return set().union(*(_references(v) for v in value)) if value else set()
+    return set()
+
+
+def _lookup(data: Any, path: str, reference: str) -> Any:
+    for key, index in _PATH_PART_RE.findall(path):
+        try:
+            data = data[int(index)] if index else data[key]
+        except (KeyError, IndexError, TypeError):
+            raise BatchError(f"Reference '{reference}' does not match the operation output") from None
+    return data
+
+
+def resolve_references(value: Any, outputs: dict[int, Any], keys: dict[str, int]) -> Any:
+    """Replace ``$ops[...]`` references in *value* by the outputs of earlier operations.
+
+    A string made of a single reference is replaced by the referenced value
+    itself (dict, list, number...); references inside a longer string are
+    substituted as text.
+    """
+    if isinstance(value, dict):
+        return {k: resolve_references(v, outputs, keys) for k, v in value.items()}
+    if isinstance(value, list):
+        return [resolve_references(v, outputs, keys) for v in value]
+    if not isinstance(value, str):
+        return value
+
+    def _value(match) -> Any:
+        name = match.group(1)
+        if name not in keys or keys[name] not in outputs:
+            raise BatchError(f"Reference '{match.group(0)}' points to an operation that has not run")
+        return _lookup(outputs[keys[name]], match.group(2), match.group(0))
+
+    whole = _REF_RE.fullmatch(value)
+    if whole:
+        return _value(whole)
+    return _REF_RE.sub(lambda match: str(_value(match)), value)
+
+
+def _find_command(root: Group, name: str) -> Command:
+    ctx = get_current_context(silent=True)
+    group_name, _, command_name = name.partition(".")
+    cmd = root.get_command(ctx, group_name)
+    if isinstance(cmd, Group):
+        cmd = cmd.get_command(ctx, command_name)
+    elif command_name:
+        cmd = None
+    if cmd is None or cmd.name == "batch":
+        raise BatchError(f"Unknown operation '{name}'")
+    return cmd
+
+
+def build_batch_graph(root: Group, operations: list[dict], base_dir: Path, work_dir: Path, outputs: dict[int, Any]) -> list[Node]:
+    """Create one executor node per operation; references and ``after`` become dependencies."""
+    keys = operation_keys(operations)
+    nodes = []
+    for index, operation in enumerate(operations):
+        cmd = _find_command(root, operation["op"])
+        params = dict(operation.get("params") or {})
+        param_names = {p.name for p in cmd.params}
+        accepted = param_names - _RESERVED_PARAMS | {"payload"}
+        unknown = set(params) - accepted
+        if unknown:
+            raise BatchError(f"Operation {index} ({operation['op']}): unsupported parameter(s) {', '.join(sorted(unknown))}")
+
+        depends_on = set()
+        for ref in _references(params) | {str(a) for a in operation.get("after", [])}:
+            if ref not in keys:
+                raise BatchError(f"Operation {index} refers to unknown operation '{ref}'")
+            if keys[ref] >= index:
+                raise BatchError(f"Operation {index} can only refer to earlier operations (got '{ref}')")
+            depends_on.add(str(keys[ref]))
+
+        def _run(index=index, cmd=cmd, params=params, param_names=param_names) -> CommandResponse:
+            resolved = resolve_references(params, outputs, keys)
+            if "payload" in resolved:
+                payload_file = work_dir / f"payload-{index}.yaml"
+                payload_file.write_text(safe_dump(resolved.pop("payload"), sort_keys=False), encoding="utf-8")
+                resolved["payload_file"] = str(payload_file)
+            elif resolved.get("payload_file"):
+                resolved["payload_file"] = str(base_dir / resolved["payload_file"])
+            # Commands decorated with ``injectcontext`` would otherwise reset the namespace to namespace.yaml
+            namespace = {"context": env.context_id, "tenant": env.environ_id}
+            resolved.update({name: value for name, value in namespace.items() if name in param_names})
+            response = get_current_context().invoke(cmd, **resolved)
+            if isinstance(response, CommandResponse):
+                outputs[index] = response.data
+            return response
+
+        nodes.append(Node(id=str(index), run=_run, depends_on=depends_on, order=index))
+    return nodes
+
+
+def run_batch(root: Group, operations: list[dict], base_dir: Path, concurrency: int = 1) -> list[dict]:
+    """Run *operations* and return one result record per operation, in file order."""
+    outputs: dict[int, Any] = {}
+    with TemporaryDirectory(prefix="babylon-batch-") as work_dir:
+        nodes = build_batch_graph(root, operations, base_dir, Path(work_dir), outputs)
+        result = run_graph(nodes, parallelism=concurrency)
+
+    records = []
+    for index, operation in enumerate(operations):
+        status = result.statuses.get(str(index))
+        record = {"index": index, "id": operation.get("id"), "op": operation["op"], "status": status}
+        if index in outputs:
+            record["data"] = outputs[index]
+        if status == FAILED:
+            error = result.errors.get(str(index))
+            record["error"] = str(error) if error else "command failed"
+        records.append(record)
+    return records
+
+
+@command()
+@injectcontext()
+@option("--concurrency", type=IntRange(min=1), default=1, show_default=True, help="Maximum number of operations running at once")
+@option(
+    "--results", "results_file", type=File("w", encoding="utf-8"), default="-", help="JSONL file receiving one result per operation"
+)
+@argument("operations_file", type=ClickPath(exists=True, dir_okay=False, path_type=Path))
+def batch(operations_file: Path, concurrency: int, results_file) -> CommandResponse:
+    """
+    Run API operations listed in a JSONL or YAML file.
+
+    Each operation is {"op": "<group>.<command>", "params": {...}}; parameters
+    may refer to earlier results with $ops[N].field or $ops[<id>].field.
+    """
+    from Babylon.commands.api import api
+
+    try:
+        operations = load_operations(operations_file)
+        # Fetch the token once up front; every operation reuses the cached token and API client
+        token, _ = get_keycloak_token() or (None, None)
+        if not token:
+            logger.error("  [bold red]✘[/bold red] Could not get a Keycloak token, no operation was run")
+            return CommandResponse.fail()
+        records = run_batch(api, operations, operations_file.parent, concurrency)
+    except (BatchError, ValueError) as e:
+        logger.error(f"  [bold red]✘[/bold red] Invalid operations file: {e}")
+        return CommandResponse.fail()
+
+    for record in records:
+        results_file.write(json.dumps(record, default=str) + "\n")
+    failed = [r for r in records if r["status"] != SUCCEEDED]
+    if failed:
+        logger.error(f"  [bold red]✘[/bold red] {len(failed)}/{len(records)} operation(s) failed or were skipped")
+        return CommandResponse.fail(data={"results": records})
+    logger.info(f"  [bold green]✔[/bold green] {len(records)} operation(s) completed")
+    return CommandResponse.success({"results": records})
@@ -2,26 +2,24 @@ from dataclasses import dataclass
 from logging import getLogger
 
 from click import Path, argument, group, option
-from cosmotech_api import ApiClient, Configuration, DatasetApi
+from cosmotech_api import DatasetApi
 from cosmotech_api.models.dataset_create_request import DatasetCreateRequest
 from cosmotech_api.models.dataset_part_create_request import DatasetPartCreateRequest
 from cosmotech_api.models.dataset_part_update_request import DatasetPartUpdateRequest
 from cosmotech_api.models.dataset_update_request import DatasetUpdateRequest
-from yaml import safe_load
 
 from Babylon.utils import API_REQUEST_MESSAGE
+from Babylon.utils.api_clients import get_api
 from Babylon.utils.credentials import pass_keycloak_token
 from Babylon.utils.decorators import injectcontext, output_to_file
 from Babylon.utils.response import CommandResponse
+from Babylon.utils.yaml_utils import safe_load
 
 logger = getLogger(__name__)
 
 
 def get_dataset_api_instance(config: dict, keycloak_token: str) -> DatasetApi:
-    configuration = Configuration(host=config.get("api_url"))
-    configuration.access_token = keycloak_token
-    api_client = ApiClient(configuration)
-    return DatasetApi(api_client)
+    return get_api(DatasetApi, config, keycloak_token)
 
 
 @group()
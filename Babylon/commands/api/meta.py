@@ -1,9 +1,10 @@
 from logging import getLogger
 
 from click import command
-from cosmotech_api import ApiClient, Configuration, MetaApi
+from cosmotech_api import MetaApi
 from cosmotech_api.models.about_info import AboutInfo
 
+from Babylon.utils.api_clients import get_api
 from Babylon.utils.credentials import pass_keycloak_token
 from Babylon.utils.decorators import injectcontext, output_to_file
 from Babylon.utils.response import CommandResponse
@@ -12,10 +13,7 @@ logger = getLogger(__name__)
 
 
 def get_meta_api_instance(config: dict, keycloak_token: str) -> MetaApi:
-    configuration = Configuration(host=config.get("api_url"))
-    configuration.access_token = keycloak_token
-    api_client = ApiClient(configuration)
-    return MetaApi(api_client)
+    return get_api(MetaApi, config, keycloak_token)
 
 
 @command()
@@ -1,9 +1,10 @@
 from logging import getLogger
 
 from click import group, option
-from cosmotech_api import ApiClient, Configuration, RunApi
+from cosmotech_api import RunApi
 
 from Babylon.utils import API_REQUEST_MESSAGE
+from Babylon.utils.api_clients import get_api
 from Babylon.utils.credentials import pass_keycloak_token
 from Babylon.utils.decorators import injectcontext, output_to_file
 from Babylon.utils.response import CommandResponse
@@ -12,10 +13,7 @@ logger = getLogger(__name__)
 
 
 def get_run_api_instance(config: dict, keycloak_token: str) -> RunApi:
-    configuration = Configuration(host=config.get("api_url"))
-    configuration.access_token = keycloak_token
-    api_client = ApiClient(configuration)
-    return RunApi(api_client)
+    return get_api(RunApi, config, keycloak_token)
 
 
 @group()
@@ -1,24 +1,22 @@
 from logging import getLogger
 
 from click import Path, argument, group, option
-from cosmotech_api import ApiClient, Configuration, SolutionApi
+from cosmotech_api import SolutionApi
 from cosmotech_api.models.solution_create_request import SolutionCreateRequest
 from cosmotech_api.models.solution_update_request import SolutionUpdateRequest
-from yaml import safe_load
 
 from Babylon.utils import API_REQUEST_MESSAGE
+from Babylon.utils.api_clients import get_api
 from Babylon.utils.credentials import pass_keycloak_token
 from Babylon.utils.decorators import injectcontext, output_to_file
 from Babylon.utils.response import CommandResponse
+from Babylon.utils.yaml_utils import safe_load
 
 logger = getLogger(__name__)
 
 
 def get_solution_api_instance(config: dict, keycloak_token: str) -> SolutionApi:
-    configuration = Configuration(host=config.get("api_url"))
-    configuration.access_token = keycloak_token
-    api_client = ApiClient(configuration)
-    return SolutionApi(api_client)
+    return get_api(SolutionApi, config, keycloak_token)
 
 
 @group()
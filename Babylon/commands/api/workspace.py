@@ -1,24 +1,22 @@
 from logging import getLogger
 
 from click import Path, argument, group, option
-from cosmotech_api import ApiClient, Configuration, WorkspaceApi
+from cosmotech_api import WorkspaceApi
 from cosmotech_api.models.workspace_create_request import WorkspaceCreateRequest
 from cosmotech_api.models.workspace_update_request import WorkspaceUpdateRequest
-from yaml import safe_load
 
 from Babylon.utils import API_REQUEST_MESSAGE
+from Babylon.utils.api_clients import get_api
 from Babylon.utils.credentials import pass_keycloak_token
 from Babylon.utils.decorators import injectcontext, output_to_file
 from Babylon.utils.response import CommandResponse
+from Babylon.utils.yaml_utils import safe_load
 
 logger = getLogger(__name__)
 
 
 def get_workspace_api_instance(config: dict, keycloak_token: str) -> WorkspaceApi:
-    configuration = Configuration(host=config.get("api_url"))
-    configuration.access_token = keycloak_token
-    api_client = ApiClient(configuration)
-    return WorkspaceApi(api_client)
+    return get_api(WorkspaceApi, config, keycloak_token)
 
 
 @group()
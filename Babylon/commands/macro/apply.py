@@ -1,9 +1,10 @@
+from functools import partial
 from logging import getLogger
 from pathlib import Path as PathlibPath
+from re import compile
 
+from click import IntRange, argument, command, echo, option, style
 from click import Path as ClickPath
-from click import argument, command, echo, option, style
-from yaml import safe_dump, safe_load
 
 from Babylon.commands.macro.deploy_organization import deploy_organization
 from Babylon.commands.macro.deploy_solution import deploy_solution
@@ -12,10 +13,32 @@ from Babylon.commands.macro.deploy_workspace import deploy_workspace
 from Babylon.commands.macro.helpers.common import resolve_inclusion_exclusion
 from Babylon.utils.decorators import injectcontext
 from Babylon.utils.environment import Environment
+from Babylon.utils.executor import FAILED, SKIPPED, Node, run_graph
+from Babylon.utils.profiling import traced
+from Babylon.utils.response import CommandResponse
+from Babylon.utils.state_session import StateSession
+from Babylon.utils.yaml_utils import safe_dump, safe_load
 
 logger = getLogger(__name__)
 env = Environment()
 
+# Deployment order of resource kinds, also used as scheduling priority.
+KIND_ORDER = ("Organization", "Solution", "Workspace", "Webapp")
+# State keys written by each kind once deployed.
+KIND_OUTPUTS = {
+    "Organization": {"api.organization_id"},
+    "Solution": {"api.solution_id"},
+    "Workspace": {"api.workspace_id", "postgres.schema_name"},
+    "Webapp": {"webapp.webapp_name", "webapp.webapp_url"},
+}
+# State keys read directly from state (not through the template) by each kind.
+KIND_INPUTS = {
+    "Solution": {"api.organization_id"},
+    "Workspace": {"api.organization_id"},
+}
+# Matches ``${services['api.solution_id']}`` references in escaped templates.
+_SERVICES_REF_RE = compile(r"services\[\s*['\"]([\w.\-]+)['\"]\s*\]")
+
 
 def load_resources_from_files(files_to_deploy: list[PathlibPath]) -> tuple[list, list, list]:
     resources = []
@@ -37,18 +60,54 @@ def load_resources_from_files(files_to_deploy: list[PathlibPath]) -> tuple[list,
     return (organizations, solutions, workspaces, webapps)
 
 
-def deploy_objects(objects: list, object_type: str, deploy_dir: PathlibPath):
-    for o in objects:
-        content = o.get("content")
-        namespace = o.get("namespace")
-        if object_type == "organization":
-            deploy_organization(namespace=namespace, file_content=content)
-        elif object_type == "solution":
-            deploy_solution(namespace=namespace, file_content=content)
-        elif object_type == "workspace":
-            deploy_workspace(namespace=namespace, file_content=content, deploy_dir=deploy_dir)
-        elif object_type == "webapp":
-            deploy_webapp(namespace=namespace, file_content=content)
+def deploy_object(resource: dict, deploy_dir: PathlibPath, state: dict | None = None):
+    content = resource.get("content")
+    namespace = resource.get("namespace")
+    kind = resource.get("kind")
+    if kind == "Organization":
+        return deploy_organization(namespace=namespace, file_content=content, state=state)
+    if kind == "Solution":
+        return deploy_solution(namespace=namespace, file_content=content, state=state)
+    if kind == "Workspace":
+        return deploy_workspace(namespace=namespace, file_content=content, deploy_dir=deploy_dir, state=state)
+    if kind == "Webapp":
+        return deploy_webapp(namespace=namespace, file_content=content, state=state)
+
+
+def resource_dependencies(resource: dict) -> set[str]:
+    """Return the state keys a resource needs before it can be deployed."""
+    refs = set(_SERVICES_REF_RE.findall(resource.get("content") or ""))
+    return refs | KIND_INPUTS.get(resource.get("kind"), set())
+
+
+def build_deploy_graph(resources: list[dict], deploy_dir: PathlibPath, state: dict | None = None) -> list[Node]:
+    """Build the dependency graph of *resources*.
+
+    A resource depends on every resource of an earlier kind producing a state
+    key it reads, either implicitly (see ``KIND_INPUTS``) or through a
+    ``{{services[...]}}`` reference. Resources of the same kind write the same
+    state slot, so they are chained in file order instead of running concurrently.
+    """
+    ordered = sorted(resources, key=lambda r: KIND_ORDER.index(r["kind"]))
+    nodes: list[Node] = []
+    producers: dict[str, list[Node]] = {}
+    last_of_kind: dict[str, Node] = {}
+    for resource in ordered:
+        kind = resource["kind"]
+        node = Node(
+            id=f"{kind}:{PathlibPath(resource['file_path']).name}",
+            run=partial(deploy_object, resource, deploy_dir, state),
+            order=len(nodes),
+        )
+        for key in resource_dependencies(resource):
+            node.depends_on.update(p.id for p in producers.get(key, []) if not p.id.startswith(f"{kind}:"))
+        if kind in last_of_kind:
+            node.depends_on.add(last_of_kind[kind].id)
+        for key in KIND_OUTPUTS.get(kind, set()):
+            producers.setdefault(key, []).append(node)
+        last_of_kind[kind] = node
+        nodes.append(node)
+    return nodes
 
 
 def print_section(data: dict, highlight_urls: bool = False):
@@ -79,11 +138,33 @@ def print_section(data: dict, highlight_urls: bool = False):
 )
 @option("--include", "include", multiple=True, type=str, help="Specify the resources to deploy.")
 @option("--exclude", "exclude", multiple=True, type=str, help="Specify the resources to exclude from deployment.")
+@option(
+    "--parallelism",
+    "parallelism",
+    type=IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Maximum number of independent resources deployed concurrently.",
+)
+@option(
+    "--checkpoint-every",
+    "checkpoint_every",
+    type=IntRange(min=0),
+    default=0,
+    show_default=True,
+    help=(
+        "Persist state updates after every N deployed resources, 0 once at the end of the run. "
+        "IDs of created resources are always persisted at once."
+    ),
+)
+@traced("apply", "macro")
 def apply(
     deploy_dir: ClickPath,
     include: tuple[str],
     exclude: tuple[str],
     variables_files: tuple[PathlibPath],
+    parallelism: int,
+    checkpoint_every: int,
 ):
     """Macro Apply"""
     organization, solution, workspace, webapp = resolve_inclusion_exclusion(include, exclude)
@@ -91,19 +172,31 @@ def apply(
     files_to_deploy = list(filter(lambda x: x.suffix in [".yaml", ".yml"], files))
     env.set_variable_files(variables_files)
     organizations, solutions, workspaces, webapps = load_resources_from_files(files_to_deploy)
-    if organization:
-        deploy_objects(organizations, "organization", deploy_dir)
-    if solution:
-        deploy_objects(solutions, "solution", deploy_dir)
-    if workspace:
-        deploy_objects(workspaces, "workspace", deploy_dir)
-    if webapp:
-        deploy_objects(webapps, "webapp", deploy_dir)
-    final_state = env.get_state_from_local()
+    resources = [
+        *(organizations if organization else []),
+        *(solutions if solution else []),
+        *(workspaces if workspace else []),
+        *(webapps if webapp else []),
+    ]
+    if not resources:
+        logger.warning("  [yellow]⚠[/yellow] No resources to deploy")
+        return CommandResponse.success()
+    # The namespace block decides where the state lives (local or remote)
+    env.get_ns_from_text(content=resources[0]["namespace"])
+    with StateSession(env, checkpoint_every=checkpoint_every) as session:
+        graph = build_deploy_graph(resources, deploy_dir, session.state)
+        result = run_graph(graph, parallelism=parallelism)
+    for node_id in result.with_status(FAILED):
+        logger.error(f"  [bold red]✘[/bold red] Deployment of [magenta]{node_id}[/magenta] failed")
+    for node_id in result.with_status(SKIPPED):
+        logger.warning(f"  [yellow]⚠[/yellow] Deployment of [magenta]{node_id}[/magenta] skipped after a previous failure")
+    final_state = session.state
     services = final_state.get("services", {})
     api_data = services.get("api", {})
     webapp_data = services.get("webapp", {})
     echo(style("\n📋 Deployment Summary", bold=True, fg="yellow"))
     print_section(api_data)
     print_section(webapp_data)
+    if not result.ok:
+        return CommandResponse.fail()
     echo(style("\n✨ Deployment process complete", fg="white", bold=True))
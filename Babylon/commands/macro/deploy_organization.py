@@ -10,18 +10,20 @@ from Babylon.commands.api.organization import get_organization_api_instance
 from Babylon.commands.macro.helpers.common import update_object_security
 from Babylon.utils.credentials import get_keycloak_token
 from Babylon.utils.environment import Environment
+from Babylon.utils.profiling import span, traced
 from Babylon.utils.response import CommandResponse
 
 logger = getLogger(__name__)
 env = Environment()
 
 
-def deploy_organization(namespace: str, file_content: str):
+@traced("deploy.organization", "deploy")
+def deploy_organization(namespace: str, file_content: str, state: dict | None = None):
     echo(style(f"\n🚀 Deploying Organization in namespace: {env.environ_id}", bold=True, fg="cyan"))
 
     # Retrieve the state
     env.get_ns_from_text(content=namespace)
-    state = env.retrieve_state_func()
+    state = state if state is not None else env.retrieve_state_func()
     content = env.fill_template(data=file_content, state=state)
 
     # Authentication and API client initialization
@@ -30,7 +32,7 @@ def deploy_organization(namespace: str, file_content: str):
     api_section = state["services"]["api"]
 
     # Determine if we are performing a Create or Update based on state
-    api_section["organization_id"] = payload.get("id") or api_section.get("organization_id", "")
+    env.set_state_value(state, ("services", "api", "organization_id"), payload.get("id") or api_section.get("organization_id", ""))
     spec = {}
     spec["payload"] = dumps(payload, indent=2, ensure_ascii=True)
     api_instance = get_organization_api_instance(config=config, keycloak_token=keycloak_token)
@@ -40,20 +42,22 @@ def deploy_organization(namespace: str, file_content: str):
         # Case: New Organization
         logger.info("  [dim]→ No existing organization ID found. Creating...[/dim]")
         organization_create_request = OrganizationCreateRequest.from_dict(payload)
-        organization = api_instance.create_organization(organization_create_request)
+        with span("api.create_organization", "api"):
+            organization = api_instance.create_organization(organization_create_request)
         if organization is None:
             logger.error("  [bold red]✘[/bold red] Failed to create organization")
             return CommandResponse.fail()
         # Save the newly generated ID to state
         logger.info(f"  [bold green]✔[/bold green] Organization [bold magenta]{organization.id}[/bold magenta] created")
-        state["services"]["api"]["organization_id"] = organization.id
+        env.set_state_value(state, ("services", "api", "organization_id"), organization.id)
     else:
         # Case: Update Existing Organization
         logger.info(f"  [dim]→ Existing ID [bold cyan]{api_section['organization_id']}[/bold cyan] found. Updating...[/dim]")
         organization_update_request = OrganizationUpdateRequest.from_dict(payload)
-        updated = api_instance.update_organization(
-            organization_id=api_section["organization_id"], organization_update_request=organization_update_request
-        )
+        with span("api.update_organization", "api"):
+            updated = api_instance.update_organization(
+                organization_id=api_section["organization_id"], organization_update_request=organization_update_request
+            )
         if updated is None:
             logger.error(f"  [bold red]✘[/bold red] Failed to update organization {api_section['organization_id']}")
             return CommandResponse.fail()
@@ -75,6 +79,4 @@ def deploy_organization(namespace: str, file_content: str):
         logger.info(f"  [bold green]✔[/bold green] Organization [bold magenta]{api_section['organization_id']}[/bold magenta] updated")
     # --- State Persistence ---
     # Ensure the local and remote states are synchronized after successful API calls
-    env.store_state_in_local(state)
-    if env.remote:
-        env.store_state_in_kubernetes(state)
+    env.store_state(state)
@@ -10,18 +10,20 @@ from Babylon.commands.api.solution import get_solution_api_instance
 from Babylon.commands.macro.helpers.common import update_object_security
 from Babylon.utils.credentials import get_keycloak_token
 from Babylon.utils.environment import Environment
+from Babylon.utils.profiling import span, traced
 from Babylon.utils.response import CommandResponse
 
 logger = getLogger(__name__)
 env = Environment()
 
 
-def deploy_solution(namespace: str, file_content: str) -> bool:
+@traced("deploy.solution", "deploy")
+def deploy_solution(namespace: str, file_content: str, state: dict | None = None) -> bool:
     echo(style(f"\n🚀 Deploying Solution in namespace: {env.environ_id}", bold=True, fg="cyan"))
 
     # Retrieve the state
     env.get_ns_from_text(content=namespace)
-    state = env.retrieve_state_func()
+    state = state if state is not None else env.retrieve_state_func()
     content = env.fill_template(data=file_content, state=state)
 
     # Authentication and API client initialization
@@ -30,7 +32,7 @@ def deploy_solution(namespace: str, file_content: str) -> bool:
     api_section = state["services"]["api"]
 
     # Determine if we are performing a Create or Update based on state
-    api_section["solution_id"] = payload.get("id") or api_section.get("solution_id", "")
+    env.set_state_value(state, ("services", "api", "solution_id"), payload.get("id") or api_section.get("solution_id", ""))
     spec = {}
     spec["payload"] = dumps(payload, indent=2, ensure_ascii=True)
     api_instance = get_solution_api_instance(config=config, keycloak_token=keycloak_token)
@@ -40,24 +42,26 @@ def deploy_solution(namespace: str, file_content: str) -> bool:
         # Case: New Solution
         logger.info("  [dim]→ No existing solution ID found. Creating...[/dim]")
         solution_create_request = SolutionCreateRequest.from_dict(payload)
-        solution = api_instance.create_solution(
-            organization_id=api_section["organization_id"], solution_create_request=solution_create_request
-        )
+        with span("api.create_solution", "api"):
+            solution = api_instance.create_solution(
+                organization_id=api_section["organization_id"], solution_create_request=solution_create_request
+            )
         if solution is None:
             logger.error("  [bold red]✘[/bold red] Failed to create solution")
             return CommandResponse.fail()
         # Save the newly generated ID to state
         logger.info(f"  [bold green]✔[/bold green] Solution [bold magenta]{solution.id}[/bold magenta] created")
-        state["services"]["api"]["solution_id"] = solution.id
+        env.set_state_value(state, ("services", "api", "solution_id"), solution.id)
     else:
         # Case: Update Existing Solution
         logger.info(f"  [dim]→ Existing ID [bold cyan]{api_section['solution_id']}[/bold cyan] found. Updating...[/dim]")
         solution_update_request = SolutionUpdateRequest.from_dict(payload)
-        updated = api_instance.update_solution(
-            organization_id=api_section["organization_id"],
-            solution_id=api_section["solution_id"],
-            solution_update_request=solution_update_request,
-        )
+        with span("api.update_solution", "api"):
+            updated = api_instance.update_solution(
+                organization_id=api_section["organization_id"],
+                solution_id=api_section["solution_id"],
+                solution_update_request=solution_update_request,
+            )
         if updated is None:
             logger.error(f"  [bold red]✘[/bold red] Failed to update solution {api_section['solution_id']}")
             return CommandResponse.fail()
@@ -81,6 +85,4 @@ def deploy_solution(namespace: str, file_content: str) -> bool:
         logger.info(f"  [bold green]✔[/bold green] Solution [bold magenta]{api_section['solution_id']}[/bold magenta] updated")
     # --- State Persistence ---
     # Ensure the local and remote states are synchronized after successful API calls
-    env.store_state_in_local(state)
-    if env.remote:
-        env.store_state_in_kubernetes(state)
+    env.store_state(state)
@@ -7,16 +7,18 @@ from click import echo, style
 from Babylon.commands.macro.helpers.webapp import dict_to_tfvars, ensure_tf_webapp_version, run_terraform_process
 from Babylon.commands.macro.init import _TF_WEBAPP_DEFAULT_VERSION
 from Babylon.utils.environment import Environment
+from Babylon.utils.profiling import traced
 
 logger = getLogger(__name__)
 env = Environment()
 
 
-def deploy_webapp(namespace: str, file_content: str):
+@traced("deploy.webapp", "deploy")
+def deploy_webapp(namespace: str, file_content: str, state: dict | None = None):
     echo(style(f"\n🚀 Deploying webapp in namespace: {env.environ_id}", bold=True, fg="cyan"))
 
     env.get_ns_from_text(content=namespace)
-    state = env.retrieve_state_func()
+    state = state if state is not None else env.retrieve_state_func()
     content = env.fill_template(data=file_content, state=state)
     payload: dict = content.get("spec").get("payload", {})
     tf_dir = env.working_dir.template_path.parent / "terraform-webapp"
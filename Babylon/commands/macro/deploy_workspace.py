@@ -14,17 +14,19 @@ from Babylon.commands.macro.helpers.workspace import (
 )
 from Babylon.utils.credentials import get_keycloak_token, get_superset_token
 from Babylon.utils.environment import Environment
+from Babylon.utils.profiling import traced
 from Babylon.utils.response import CommandResponse
 
 logger = getLogger(__name__)
 env = Environment()
 
 
-def deploy_workspace(namespace: str, file_content: str, deploy_dir: Path) -> bool:
+@traced("deploy.workspace", "deploy")
+def deploy_workspace(namespace: str, file_content: str, deploy_dir: Path, state: dict | None = None) -> bool:
     echo(style(f"\n🚀 Deploying Workspace in namespace: {env.environ_id}", bold=True, fg="cyan"))
 
     env.get_ns_from_text(content=namespace)
-    state = env.retrieve_state_func()
+    state = state if state is not None else env.retrieve_state_func()
 
     # Phase 1 render dashboard UUID variables may not exist yet (first deploy).
     # Pass template_content so every {{var}} reference is pre-filled with "" when
@@ -35,7 +37,7 @@ def deploy_workspace(namespace: str, file_content: str, deploy_dir: Path) -> boo
     keycloak_token, config = get_keycloak_token()
     payload: dict = content.get("spec").get("payload")
     api_section = state["services"]["api"]
-    api_section["workspace_id"] = payload.get("id") or api_section.get("workspace_id", "")
+    env.set_state_value(state, ("services", "api", "workspace_id"), payload.get("id") or api_section.get("workspace_id", ""))
     api_instance = get_workspace_api_instance(config=config, keycloak_token=keycloak_token)
 
     # --- API Deployment Logic ---
@@ -71,7 +73,12 @@ def deploy_workspace(namespace: str, file_content: str, deploy_dir: Path) -> boo
             superset_jwt = get_superset_token(base_url=base_url, config=config)
             if superset_jwt and base_url:
                 # Pass zip_uuids so only dashboards from our ZIP are queried
-                _fetch_and_store_embedded_dashboard_uuids(base_url, superset_jwt, zip_uuids=zip_uuids)
+                _fetch_and_store_embedded_dashboard_uuids(
+                    base_url,
+                    superset_jwt,
+                    zip_uuids=zip_uuids,
+                    refresh_jwt=lambda: get_superset_token(base_url=base_url, config=config),
+                )
 
             # Phase 2 render variables file now contains real UUIDs.
             # fallback_empty=False: only include keys that have a real value.
@@ -82,6 +89,4 @@ def deploy_workspace(namespace: str, file_content: str, deploy_dir: Path) -> boo
                 return CommandResponse.fail()
 
     # --- State Persistence ---
-    env.store_state_in_local(state)
-    if env.remote:
-        env.store_state_in_kubernetes(state)
+    env.store_state(state)
@@ -4,10 +4,17 @@ Shared helpers used across all macro commands.
 Covers:
 - ``include`` / ``exclude`` CLI option validation and resolution
 - ACL diff computation
-- Generic object-security synchronisation (organization, solution, workspace)
+- Generic object-security synchronisation (organization, solution, workspace):
+  the diff is turned into a list of changes that run on a bounded thread pool
+  (deletes after every create and update), each call retried on throttling and
+  transient errors
 """
 
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from logging import getLogger
+from typing import Any
 
 from click import Abort, echo, style
 from cosmotech_api.models.organization_access_control import OrganizationAccessControl
@@ -16,9 +23,19 @@ from cosmotech_api.models.solution_access_control import SolutionAccessControl
 from cosmotech_api.models.solution_security import SolutionSecurity
 from cosmotech_api.models.workspace_access_control import WorkspaceAccessControl
 from cosmotech_api.models.workspace_security import WorkspaceSecurity
+from urllib3.exceptions import HTTPError
+
+from Babylon.utils.http_client import RETRY_STATUSES, THROTTLE_STATUSES, RetryPolicy, default_retry
+from Babylon.utils.profiling import traced
 
 logger = getLogger(__name__)
 
+# Maximum number of security calls sent at the same time by ``update_object_security``.
+ACL_SYNC_CONCURRENCY = 8
+
+CREATE, UPDATE, DELETE, DEFAULT = "create", "update", "delete", "default"
+_VERBS = {CREATE: ("add", "added"), UPDATE: ("update", "updated"), DELETE: ("delete", "deleted"), DEFAULT: ("update", "updated")}
+
 
 def validate_inclusion_exclusion(
     include: tuple[str],
@@ -90,51 +107,139 @@ def diff(
     return (to_add, to_delete, to_update)
 
 
-def update_default_security(
-    object_type: str,
+@dataclass(frozen=True)
+class AclChange:
+    """One security mutation: *action* on access-control entry *id* (``role`` is the new role, or the new default)."""
+
+    action: str
+    id: str
+    role: str | None = None
+    entry: Any = field(default=None, compare=False, repr=False)
+
+    def describe(self, object_type: str) -> str:
+        if self.action == DEFAULT:
+            return f"[magenta]{object_type}[/magenta] default security"
+        return f"access control for id [magenta]{self.id}[/magenta]"
+
+
+@dataclass
+class AclSyncReport:
+    """Outcome of ``update_object_security``: changes applied, failed (with the error) and skipped."""
+
+    applied: list[AclChange] = field(default_factory=list)
+    failed: list[tuple[AclChange, str]] = field(default_factory=list)
+    skipped: list[AclChange] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+def plan_security_changes(
     current_security: OrganizationSecurity | WorkspaceSecurity | SolutionSecurity,
     desired_security: OrganizationSecurity | WorkspaceSecurity | SolutionSecurity,
-    api_instance,
-    object_id: str,
-) -> None:
-    if desired_security.default != current_security.default:
+) -> tuple[list[AclChange], list[AclChange]]:
+    """Return the changes turning *current_security* into *desired_security*, and the skipped duplicate entries.
+
+    When an id appears several times in the desired access control list, the first entry wins.
+    """
+    current_ids = {entry.id for entry in current_security.access_control_list}
+    entries, skipped, seen = [], [], set()
+    for entry in desired_security.access_control_list:
+        if entry.id in seen:
+            skipped.append(AclChange(UPDATE if entry.id in current_ids else CREATE, entry.id, entry.role))
+            continue
+        seen.add(entry.id)
+        entries.append(entry)
+    (to_add, to_delete, to_update) = diff(current_security.access_control_list, entries)
+    changes = [AclChange(DEFAULT, "", desired_security.default)] if desired_security.default != current_security.default else []
+    changes += [AclChange(CREATE, entry.id, entry.role, entry) for entry in entries if entry.id in to_add]
+    changes += [AclChange(UPDATE, entry.id, entry.role) for entry in entries if entry.id in to_update]
+    changes += [AclChange(DELETE, entry_id) for entry_id in to_delete]
+    return changes, skipped
+
+
+def _is_retryable(change: AclChange, error: Exception) -> bool:
+    """Throttling is always retried; server and connection errors only when replaying the call is safe (not a create)."""
+    status = getattr(error, "status", None)
+    if status in THROTTLE_STATUSES:
+        return True
+    if change.action == CREATE:
+        return False
+    return status in RETRY_STATUSES or isinstance(error, (ConnectionError, HTTPError))
+
+
+def _apply_change(object_type: str, api_instance, object_id: list[str], change: AclChange, retry: RetryPolicy) -> None:
+    if change.action == DEFAULT:
+        args = (change.role,)
+        method = getattr(api_instance, f"update_{object_type}_default_security")
+    elif change.action == CREATE:
+        args = (change.entry,)
+        method = getattr(api_instance, f"create_{object_type}_access_control")
+    elif change.action == UPDATE:
+        args = (change.id, {"role": change.role})
+        method = getattr(api_instance, f"update_{object_type}_access_control")
+    else:
+        args = (change.id,)
+        method = getattr(api_instance, f"delete_{object_type}_access_control")
+    attempt = 0
+    while True:
         try:
-            getattr(api_instance, f"update_{object_type}_default_security")(object_id, desired_security.default)
-            logger.info(f"  [bold green]✔[/bold green] Updated [magenta]{object_type}[/magenta] default security")
+            method(*object_id, *args)
+            return
         except Exception as e:
-            logger.error(f"  [bold red]✘[/bold red] Failed to update [magenta]{object_type}[/magenta] default security: {e}")
+            if attempt + 1 >= retry.attempts or not _is_retryable(change, e):
+                raise
+            delay = retry.delay(attempt)
+            logger.debug(f"  [dim]{change.action} {change.id or 'default'} failed ({e}), retrying in {delay:.1f}s[/dim]")
+            time.sleep(delay)
+            attempt += 1
 
 
+@traced("security.sync", "security")
 def update_object_security(
     object_type: str,
     current_security: OrganizationSecurity | WorkspaceSecurity | SolutionSecurity,
     desired_security: OrganizationSecurity | WorkspaceSecurity | SolutionSecurity,
     api_instance,
     object_id: list[str],
-) -> None:
+    max_workers: int = ACL_SYNC_CONCURRENCY,
+    retry: RetryPolicy | None = None,
+) -> AclSyncReport:
     """Update object security:
-    - if default security differs from payload, update object default security
-    - diff state vs payload
-    - foreach diff: delete entries to be removed, update entries to be changed, create entries to be added
+    - diff state vs payload (default security and access control list)
+    - nothing to change: return without any API call
+    - otherwise run the default security update, creates and updates on at most *max_workers*
+      threads, then the deletes once they have all finished; throttled and transient failures
+      of each call are retried
     """
-    update_default_security(object_type, current_security, desired_security, api_instance, object_id)
-    (to_add, to_delete, to_update) = diff(current_security.access_control_list, desired_security.access_control_list)
-    for entry in desired_security.access_control_list:
-        if entry.id in to_add:
-            try:
-                getattr(api_instance, f"create_{object_type}_access_control")(*object_id, entry)
-                logger.info(f"  [bold green]✔[/bold green] Access control for id [magenta]{entry.id}[/magenta] added successfully")
-            except Exception as e:
-                logger.error(f"  [bold red]✘[/bold red] Failed to add access control for id [magenta]{entry.id}[/magenta]: {e}")
-        if entry.id in to_update:
-            try:
-                getattr(api_instance, f"update_{object_type}_access_control")(*object_id, entry.id, {"role": entry.role})
-                logger.info(f"  [bold green]✔[/bold green] Access control for id [magenta]{entry.id}[/magenta] updated successfully")
-            except Exception as e:
-                logger.error(f"  [bold red]✘[/bold red] Failed to update access control for id [magenta]{entry.id}[/magenta]: {e}")
-    for entry_id in to_delete:
-        try:
-            getattr(api_instance, f"delete_{object_type}_access_control")(*object_id, entry_id)
-            logger.info(f"  [bold green]✔[/bold green] Access control for id [magenta]{entry_id}[/magenta] deleted successfully")
-        except Exception as e:
-            logger.error(f"  [bold red]✘[/bold red] Failed to delete access control for id [magenta]{entry_id}[/magenta]: {e}")
+    changes, skipped = plan_security_changes(current_security, desired_security)
+    report = AclSyncReport(skipped=skipped)
+    for change in skipped:
+        logger.warning(f"  [yellow]⚠[/yellow] Duplicate access control for id [magenta]{change.id}[/magenta] skipped")
+    if not changes:
+        logger.info("  [dim]→ Security already up to date[/dim]")
+        return report
+
+    retry = retry or default_retry
+    # Deletes run only once every create and update has finished, so that swapping an
+    # administrator never leaves the object without one.
+    phases = ([change for change in changes if change.action != DELETE], [change for change in changes if change.action == DELETE])
+    workers = max(1, min(max_workers, max(len(phase) for phase in phases)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="acl-sync") as pool:
+        for phase in phases:
+            futures = [pool.submit(_apply_change, object_type, api_instance, object_id, change, retry) for change in phase]
+            for change, future in zip(phase, futures):
+                error = future.exception()
+                if error is None:
+                    report.applied.append(change)
+                    logger.info(f"  [bold green]✔[/bold green] {_VERBS[change.action][1].capitalize()} {change.describe(object_type)}")
+                else:
+                    report.failed.append((change, str(error)))
+                    logger.error(
+                        f"  [bold red]✘[/bold red] Failed to {_VERBS[change.action][0]} {change.describe(object_type)}: {error}"
+                    )
+    if report.failed:
+        counts = f"{len(report.applied)} applied, {len(report.failed)} failed, {len(report.skipped)} skipped"
+        logger.warning(f"  [yellow]⚠[/yellow] Security sync incomplete: {counts}")
+    return report
@@ -17,6 +17,7 @@ from sys import exit
 from click import echo, style
 
 from Babylon.utils.environment import Environment
+from Babylon.utils.profiling import traced
 
 logger = getLogger(__name__)
 env = Environment()
@@ -72,15 +73,13 @@ def _finalize_deployment(payload: dict, state: dict) -> None:
     webapp_name = payload.get("webapp_name")
     url = f"https://{payload.get('cluster_name')}.{payload.get('domain_zone')}/tenant-{payload.get('tenant')}/webapp-{webapp_name}"
 
-    services = state.setdefault("services", {})
-    services["webapp"] = {"webapp_name": f"webapp-{webapp_name}", "webapp_url": url}
+    env.set_state_value(state, ("services", "webapp"), {"webapp_name": f"webapp-{webapp_name}", "webapp_url": url})
 
     logger.info(f"  [bold green]✔[/bold green] WebApp [bold white]{webapp_name}[/bold white] deployed")
-    env.store_state_in_local(state)
-    if env.remote:
-        env.store_state_in_kubernetes(state)
+    env.store_state(state)
 
 
+@traced("terraform.apply", "terraform")
 def run_terraform_process(executable: list[str], cwd, payload: dict, state: dict) -> None:
     """Stream a Terraform subprocess and finalize state on success.
 
@@ -131,6 +130,7 @@ def run_terraform_process(executable: list[str], cwd, payload: dict, state: dict
 # ---------------------------------------------------------------------------
 
 
+@traced("terraform.destroy", "terraform")
 def destroy_webapp(state: dict) -> None:
     """Run Terraform destroy to tear down WebApp infrastructure."""
     logger.info("  [dim]→ Running Terraform destroy for WebApp resources...[/dim]")
@@ -175,9 +175,8 @@ def destroy_webapp(state: dict) -> None:
 
         process.wait()
         if process.returncode == 0:
-            state.setdefault("services", {}).setdefault("webapp", {})
-            state["services"]["webapp"]["webapp_name"] = ""
-            state["services"]["webapp"]["webapp_url"] = ""
+            env.set_state_value(state, ("services", "webapp", "webapp_name"), "")
+            env.set_state_value(state, ("services", "webapp", "webapp_url"), "")
             logger.info(f"   [green]✔[/green] WebApp [magenta]{webapp_name}[/magenta] destroyed")
         else:
             logger.error(f"  [bold red]✘[/bold red] Terraform destroy failed (Code {process.returncode})")
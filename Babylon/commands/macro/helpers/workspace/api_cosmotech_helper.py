@@ -18,8 +18,11 @@ from cosmotech_api.models.workspace_security import WorkspaceSecurity
 from cosmotech_api.models.workspace_update_request import WorkspaceUpdateRequest
 
 from Babylon.commands.macro.helpers.common import update_object_security
+from Babylon.utils.environment import Environment
+from Babylon.utils.profiling import traced
 
 logger = getLogger(__name__)
+env = Environment()
 
 
 # ---------------------------------------------------------------------------
@@ -27,6 +30,7 @@ logger = getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 
+@traced("api.create_workspace", "api")
 def create_workspace(api_instance, api_section: dict, payload: dict, state: dict) -> bool:
     """Create a new workspace and persist its ID in state. Returns False on failure."""
     logger.info("  [dim]→ No existing workspace ID found. Creating...[/dim]")
@@ -38,10 +42,11 @@ def create_workspace(api_instance, api_section: dict, payload: dict, state: dict
         logger.error("  [bold red]✘[/bold red] Failed to create workspace")
         return False
     logger.info(f"  [bold green]✔[/bold green] Workspace [bold magenta]{workspace.id}[/bold magenta] created")
-    state["services"]["api"]["workspace_id"] = workspace.id
+    env.set_state_value(state, ("services", "api", "workspace_id"), workspace.id)
     return True
 
 
+@traced("api.update_workspace", "api")
 def update_workspace(api_instance, api_section: dict, payload: dict) -> bool:
     """Update an existing workspace and sync its security policy. Returns False on failure."""
     logger.info(f"  [dim]→ Existing ID [bold cyan]{api_section['workspace_id']}[/bold cyan] found. Updating...[/dim]")
@@ -59,6 +64,7 @@ def update_workspace(api_instance, api_section: dict, payload: dict) -> bool:
     return True
 
 
+@traced("api.delete", "api")
 def delete_api_resource(
     api_call: Callable[..., None],
     resource_name: str,
@@ -84,12 +90,12 @@ def delete_api_resource(
             api_call(organization_id=resource_id)
 
         logger.info(f"  [bold green]✔[/bold green] {resource_name} [magenta]{resource_id}[/magenta] deleted")
-        state["services"]["api"][state_key] = ""
+        env.set_state_value(state, ("services", "api", state_key), "")
     except Exception as e:
         error_msg = str(e)
         if "404" in error_msg or "Not Found" in error_msg:
             logger.info(f"  [bold yellow]⚠[/bold yellow] {resource_name} [magenta]{resource_id}[/magenta] already deleted (404)")
-            state["services"]["api"][state_key] = ""
+            env.set_state_value(state, ("services", "api", state_key), "")
         else:
             logger.error(f"  [bold red]✘[/bold red] Error deleting {resource_name.lower()} {resource_id} reason: {e}")
 
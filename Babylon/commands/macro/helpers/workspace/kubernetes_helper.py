@@ -8,43 +8,49 @@ Cascade organisation (top → bottom = high-level → low-level):
       └─ get_postgres_service_host   (service discovery)
       └─ create_workspace_secret     (K8s Secret)
       └─ create_coal_configmap       (K8s ConfigMap)
-      └─ _run_schema_init_job
-           └─ _wait_and_check_init_job
-                └─ _handle_init_job_logs
+      └─ _run_schema_init_job        (submit, once per declared job)
+      └─ _wait_and_check_init_jobs   (JobWatcher.wait_all, jobs watched concurrently)
+           └─ _handle_init_job_logs
 
   Schema teardown (destroy path):
     destroy_postgres_schema
       └─ get_postgres_service_host
-      └─ _wait_and_check_destroy_job
+      └─ _wait_and_check_destroy_job (JobWatcher.wait)
            └─ _handle_destroy_job_logs
 
   K8s resource cleanup:
     delete_kubernetes_resources
 """
 
-import subprocess
 from base64 import b64encode
 from logging import getLogger
 from pathlib import Path
 from string import Template
 from textwrap import dedent
 
-from kubernetes import client, config, utils
-from kubernetes import config as kube_config
+from kubernetes import client, utils
 from kubernetes.utils import FailToCreateError
-from yaml import safe_load
 
 from Babylon.utils.environment import Environment
+from Babylon.utils.kubernetes_client import get_api_client, get_core_v1
+from Babylon.utils.kubernetes_jobs import JOB_TIMEOUT, JobResult, JobWatcher
+from Babylon.utils.profiling import traced
+from Babylon.utils.yaml_utils import safe_load
 
 logger = getLogger(__name__)
 env = Environment()
 
+# Seconds granted to the schema jobs before giving up on them.
+INIT_JOB_TIMEOUT = 50
+DESTROY_JOB_TIMEOUT = 300
+
 
 # ---------------------------------------------------------------------------
 # Schema deployment — public entry point
 # ---------------------------------------------------------------------------
 
 
+@traced("postgres.schema", "kubernetes")
 def deploy_postgres_schema(
     workspace_id: str,
     schema_config: dict,
@@ -76,10 +82,14 @@ def deploy_postgres_schema(
     }
 
     deploy_dir = deploy_dir if isinstance(deploy_dir, Path) else Path(deploy_dir)
+    submitted = []
     for job in schema_config.get("jobs", []):
         script_path = deploy_dir / job.get("path", "") / job.get("name", "")
         if script_path.exists():
-            _run_schema_init_job(script_path, mapping, workspace_id, schema_name, state)
+            k8s_job_name = _run_schema_init_job(script_path, mapping, workspace_id)
+            if k8s_job_name:
+                submitted.append(k8s_job_name)
+    _wait_and_check_init_jobs(submitted, schema_name, state)
 
     organization_id = api_section["organization_id"]
     logger.info(f"  [dim]→ Creating workspace Secret for [cyan]{workspace_id}[/cyan]...[/dim]")
@@ -114,9 +124,7 @@ def get_postgres_service_host(namespace: str) -> str:
     cluster. External database clusters are not currently supported.
     """
     try:
-        config.load_kube_config()
-        v1 = client.CoreV1Api()
-        services = v1.list_namespaced_service(namespace)
+        services = get_core_v1().list_namespaced_service(namespace)
 
         for svc in services.items:
             labels = svc.metadata.labels or {}
@@ -164,9 +172,7 @@ def create_workspace_secret(
     )
 
     try:
-        config.load_kube_config()
-        v1 = client.CoreV1Api()
-        v1.create_namespaced_secret(namespace=namespace, body=secret)
+        get_core_v1().create_namespaced_secret(namespace=namespace, body=secret)
         logger.info(f"  [bold green]✔[/bold green] Secret [magenta]{secret_name}[/magenta] created")
         return True
     except client.exceptions.ApiException as e:
@@ -225,9 +231,7 @@ def create_coal_configmap(
     )
 
     try:
-        config.load_kube_config()
-        v1 = client.CoreV1Api()
-        v1.create_namespaced_config_map(namespace=namespace, body=configmap)
+        get_core_v1().create_namespaced_config_map(namespace=namespace, body=configmap)
         logger.info(f"  [bold green]✔[/bold green] ConfigMap [magenta]{configmap_name}[/magenta] created")
         return True
     except client.ApiException as e:
@@ -250,25 +254,22 @@ def create_coal_configmap(
 # ---------------------------------------------------------------------------
 
 
-def _run_schema_init_job(
-    script_path: Path,
-    mapping: dict,
-    workspace_id: str,
-    schema_name: str,
-    state: dict,
-) -> None:
-    """Apply a single K8s init job from *script_path* and wait for its outcome."""
-    k8s_job_name = f"postgresql-init-{workspace_id}"
-    kube_config.load_kube_config()
-    k8s_client = client.ApiClient()
+def _run_schema_init_job(script_path: Path, mapping: dict, workspace_id: str) -> str | None:
+    """Submit the K8s init job rendered from *script_path*.
+
+    Returns:
+        The job name, or ``None`` when the job could not be submitted.
+    """
+    k8s_client = get_api_client()
 
     with open(script_path, "r") as f:
         raw_content = f.read()
 
     yaml_dict = safe_load(Template(raw_content).safe_substitute(mapping))
+    k8s_job_name = (yaml_dict.get("metadata") or {}).get("name") or f"postgresql-init-{workspace_id}"
     try:
         utils.create_from_dict(k8s_client, yaml_dict, namespace=env.environ_id)
-        _wait_and_check_init_job(k8s_job_name, schema_name, state)
+        return k8s_job_name
     except FailToCreateError as e:
         for inner_exception in e.api_exceptions:
             if inner_exception.status == 409:
@@ -279,47 +280,42 @@ def _run_schema_init_job(
     except Exception as e:
         logger.error("  [bold red]✘[/bold red] Unexpected error submitting Kubernetes job see 'babylon.log' for details")
         logger.debug(f"  {e}")
+    return None
 
 
-def _wait_and_check_init_job(k8s_job_name: str, schema_name: str, state: dict) -> None:
-    """Wait for the init job to complete, then inspect its logs."""
-    logger.info(f"  [dim]→ Waiting for job [cyan]{k8s_job_name}[/cyan] to complete...[/dim]")
-    wait_process = subprocess.run(
-        [
-            "kubectl",
-            "wait",
-            "--for=condition=complete",
-            "job",
-            k8s_job_name,
-            f"--namespace={env.environ_id}",
-            "--timeout=50s",
-        ],
-        capture_output=True,
-        text=True,
-    )
-    if wait_process.returncode != 0:
+def _wait_and_check_init_jobs(k8s_job_names: list[str], schema_name: str, state: dict) -> None:
+    """Watch the submitted init jobs concurrently, then inspect the logs of each one."""
+    if not k8s_job_names:
+        return
+    for k8s_job_name in k8s_job_names:
+        logger.info(f"  [dim]→ Waiting for job [cyan]{k8s_job_name}[/cyan] to complete...[/dim]")
+    results = JobWatcher(env.environ_id).wait_all({name: INIT_JOB_TIMEOUT for name in k8s_job_names})
+    for result in results.values():
+        if _check_job_result(result):
+            logger.debug(f"  Inspecting logs for job '{result.name}'...")
+            _handle_init_job_logs(result.name, result.logs, schema_name, state)
+
+
+def _check_job_result(result: JobResult) -> bool:
+    """Log why a job did not complete; return ``True`` when it completed."""
+    if result.succeeded:
+        return True
+    if result.status == JOB_TIMEOUT:
         logger.error(
-            f"  [bold red]✘[/bold red] Job '{k8s_job_name}' did not complete within the timeout check 'babylon.log' for details"
+            f"  [bold red]✘[/bold red] Job '{result.name}' did not complete within the timeout check 'babylon.log' for details"
         )
-        logger.debug(f"  [bold red]✘[/bold red] Job wait output {wait_process.stdout} {wait_process.stderr}")
-        return
-    logger.debug(f"  Inspecting logs for job '{k8s_job_name}'...")
-    _handle_init_job_logs(k8s_job_name, schema_name, state)
+    else:
+        logger.error(f"  [bold red]✘[/bold red] Job '{result.name}' failed: {result.reason} check 'babylon.log' for details")
+    logger.debug(f"  Job '{result.name}' logs: {result.logs}")
+    return False
 
 
-def _handle_init_job_logs(k8s_job_name: str, schema_name: str, state: dict) -> None:
-    """Fetch init-job logs and update state based on their content."""
-    logs_process = subprocess.run(
-        ["kubectl", "logs", f"job/{k8s_job_name}", "-n", env.environ_id],
-        capture_output=True,
-        text=True,
-    )
-    if logs_process.returncode != 0:
+def _handle_init_job_logs(k8s_job_name: str, job_logs: str, schema_name: str, state: dict) -> None:
+    """Update state based on the content of the init-job logs."""
+    if not job_logs:
         logger.error(f"  [bold red]✘[/bold red] Failed to retrieve logs for job '{k8s_job_name}'")
-        logger.debug(f"  kubectl logs stdout: {logs_process.stdout} stderr: {logs_process.stderr}")
         return
 
-    job_logs = logs_process.stdout or logs_process.stderr
     if "ERROR" in job_logs or "error" in job_logs:
         logger.error("  [bold red]✘[/bold red] Schema initialisation failed the container reported an error")
         logger.debug(f"  Job logs: {job_logs}")
@@ -329,7 +325,7 @@ def _handle_init_job_logs(k8s_job_name: str, schema_name: str, state: dict) -> N
         )
     else:
         logger.info(f"  [bold green]✔[/bold green] Schema [magenta]{schema_name}[/magenta] initialised successfully")
-        state["services"]["postgres"]["schema_name"] = schema_name
+        env.set_state_value(state, ("services", "postgres", "schema_name"), schema_name)
 
 
 # ---------------------------------------------------------------------------
@@ -337,6 +333,7 @@ def _handle_init_job_logs(k8s_job_name: str, schema_name: str, state: dict) -> N
 # ---------------------------------------------------------------------------
 
 
+@traced("postgres.destroy_schema", "kubernetes")
 def destroy_postgres_schema(schema_name: str, state: dict) -> None:
     """Destroy the PostgreSQL schema for a workspace.
 
@@ -373,8 +370,7 @@ def destroy_postgres_schema(schema_name: str, state: dict) -> None:
     }
     destroy_jobs = env.original_template_path / "yaml" / "k8s_job_destroy.yaml"
     k8s_job_name = f"postgresql-destroy-{workspace_id_tmp}"
-    kube_config.load_kube_config()
-    k8s_client = client.ApiClient()
+    k8s_client = get_api_client()
 
     with open(destroy_jobs, "r") as f:
         raw_content = f.read()
@@ -397,52 +393,29 @@ def destroy_postgres_schema(schema_name: str, state: dict) -> None:
 def _wait_and_check_destroy_job(k8s_job_name: str, schema_name: str, state: dict) -> None:
     """Wait for the destroy job to complete, then inspect its logs."""
     logger.info(f"  [dim]→ Waiting for job [cyan]{k8s_job_name}[/cyan] to complete...[/dim]")
-    wait_process = subprocess.run(
-        [
-            "kubectl",
-            "wait",
-            "--for=condition=complete",
-            "job",
-            k8s_job_name,
-            f"--namespace={env.environ_id}",
-            "--timeout=300s",
-        ],
-        capture_output=True,
-        text=True,
-    )
-    if wait_process.returncode != 0:
-        logger.error(
-            f"  [bold red]✘[/bold red] Job '{k8s_job_name}' did not complete within the timeout check 'babylon.log' for details"
-        )
-        logger.debug(f"  kubectl wait stdout: {wait_process.stdout} stderr: {wait_process.stderr}")
+    result = JobWatcher(env.environ_id).wait(k8s_job_name, DESTROY_JOB_TIMEOUT)
+    if not _check_job_result(result):
         return
 
     logger.debug(f"  Inspecting logs for job '{k8s_job_name}'...")
-    _handle_destroy_job_logs(k8s_job_name, schema_name, state)
+    _handle_destroy_job_logs(k8s_job_name, result.logs, schema_name, state)
 
 
-def _handle_destroy_job_logs(k8s_job_name: str, schema_name: str, state: dict) -> None:
-    """Fetch destroy-job logs and update state based on their content."""
-    logs_process = subprocess.run(
-        ["kubectl", "logs", f"job/{k8s_job_name}", "-n", env.environ_id],
-        capture_output=True,
-        text=True,
-    )
-    if logs_process.returncode != 0:
+def _handle_destroy_job_logs(k8s_job_name: str, job_logs: str, schema_name: str, state: dict) -> None:
+    """Update state based on the content of the destroy-job logs."""
+    if not job_logs:
         logger.error(f"  [bold red]✘[/bold red] Failed to retrieve logs for job '{k8s_job_name}'")
-        logger.debug(f"  kubectl logs stdout: {logs_process.stdout} stderr: {logs_process.stderr}")
         return
 
-    job_logs = logs_process.stdout or logs_process.stderr
     if "ERROR" in job_logs or "error" in job_logs:
         logger.error("  [bold red]✘[/bold red] Schema destruction failed the container reported an error")
         logger.debug(f"  Job logs: {job_logs}")
     elif "does not exist" in job_logs:
         logger.info(f"  [bold green]✔[/bold green] Schema [magenta]{schema_name}[/magenta] does not exist nothing to remove")
-        state["services"]["postgres"]["schema_name"] = ""
+        env.set_state_value(state, ("services", "postgres", "schema_name"), "")
     else:
         logger.info(f"  [bold green]✔[/bold green] Schema [magenta]{schema_name}[/magenta] destroyed successfully")
-        state["services"]["postgres"]["schema_name"] = ""
+        env.set_state_value(state, ("services", "postgres", "schema_name"), "")
 
 
 # ---------------------------------------------------------------------------
@@ -464,8 +437,7 @@ def delete_kubernetes_resources(namespace: str, organization_id: str, workspace_
     configmap_name = f"{organization_id}-{workspace_id}-coal-config"
 
     try:
-        config.load_kube_config()
-        v1 = client.CoreV1Api()
+        v1 = get_core_v1()
     except Exception as e:
         logger.error("  [bold red]✘[/bold red] Failed to initialise Kubernetes client")
         logger.debug(f"  Detail: {e}", exc_info=True)
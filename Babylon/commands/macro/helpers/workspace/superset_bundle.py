@@ -0,0 +1,114 @@
+"""
+Streaming rewrite of Superset export bundles.
+
+A bundle is read straight from the source ZIP: YAML members are decoded once,
+every patch for a member is applied in a single call, and the result is
+written to a spooled in-memory buffer that can be posted to Superset as is.
+The source ZIP is never modified.
+
+Members are written through the public ``ZipFile`` API only; members left
+unchanged by the patches keep their timestamps, permissions and compression
+method.
+"""
+
+from copy import copy
+from logging import getLogger
+from pathlib import Path
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Callable
+from zipfile import ZIP_DEFLATED, ZipFile, ZipInfo
+
+logger = getLogger(__name__)
+
+# Bundles up to this size stay in memory; larger ones spill to a temporary file.
+SPOOL_MAX_SIZE = 64 * 1024 * 1024
+
+# (path relative to the bundle root, text) -> patched text
+MemberPatch = Callable[[str, str], str]
+
+
+class SupersetBundle:
+    """Read-only view of a Superset export ZIP.
+
+    Usage::
+
+        with SupersetBundle(zip_path) as bundle:
+            texts = bundle.yaml_texts()
+            buffer = bundle.rewrite(patch, root_name=zip_path.stem)
+
+    Member names are exposed relative to the bundle root, i.e. without the
+    single top-level folder Superset puts in its exports.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._zip: ZipFile | None = None
+        self._texts: dict[str, str] | None = None
+        self.root = ""
+
+    def __enter__(self) -> "SupersetBundle":
+        self._zip = ZipFile(self.path, "r")
+        tops = {info.filename.split("/", 1)[0] for info in self.members()}
+        if len(tops) == 1 and all("/" in info.filename for info in self.members()):
+            self.root = f"{tops.pop()}/"
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    def members(self) -> list[ZipInfo]:
+        """Return file members (directory entries excluded) in archive order."""
+        return [info for info in self._zip.infolist() if not info.is_dir()]
+
+    def relative_name(self, info: ZipInfo) -> str:
+        return info.filename[len(self.root) :]
+
+    def yaml_texts(self) -> dict[str, str]:
+        """Return ``{relative name: text}`` for every YAML member, decoded once."""
+        if self._texts is None:
+            self._texts = {}
+            for info in self.members():
+                if not info.filename.endswith(".yaml"):
+                    continue
+                try:
+                    self._texts[self.relative_name(info)] = self._zip.read(info).decode("utf-8")
+                except UnicodeDecodeError as exc:
+                    # Left untouched: copied as is by rewrite()
+                    logger.warning(f"  [yellow]⚠[/yellow] Could not decode {info.filename}: {exc}")
+        return self._texts
+
+    def rewrite(self, patch: MemberPatch, root_name: str) -> BinaryIO:
+        """Write a patched copy of the bundle under ``<root_name>/`` into a spooled buffer.
+
+        *patch* is called once per YAML member; other members and YAML members
+        it leaves unchanged are copied with their original metadata. The
+        returned buffer is positioned at its start.
+        """
+        texts = self.yaml_texts()
+        buffer = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE, mode="w+b")
+        patched_count = 0
+        with ZipFile(buffer, "w", compression=ZIP_DEFLATED) as out:
+            for info in self.members():
+                name = self.relative_name(info)
+                arcname = f"{root_name}/{name}"
+                if name in texts:
+                    text = texts[name]
+                    patched = patch(name, text)
+                    if patched != text:
+                        out.writestr(arcname, patched.encode("utf-8"))
+                        patched_count += 1
+                        continue
+                out.writestr(_renamed(info, arcname), self._zip.read(info))
+        logger.debug(f"  Rewrote '{self.path.name}' in memory ({patched_count}/{len(self.members())} member(s) patched)")
+        buffer.seek(0)
+        return buffer
+
+
+def _renamed(info: ZipInfo, arcname: str) -> ZipInfo:
+    """Return a copy of *info* named *arcname*, ready to be passed to ``ZipFile.writestr``."""
+    new_info = copy(info)
+    new_info.filename = new_info.orig_filename = arcname
+    new_info.extra = b""
+    return new_info
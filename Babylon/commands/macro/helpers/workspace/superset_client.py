@@ -0,0 +1,260 @@
+"""
+Superset API session and asset index shared by the import and embedded-UUID paths.
+
+``SupersetSession`` keeps the JWT, one CSRF token and the cookies Superset
+binds that token to, and only refreshes them when Superset rejects a request
+(``401``, or ``400`` with a CSRF error) instead of fetching a CSRF token before
+every write.
+
+The list endpoints (``/api/v1/dataset/``, ``/api/v1/chart/``,
+``/api/v1/dashboard/``) are paged with a rison ``q`` argument
+(``(page:N,page_size:100,columns:!(id,uuid,...))``) instead of a single
+``page_size=1000`` request that silently drops everything past the first
+thousand assets.
+
+Each asset kind is listed once per process and Superset URL; after an import
+only the most recently changed pages are read again until every imported
+UUID is found.
+"""
+
+from logging import getLogger
+from threading import Lock
+from typing import Any, Callable
+
+import requests
+from requests.cookies import RequestsCookieJar
+
+from Babylon.utils import http_client
+
+logger = getLogger(__name__)
+
+PAGE_SIZE = 100
+
+# kind -> (endpoint, columns requested from the list endpoint)
+ASSET_ENDPOINTS: dict[str, tuple[str, tuple[str, ...]]] = {
+    "datasets": ("/api/v1/dataset/", ("id", "uuid", "table_name")),
+    "charts": ("/api/v1/chart/", ("id", "uuid", "slice_name")),
+    "dashboards": ("/api/v1/dashboard/", ("id", "uuid", "dashboard_title", "slug")),
+}
+# Sort column accepted by the three list endpoints
+_RECENT_ORDER = "changed_on_delta_humanized"
+
+
+def to_rison(value) -> str:
+    """Encode dicts, lists, strings, numbers and booleans as rison (as used by Superset's ``q`` argument)."""
+    if isinstance(value, bool):
+        return "!t" if value else "!f"
+    if value is None:
+        return "!n"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, dict):
+        return "(" + ",".join(f"{key}:{to_rison(item)}" for key, item in value.items()) + ")"
+    if isinstance(value, (list, tuple)):
+        return "!(" + ",".join(to_rison(item) for item in value) + ")"
+    text = str(value)
+    if text and all(c.isalnum() or c in "-_./~" for c in text) and not text[0].isdigit() and text[0] != "-":
+        return text
+    return "'" + text.replace("!", "!!").replace("'", "!'") + "'"
+
+
+class SupersetSession:
+    """Authenticated access to one Superset instance, safe to share between threads.
+
+    Args:
+        base_url:     Superset base URL.
+        superset_jwt: Superset access token.
+        refresh_jwt:  Optional callable returning a new token, used once per
+                      ``401`` response; without it a ``401`` is returned as is.
+    """
+
+    def __init__(self, base_url: str, superset_jwt: str, refresh_jwt: Callable[[], str | None] | None = None):
+        self.base_url = base_url.rstrip("/")
+        self.superset_jwt = superset_jwt
+        self.refresh_jwt = refresh_jwt
+        self.cookies = RequestsCookieJar()
+        self._csrf_token: str | None = None
+        self._lock = Lock()
+
+    def _send(self, method: str, path: str, headers: dict, **kwargs: Any) -> requests.Response:
+        response = http_client.request(method, f"{self.base_url}{path}", headers=headers, cookies=self.cookies, **kwargs)
+        with self._lock:
+            self.cookies.update(response.cookies)
+        return response
+
+    def csrf_token(self) -> str:
+        """Return the session CSRF token, fetching it on first use.
+
+        Raises:
+            requests.RequestException: when Superset does not return a token.
+        """
+        with self._lock:
+            if self._csrf_token:
+                return self._csrf_token
+            jwt = self.superset_jwt
+        response = self._send("GET", "/api/v1/security/csrf_token/", {"Authorization": f"Bearer {jwt}"}, timeout=10)
+        response.raise_for_status()
+        token = response.json().get("result")
+        if not token:
+            raise requests.RequestException("CSRF token not found in Superset response", response=response)
+        with self._lock:
+            self._csrf_token = self._csrf_token or token
+            return self._csrf_token
+
+    def _invalidate_csrf(self, seen: str) -> None:
+        with self._lock:
+            if self._csrf_token == seen:
+                self._csrf_token = None
+
+    def _refresh_jwt(self, seen: str) -> bool:
+        with self._lock:
+            if self.superset_jwt != seen:
+                # Another thread already refreshed it
+                return True
+            if self.refresh_jwt is None:
+                return False
+            token = self.refresh_jwt()
+            if not token:
+                return False
+            logger.debug("  [dim]Superset token refreshed[/dim]")
+            self.superset_jwt = token
+            # The CSRF token is bound to the previous login
+            self._csrf_token = None
+            self.cookies.clear()
+            return True
+
+    def request(self, method: str, path: str, **kwargs: Any) -> requests.Response:
+        """Send a request to ``base_url + path`` with the session credentials.
+
+        Non-GET requests carry the CSRF token. A ``401`` (after refreshing the
+        token) or a ``400`` CSRF error (after fetching a new CSRF token) is
+        retried once. Returns the last response.
+        """
+        write = method.upper() not in {"GET", "HEAD", "OPTIONS"}
+        extra_headers = kwargs.pop("headers", None) or {}
+        for attempt in range(2):
+            jwt = self.superset_jwt
+            headers = {"Authorization": f"Bearer {jwt}", **extra_headers}
+            csrf = None
+            if write:
+                csrf = self.csrf_token()
+                headers.update({"X-CSRFToken": csrf, "Referer": self.base_url})
+            response = self._send(method, path, headers, **kwargs)
+            if attempt:
+                return response
+            if response.status_code == 401 and self._refresh_jwt(jwt):
+                continue
+            if response.status_code == 400 and csrf and "csrf" in response.text.lower():
+                logger.debug("  [dim]Superset rejected the CSRF token, fetching a new one[/dim]")
+                self._invalidate_csrf(csrf)
+                continue
+            return response
+
+    def get(self, path: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+
+class SupersetAssetIndex:
+    """``uuid → asset`` maps for datasets, charts and dashboards of one Superset instance.
+
+    Thread-safe: the ZIP workers of ``deploy_superset_multiple_assets`` share
+    one index, and each kind is listed only once.
+    """
+
+    def __init__(self, base_url: str, superset_jwt: str, page_size: int = PAGE_SIZE):
+        self.base_url = base_url.rstrip("/")
+        self.superset_jwt = superset_jwt
+        self.page_size = page_size
+        self._assets: dict[str, dict[str, dict]] = {}
+        self._locks = {kind: Lock() for kind in ASSET_ENDPOINTS}
+
+    def _headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.superset_jwt}"}
+
+    def _fetch_page(self, kind: str, page: int, recent_first: bool = False) -> tuple[list[dict], int]:
+        endpoint, columns = ASSET_ENDPOINTS[kind]
+        query = {"page": page, "page_size": self.page_size, "columns": list(columns)}
+        if recent_first:
+            query.update(order_column=_RECENT_ORDER, order_direction="desc")
+        response = http_client.get(f"{self.base_url}{endpoint}", headers=self._headers(), params={"q": to_rison(query)}, timeout=15)
+        response.raise_for_status()
+        body = response.json()
+        return body.get("result", []), int(body.get("count", 0))
+
+    def _store(self, kind: str, items: list[dict]) -> None:
+        assets = self._assets.setdefault(kind, {})
+        for item in items:
+            if item.get("uuid"):
+                assets[item["uuid"].lower()] = item
+
+    def _load(self, kind: str) -> dict[str, dict]:
+        # Caller holds self._locks[kind]
+        if kind not in self._assets:
+            items, page = [], 0
+            while True:
+                result, count = self._fetch_page(kind, page)
+                items.extend(result)
+                page += 1
+                if not result or page * self.page_size >= count:
+                    break
+            self._store(kind, items)
+            logger.debug(f"  Indexed {len(self._assets[kind])} Superset {kind} in {page} page(s)")
+        return self._assets[kind]
+
+    def assets(self, kind: str) -> dict[str, dict]:
+        """Return a copy of ``{uuid: asset}`` for *kind*, listing every page on first use.
+
+        Raises:
+            requests.RequestException: when Superset cannot be listed.
+        """
+        with self._locks[kind]:
+            return dict(self._load(kind))
+
+    def existing(self, kind: str, uuids: set[str]) -> set[str]:
+        """Return the subset of *uuids* already present in Superset."""
+        with self._locks[kind]:
+            return {u.lower() for u in uuids} & self._load(kind).keys()
+
+    def record_import(self, kind: str, uuids: set[str]) -> None:
+        """Update the index after an import of *uuids*.
+
+        Imported assets are the most recently changed ones: pages are read
+        newest first until every UUID is known. Kinds never listed yet are left
+        to be listed lazily.
+        """
+        uuids = {u.lower() for u in uuids}
+        with self._locks[kind]:
+            if kind not in self._assets or not uuids:
+                return
+            missing, page = set(uuids), 0
+            while missing:
+                result, count = self._fetch_page(kind, page, recent_first=True)
+                self._store(kind, result)
+                missing -= {(item.get("uuid") or "").lower() for item in result}
+                page += 1
+                if not result or page * self.page_size >= count:
+                    break
+            logger.debug(f"  Superset {kind} index updated after import ({page} page(s) read)")
+
+
+_indexes: dict[str, SupersetAssetIndex] = {}
+_indexes_lock = Lock()
+
+
+def get_asset_index(base_url: str, superset_jwt: str) -> SupersetAssetIndex:
+    """Return the process-wide index for *base_url*, using *superset_jwt* for later requests."""
+    key = base_url.rstrip("/")
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = SupersetAssetIndex(key, superset_jwt)
+        index.superset_jwt = superset_jwt
+        return index
+
+
+def reset_asset_indexes() -> None:
+    with _indexes_lock:
+        _indexes.clear()
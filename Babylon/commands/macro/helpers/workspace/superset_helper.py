@@ -12,22 +12,23 @@ Cascade organisation (top → bottom = high-level → low-level):
                           └─ _get_existing_datasource
                           └─ _get_superset_csrf_token
                 └─ _process_dashboard_zip
-                     └─ _read_uuids_from_zip
+                     └─ _read_uuids_from_bundle
                      └─ _assets_exist_in_superset
                      └─ _regenerate_superset_uuids
-                     └─ _patch_metadata
-                     └─ _patch_database_dir
-                     └─ _patch_schema_in_datasets_dir
-                     └─ _repack_zip
+                     └─ SupersetBundle.rewrite (superset_bundle.py)
+                          └─ _patch_bundle_member
+                               └─ MultiReplacer.subn (utils/string.py)
+                               └─ _patch_metadata
+                               └─ _patch_database_yaml
+                               └─ _patch_dataset_yaml
                      └─ _import_zip_to_superset
 
     _fetch_and_store_embedded_dashboard_uuids
       └─ _get_filtered_dashboards
-      └─ _get_embedded_uuid_for_dashboard
+      └─ _get_embedded_uuid_for_dashboard  (SupersetSession, in parallel)
            └─ _enable_dashboard_embedding
-                └─ _get_superset_csrf_token
       └─ _write_dashboard_updates_to_yaml
-           └─ update_variables_file_entry
+           └─ VariablesFileEditor (utils/variables.py)
 
   Read helpers (used by deploy_workspace.py):
     _build_dashboard_ext_args
@@ -36,21 +37,26 @@ Cascade organisation (top → bottom = high-level → low-level):
 """
 
 import uuid as _uuid_mod
-from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
 from logging import getLogger
 from pathlib import Path
 from re import IGNORECASE, MULTILINE, compile, findall, sub
-from tempfile import TemporaryDirectory
-from zipfile import ZIP_DEFLATED, BadZipFile, ZipFile
+from threading import BoundedSemaphore
+from typing import BinaryIO, Callable
+from zipfile import BadZipFile
 
-import requests
 from requests.exceptions import RequestException
-from ruamel.yaml import YAML as _RYAML
-from yaml import safe_load
 
 from Babylon.commands.macro.helpers.workspace.kubernetes_helper import get_postgres_service_host
+from Babylon.commands.macro.helpers.workspace.superset_bundle import SupersetBundle
+from Babylon.commands.macro.helpers.workspace.superset_client import SupersetSession, get_asset_index
+from Babylon.utils import http_client
 from Babylon.utils.credentials import get_superset_token
 from Babylon.utils.environment import Environment
+from Babylon.utils.profiling import traced
+from Babylon.utils.string import UUID_PATTERN, MultiReplacer
+from Babylon.utils.variables import VariablesFileEditor
+from Babylon.utils.yaml_utils import safe_load
 
 logger = getLogger(__name__)
 env = Environment()
@@ -61,6 +67,15 @@ _UUID_FIELD_RE = compile(
     MULTILINE | IGNORECASE,
 )
 
+# Dashboard ZIPs prepared concurrently (asset lookups, extract, patch, repack).
+SUPERSET_ZIP_WORKERS = 4
+# Concurrent import POSTs. Every ZIP overwrites the same database (and often
+# the same datasets) in Superset, so imports are serialized by default while
+# the preparation of the next ZIPs keeps running.
+SUPERSET_IMPORT_CONCURRENCY = 1
+# Dashboards whose embedding is enabled (POST + GET) concurrently.
+SUPERSET_EMBED_WORKERS = 8
+
 
 # ---------------------------------------------------------------------------
 # Public dispatch entry point
@@ -100,7 +115,7 @@ def deploy_superset(
     superset_config: dict,
     deploy_dir: Path,
 ) -> tuple[bool, set[str]]:
-    """Authenticate with Superset and deploy dashboard ZIPs sequentially.
+    """Authenticate with Superset and deploy dashboard ZIPs.
 
     Returns:
         A tuple ``(success, zip_uuids)`` where *zip_uuids* is the union of all
@@ -131,12 +146,14 @@ def deploy_superset(
     )
 
 
+@traced("superset.import", "superset")
 def deploy_superset_multiple_assets(
     superset_token: str,
     reports: list,
     state: dict,
     superset_config: dict,
     deploy_dir: Path,
+    max_workers: int = SUPERSET_ZIP_WORKERS,
 ) -> tuple[bool, set[str]]:
     """Deploy Superset dashboard assets from a list of ZIP reports.
 
@@ -145,12 +162,17 @@ def deploy_superset_multiple_assets(
     - Idempotently creates the PostgreSQL datasource.
     - Builds the sqlalchemy_uri and schema_name from state/secrets.
 
-    Per-ZIP processing:
-    1. Queries Superset to find which component types are already deployed.
-    2. Extracts the ZIP to a temporary directory.
+    Per-ZIP processing (the source ZIP is never modified):
+    1. Opens the ZIP as a ``SupersetBundle`` and reads its YAML members in memory.
+    2. Queries Superset to find which component types are already deployed.
     3. Regenerates UUIDs (skipping components already in Superset).
-    4. Patches metadata and connection fields (schema, URI, db UUID).
-    5. Repacks the patched content and imports it via the Superset API.
+    4. Streams the bundle into a spooled buffer, patching each YAML member in
+       one pass: UUIDs through a single ``MultiReplacer``, then metadata and
+       connection fields (schema, URI, db UUID).
+    5. Imports the rewritten buffer via the Superset API.
+
+    ZIPs are processed on a pool of *max_workers* threads; at most
+    ``SUPERSET_IMPORT_CONCURRENCY`` imports run at the same time.
 
     Args:
         superset_token:  Superset JWT obtained from Keycloak exchange.
@@ -158,6 +180,7 @@ def deploy_superset_multiple_assets(
         state:           Full Babylon state dict.
         superset_config: Dict with at least 'superset_url'.
         deploy_dir:      Root deployment directory used to resolve report paths.
+        max_workers:     Maximum number of ZIPs processed concurrently.
 
     Returns:
         A tuple ``(all_ok, all_zip_uuids)``.
@@ -178,12 +201,11 @@ def deploy_superset_multiple_assets(
     workspace_id = state.get("services", {}).get("api", {}).get("workspace_id") or ""
     schema_name = workspace_id.replace("-", "_")
 
-    all_ok = True
-    all_zip_uuids: set[str] = set()
     abs_deploy_dir = Path(deploy_dir).resolve()
+    import_slots = BoundedSemaphore(SUPERSET_IMPORT_CONCURRENCY)
 
-    for report in reports:
-        success, new_uuids = _process_dashboard_zip(
+    def _process(report: dict) -> tuple[bool, set[str]]:
+        return _process_dashboard_zip(
             report=report,
             abs_deploy_dir=abs_deploy_dir,
             base_url=base_url,
@@ -192,11 +214,14 @@ def deploy_superset_multiple_assets(
             sqlalchemy_uri=sqlalchemy_uri,
             db_uuid=db_uuid or "",
             schema_name=schema_name,
+            import_slots=import_slots,
         )
-        if not success:
-            all_ok = False
-        all_zip_uuids |= new_uuids
 
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(reports))), thread_name_prefix="superset-zip") as pool:
+        outcomes = list(pool.map(_process, reports))
+
+    all_ok = all(success for success, _ in outcomes)
+    all_zip_uuids: set[str] = set().union(*(new_uuids for _, new_uuids in outcomes))
     return all_ok, all_zip_uuids
 
 
@@ -306,7 +331,7 @@ def create_postgres_datasource(
     }
 
     try:
-        response = requests.post(f"{base_url}/api/v1/database/", headers=headers, json=payload, timeout=15)
+        response = http_client.post(f"{base_url}/api/v1/database/", headers=headers, json=payload, timeout=15)
         response.raise_for_status()
         logger.info(f"  [bold green]✔[/bold green] Superset datasource [cyan]{display_name}[/cyan] created successfully")
         return response.json()
@@ -321,7 +346,7 @@ def _get_existing_datasource(base_url: str, superset_jwt: str, display_name: str
     """Return the existing Superset database entry matching *display_name*, or None."""
     headers = {"Authorization": f"Bearer {superset_jwt}"}
     try:
-        response = requests.get(f"{base_url}/api/v1/database/", headers=headers, timeout=10)
+        response = http_client.get(f"{base_url}/api/v1/database/", headers=headers, timeout=10)
         response.raise_for_status()
         for db in response.json().get("result", []):
             if db.get("database_name") == display_name:
@@ -336,6 +361,12 @@ def _get_existing_datasource(base_url: str, superset_jwt: str, display_name: str
 # ---------------------------------------------------------------------------
 
 
+def _resolve_zip_path(report: dict, abs_deploy_dir: Path) -> Path:
+    """Return the absolute path of the ZIP referenced by *report*."""
+    path_obj = Path(report.get("path", ""))
+    return path_obj.resolve() if path_obj.is_absolute() else (abs_deploy_dir / path_obj).resolve()
+
+
 def _process_dashboard_zip(
     report: dict,
     abs_deploy_dir: Path,
@@ -345,17 +376,20 @@ def _process_dashboard_zip(
     sqlalchemy_uri: str,
     db_uuid: str,
     schema_name: str,
+    import_slots: BoundedSemaphore | None = None,
 ) -> tuple[bool, set[str]]:
-    """Extract, patch, repack, and import a single dashboard ZIP.
+    """Patch a single dashboard ZIP in memory and import it.
+
+    The source ZIP is left untouched: members are patched on the fly and the
+    rewritten bundle is posted from a spooled buffer.
+    *import_slots*, when given, bounds the number of concurrent imports.
 
     Returns:
         ``(success, new_dashboard_uuids)`` where *new_dashboard_uuids* are the
         post-regen UUIDs collected from ``dashboards/`` after patching.
     """
     name: str = report.get("name", "")
-    rel_path: str = report.get("path", "")
-    path_obj = Path(rel_path)
-    zip_path = path_obj.resolve() if path_obj.is_absolute() else (abs_deploy_dir / rel_path).resolve()
+    zip_path = _resolve_zip_path(report, abs_deploy_dir)
 
     logger.debug(f"  Preparing '{name}' for deployment...")
 
@@ -364,57 +398,69 @@ def _process_dashboard_zip(
         logger.debug(f"  Deploy dir resolved to {abs_deploy_dir}. Missing file: {zip_path}")
         return False, set()
 
-    zip_uuids = _read_uuids_from_zip(zip_path)
-    existing_map = _assets_exist_in_superset(base_url, superset_token, zip_uuids)
-    is_update = any(existing_map.values())
-    if is_update:
-        updating = [k for k, v in existing_map.items() if v]
-        logger.info(
-            f"  [yellow]⚠[/yellow] [dim]Dashboard [magenta]{name}[/magenta] is already deployed updating '{', '.join(updating)}'[/dim]"
-        )
-    else:
-        logger.info(f"  [dim]→ Dashboard [magenta]{name}[/magenta]' first deployment creating all assets... [/dim]")
-    new_dashboard_uuids: set[str] = set()
+    # Top-level UUIDs of the assets sent to Superset, per folder (datasets, charts, dashboards)
+    imported_uuids: dict[str, set[str]] = {}
 
     try:
-        with TemporaryDirectory(prefix="babylon_superset_") as tmp_dir_str:
-            tmp_dir = Path(tmp_dir_str)
-
-            with ZipFile(zip_path, "r") as zf:
-                zf.extractall(tmp_dir)
-
-            tmp_items = list(tmp_dir.iterdir())
-            content_dir = tmp_items[0] if len(tmp_items) == 1 and tmp_items[0].is_dir() else tmp_dir
-
-            _regenerate_superset_uuids(content_dir, existing_map)
-            _patch_metadata(content_dir)
-            _patch_database_dir(content_dir, sqlalchemy_uri, database_name=env.environ_id, db_uuid=db_uuid)
-            _patch_schema_in_datasets_dir(content_dir, schema_name, db_uuid=db_uuid)
-
-            dashboards_dir = content_dir / "dashboards"
-            if dashboards_dir.is_dir():
-                for df in dashboards_dir.rglob("*.yaml"):
-                    try:
-                        raw = df.read_text(encoding="utf-8")
-                        m = _UUID_FIELD_RE.search(raw)
-                        if m:
-                            new_dashboard_uuids.add(m.group(1).lower())
-                    except OSError as e:
-                        logger.warning(f"  [yellow]⚠[/yellow] Skipping unreadable YAML file '{df.name}'")
-                        logger.debug(f"  Could not read YAML file '{df.name}': {e}")
-
-            _repack_zip(zip_path, tmp_dir)
+        with SupersetBundle(zip_path) as bundle:
+            zip_uuids = _read_uuids_from_bundle(bundle)
+            existing_map = _assets_exist_in_superset(base_url, superset_token, zip_uuids)
+            is_update = any(existing_map.values())
+            if is_update:
+                updating = [k for k, v in existing_map.items() if v]
+                logger.info(
+                    f"  [yellow]⚠[/yellow] [dim]Dashboard [magenta]{name}[/magenta] is already deployed "
+                    f"updating '{', '.join(updating)}'[/dim]"
+                )
+            else:
+                logger.info(f"  [dim]→ Dashboard [magenta]{name}[/magenta]' first deployment creating all assets... [/dim]")
+
+            # Case-insensitive: exports may reference UUIDs in upper case
+            uuid_mapping = _regenerate_superset_uuids(bundle.yaml_texts(), existing_map)
+            uuid_replacer = MultiReplacer(uuid_mapping, ignore_case=True, token=UUID_PATTERN)
+
+            def _patch(member: str, text: str) -> str:
+                patched = _patch_bundle_member(
+                    member,
+                    text,
+                    uuid_replacer=uuid_replacer,
+                    sqlalchemy_uri=sqlalchemy_uri,
+                    database_name=env.environ_id,
+                    db_uuid=db_uuid,
+                    schema_name=schema_name,
+                )
+                match = _UUID_FIELD_RE.search(patched)
+                if match:
+                    imported_uuids.setdefault(member.split("/", 1)[0], set()).add(match.group(1).lower())
+                return patched
+
+            if "metadata.yaml" not in bundle.yaml_texts():
+                logger.warning("  [yellow]⚠[/yellow] 'metadata.yaml' not found in ZIP skipping asset type patch")
+            bundle_file = bundle.rewrite(_patch, root_name=zip_path.stem)
 
     except (OSError, BadZipFile) as exc:
         logger.error(f"  [bold red]✘[/bold red] File system or ZIP error while processing '{zip_path.name}'.")
         logger.debug(f"  Exception details for '{zip_path.name}': {exc}")
         return False, set()
 
-    if not _import_zip_to_superset(base_url, superset_token, csrf_token, zip_path):
+    with bundle_file:
+        if import_slots is None:
+            imported = _import_zip_to_superset(base_url, superset_token, csrf_token, bundle_file, zip_path.name)
+        else:
+            with import_slots:
+                imported = _import_zip_to_superset(base_url, superset_token, csrf_token, bundle_file, zip_path.name)
+    if not imported:
         logger.error(f"  [bold red]✘[/bold red] Failed to import ZIP '{zip_path.name}' to Superset.")
         return False, set()
 
-    return True, new_dashboard_uuids
+    index = get_asset_index(base_url, superset_token)
+    for kind in ("datasets", "charts", "dashboards"):
+        try:
+            index.record_import(kind, imported_uuids.get(kind, set()))
+        except Exception as exc:
+            logger.debug(f"  Could not refresh the Superset {kind} index: {exc}")
+
+    return True, imported_uuids.get("dashboards", set())
 
 
 # ---------------------------------------------------------------------------
@@ -422,24 +468,17 @@ def _process_dashboard_zip(
 # ---------------------------------------------------------------------------
 
 
-def _read_uuids_from_zip(zip_path: Path) -> set[str]:
-    """Read all top-level entity UUIDs directly from YAML entries inside *zip_path*.
+def _read_uuids_from_bundle(bundle: SupersetBundle) -> set[str]:
+    """Read all top-level entity UUIDs from the YAML members of *bundle*.
 
     Returns:
         A set of lowercase UUID strings found in the ZIP.
     """
     uuids: set[str] = set()
-    try:
-        with ZipFile(zip_path, "r") as zf:
-            for member in zf.namelist():
-                if not member.endswith(".yaml"):
-                    continue
-                raw = zf.read(member).decode("utf-8", errors="replace")
-                match = _UUID_FIELD_RE.search(raw)
-                if match:
-                    uuids.add(match.group(1).lower())
-    except Exception as exc:
-        logger.debug(f"  Could not read UUIDs from {zip_path.name}: {exc}")
+    for raw in bundle.yaml_texts().values():
+        match = _UUID_FIELD_RE.search(raw)
+        if match:
+            uuids.add(match.group(1).lower())
     return uuids
 
 
@@ -455,24 +494,10 @@ def _assets_exist_in_superset(base_url: str, superset_jwt: str, uuids: set[str])
     if not uuids:
         return result
 
-    headers = {"Authorization": f"Bearer {superset_jwt}"}
-    _checks: list[tuple[str, str, str]] = [
-        ("datasets", "/api/v1/dataset/", "uuid"),
-        ("charts", "/api/v1/chart/", "uuid"),
-        ("dashboards", "/api/v1/dashboard/", "uuid"),
-    ]
-
-    for folder_key, endpoint, uuid_field in _checks:
+    index = get_asset_index(base_url, superset_jwt)
+    for folder_key in result:
         try:
-            response = requests.get(
-                f"{base_url}{endpoint}",
-                headers=headers,
-                params={"page_size": 1000},
-                timeout=10,
-            )
-            response.raise_for_status()
-            existing = {(item.get(uuid_field) or "").lower() for item in response.json().get("result", [])}
-            matched = uuids & existing
+            matched = index.existing(folder_key, uuids)
             if matched:
                 result[folder_key] = True
                 logger.debug(f"  {folder_key}: {len(matched)} existing UUID(s) found UUIDs will NOT be regenerated for this component")
@@ -492,62 +517,41 @@ def _assets_exist_in_superset(base_url: str, superset_jwt: str, uuids: set[str])
 
 
 def _regenerate_superset_uuids(
-    base_dir_path: str | Path,
+    yaml_texts: dict[str, str],
     existing: dict[str, bool] | None = None,
-) -> dict:
-    """Regenerate UUIDs for Superset components that haven't been deployed yet.
+) -> dict[str, str]:
+    """Build new UUIDs for Superset components that haven't been deployed yet.
 
     Skips ``databases/`` and any folder marked as deployed in *existing*.
-    Pass 1 collects old→new UUID mapping; Pass 2 replaces across all files
-    so cross-references (e.g. chart → dataset_uuid) remain consistent.
+    The mapping is applied to every member in a single scan per member by
+    ``_patch_bundle_member`` so cross-references (e.g. chart → dataset_uuid) remain consistent.
+
+    Args:
+        yaml_texts: ``{member path relative to the bundle root: text}``.
+        existing:   ``{folder: already deployed}`` from ``_assets_exist_in_superset``.
 
     Returns:
         ``{old_uuid: new_uuid}`` mapping, empty if nothing was regenerated.
     """
-    base_dir = Path(base_dir_path)
     existing = existing or {}
 
     skip_folders = {"databases"} | {folder for folder, deployed in existing.items() if deployed}
     active = sorted({"datasets", "charts", "dashboards", "themes"} - skip_folders)
     logger.debug(f"  UUID regen active: {active or 'none'}, skipped: {sorted(skip_folders)}")
 
-    all_files: list[Path] = sorted(base_dir.rglob("*.yaml"))
     uuid_mapping: dict[str, str] = {}
-
-    for yaml_file in all_files:
-        try:
-            top_folder = yaml_file.relative_to(base_dir).parts[0]
-        except (ValueError, IndexError):
-            top_folder = ""
-
-        if top_folder in skip_folders:
+    for member in sorted(yaml_texts):
+        if member.split("/", 1)[0] in skip_folders:
             continue
-        try:
-            raw = yaml_file.read_text(encoding="utf-8")
-            match = _UUID_FIELD_RE.search(raw)
-            if match:
-                old_uuid = match.group(1).lower()
-                uuid_mapping[old_uuid] = str(_uuid_mod.uuid4())
-        except (OSError, UnicodeError) as exc:
-            logger.warning(f"  [yellow]⚠[/yellow] Could not read {yaml_file.name} for UUID extraction: {exc}")
+        match = _UUID_FIELD_RE.search(yaml_texts[member])
+        if match:
+            uuid_mapping[match.group(1).lower()] = str(_uuid_mod.uuid4())
 
     if not uuid_mapping:
         logger.debug("  No UUIDs regenerated all components already present in Superset")
         return {}
 
-    for yaml_file in all_files:
-        try:
-            raw = yaml_file.read_text(encoding="utf-8")
-            patched = raw
-            for old_uuid, new_uuid in uuid_mapping.items():
-                patched = patched.replace(old_uuid, new_uuid)
-                patched = patched.replace(old_uuid.upper(), new_uuid)
-            if patched != raw:
-                yaml_file.write_text(patched, encoding="utf-8", newline="\n")
-        except (OSError, UnicodeError) as exc:
-            logger.warning(f"  [yellow]⚠[/yellow] Could not update UUIDs in {yaml_file.name}: {exc}")
-
-    logger.debug(f"  Regenerated {len(uuid_mapping)} UUID(s) for {', '.join(active) or 'none'} across {len(all_files)} file(s)")
+    logger.debug(f"  Regenerated {len(uuid_mapping)} UUID(s) for {', '.join(active) or 'none'} across {len(yaml_texts)} file(s)")
     return uuid_mapping
 
 
@@ -555,145 +559,72 @@ def _regenerate_superset_uuids(
 # ZIP content patching helpers
 # ---------------------------------------------------------------------------
 
-
-def _patch_metadata(content_dir: Path) -> None:
-    """Ensure metadata.yaml declares ``type: assets`` for the assets import endpoint."""
-    meta_file = content_dir / "metadata.yaml"
-    if not meta_file.is_file():
-        logger.warning("  [yellow]⚠[/yellow] 'metadata.yaml' not found in ZIP skipping asset type patch")
-        return
-
-    try:
-        raw = meta_file.read_text(encoding="utf-8")
-        patched = sub(pattern=r"^(type:\s*).*$", repl=r"\g<1>assets", string=raw, flags=MULTILINE)
-        if patched != raw:
-            meta_file.write_text(patched, encoding="utf-8", newline="\n")
-            logger.debug("  Patched 'metadata.yaml' type 'assets'")
-    except OSError as exp:
-        logger.error(f"  [bold red]✘[/bold red] File system error while patching 'metadata.yaml': {exp}")
+_METADATA_TYPE_RE = compile(r"^(type:\s*).*$", MULTILINE)
+_DB_URI_RE = compile(r"^(sqlalchemy_uri:\s*).*$", MULTILINE)
+_DB_NAME_RE = compile(r"^(database_name:\s*).*$", MULTILINE)
+_DB_UUID_RE = compile(r"^(uuid:\s*)([0-9a-f-]{36})\s*$", MULTILINE | IGNORECASE)
+_DATASET_SCHEMA_RE = compile(r"^(schema:\s*)(\S+)\s*$", MULTILINE)
+_DATASET_DB_UUID_RE = compile(r"^(database_uuid:\s*)([0-9a-f-]{36})\s*$", MULTILINE | IGNORECASE)
 
 
-def _patch_database_dir(tmp_dir: Path, sqlalchemy_uri: str, database_name: str, db_uuid: str = "") -> None:
-    """Patch ``sqlalchemy_uri``, ``database_name``, and optionally ``uuid`` in ``databases/``.
+def _patch_bundle_member(
+    member: str,
+    text: str,
+    uuid_replacer: MultiReplacer,
+    sqlalchemy_uri: str,
+    database_name: str,
+    db_uuid: str,
+    schema_name: str,
+) -> str:
+    """Apply every patch relevant to one bundle member and return the new text.
 
     Args:
-        tmp_dir:        Root of the unzipped export.
+        member:         Path of the member relative to the bundle root.
+        text:           Current YAML text.
+        uuid_replacer:  Old → new UUID substitutions built from ``_regenerate_superset_uuids``.
         sqlalchemy_uri: Full SQLAlchemy connection string for the target env.
         database_name:  Superset display name for the database (``env.environ_id``).
-        db_uuid:        UUID returned by Superset after datasource creation.
-                        Pass an empty string to skip UUID pinning.
+        db_uuid:        UUID returned by Superset after datasource creation;
+                        empty to skip UUID pinning.
+        schema_name:    Target PostgreSQL schema for the current workspace.
     """
-    db_dir = tmp_dir / "databases"
-    if not db_dir.is_dir():
-        logger.warning("  [yellow]⚠[/yellow] No 'databases/' directory found in ZIP skipping database patch")
-        return
-
-    _uri_re = compile(r"^(sqlalchemy_uri:\s*).*$", MULTILINE)
-    _name_re = compile(r"^(database_name:\s*).*$", MULTILINE)
-    _uuid_re = compile(r"^(uuid:\s*)([0-9a-f-]{36})\s*$", MULTILINE | IGNORECASE)
-
-    patched_files: list[str] = []
-    for yaml_file in db_dir.glob("*.yaml"):
-        try:
-            raw = yaml_file.read_text(encoding="utf-8")
-            result = raw
-
-            if "sqlalchemy_uri" in result:
-                result = _uri_re.sub(lambda m: f"{m.group(1)}{sqlalchemy_uri}", result)
-            if "database_name" in result:
-                result = _name_re.sub(lambda m: f"{m.group(1)}{database_name}", result)
-            if db_uuid and "uuid" in result:
-                result = _uuid_re.sub(lambda m: f"{m.group(1)}{db_uuid}", result)
-
-            if result != raw:
-                yaml_file.write_text(result, encoding="utf-8", newline="\n")
-                patched_files.append(yaml_file.name)
-                logger.debug(f"  Patched databases/{yaml_file.name}")
-        except Exception as exc:
-            logger.warning(f"  [yellow]⚠[/yellow] Could not patch {yaml_file.name}: {exc}")
-
-    if patched_files:
-        uuid_note = f", uuid='{db_uuid}'" if db_uuid else ""
-        logger.debug(
-            f"  Database YAML patched "
-            f"(database_name='{database_name}', sqlalchemy_uri updated{uuid_note}) "
-            f"in {len(patched_files)} file(s)"
-        )
-    else:
-        logger.debug("  No database YAML files found to patch in 'databases/'")
-
-
-def _patch_schema_in_datasets_dir(tmp_dir: Path, schema_name: str, db_uuid: str = "") -> None:
-    """Patch schema references and optionally pin ``database_uuid`` in every dataset YAML.
-
-    Args:
-        tmp_dir:     Root of the unzipped export.
-        schema_name: Target PostgreSQL schema for the current workspace.
-        db_uuid:     Superset database UUID.  Pass an empty string to skip pinning.
-    """
-    datasets_dir = tmp_dir / "datasets"
-    if not datasets_dir.is_dir():
-        logger.warning("  [yellow]⚠[/yellow] No 'datasets/' directory found in ZIP skipping dataset schema patch")
-        return
-
-    _schema_re = compile(r"^(schema:\s*)(\S+)\s*$", MULTILINE)
-    _db_uuid_re = compile(r"^(database_uuid:\s*)([0-9a-f-]{36})\s*$", MULTILINE | IGNORECASE)
+    result, uuid_count = uuid_replacer.subn(text)
+    parts = member.split("/")
+    if member == "metadata.yaml":
+        result = _patch_metadata(result)
+    elif parts[0] == "databases" and len(parts) == 2:
+        result = _patch_database_yaml(result, sqlalchemy_uri, database_name, db_uuid)
+    elif parts[0] == "datasets":
+        result = _patch_dataset_yaml(result, schema_name, db_uuid)
+    if result != text:
+        logger.debug(f"  Patched {member} ({uuid_count} UUID substitution(s))")
+    return result
 
-    schema_patched: list[str] = []
-    db_uuid_patched: int = 0
 
-    for yaml_file in datasets_dir.rglob("*.yaml"):
-        try:
-            raw = yaml_file.read_text(encoding="utf-8")
-            result = raw
-
-            match = _schema_re.search(result)
-            if match:
-                old_schema = match.group(2)
-                if old_schema != schema_name:
-                    result = result.replace(old_schema, schema_name)
-                    schema_patched.append(yaml_file.name)
-                    logger.debug(f"  Patched schema in {yaml_file.name}: '{old_schema}' → '{schema_name}'")
-
-            if db_uuid and "database_uuid" in result:
-                new_result = _db_uuid_re.sub(rf"\g<1>{db_uuid}", result)
-                if new_result != result:
-                    db_uuid_patched += 1
-                    logger.debug(f"  Patched 'database_uuid' in {yaml_file.name} → {db_uuid}")
-                    result = new_result
-
-            if result != raw:
-                yaml_file.write_text(result, encoding="utf-8", newline="\n")
-        except Exception as exc:
-            logger.warning(f"  [yellow]⚠[/yellow] Could not patch dataset {yaml_file.name}: {exc}")
-
-    if schema_patched:
-        logger.debug(f"  Schema updated to '{schema_name}' in {len(schema_patched)} dataset file(s)")
-    else:
-        logger.debug("  No dataset files required schema patching")
+def _patch_metadata(text: str) -> str:
+    """Ensure metadata.yaml declares ``type: assets`` for the assets import endpoint."""
+    return _METADATA_TYPE_RE.sub(r"\g<1>assets", text)
 
-    if db_uuid_patched:
-        logger.debug(f"  'database_uuid' pinned to '{db_uuid}' in {db_uuid_patched} dataset file(s)")
-    elif db_uuid:
-        logger.debug("  No dataset files had a 'database_uuid' field to pin")
 
+def _patch_database_yaml(text: str, sqlalchemy_uri: str, database_name: str, db_uuid: str = "") -> str:
+    """Patch ``sqlalchemy_uri``, ``database_name``, and optionally ``uuid`` of a ``databases/`` YAML."""
+    if "sqlalchemy_uri" in text:
+        text = _DB_URI_RE.sub(lambda m: f"{m.group(1)}{sqlalchemy_uri}", text)
+    if "database_name" in text:
+        text = _DB_NAME_RE.sub(lambda m: f"{m.group(1)}{database_name}", text)
+    if db_uuid and "uuid" in text:
+        text = _DB_UUID_RE.sub(lambda m: f"{m.group(1)}{db_uuid}", text)
+    return text
 
-def _repack_zip(zip_path: Path, tmp_dir: Path) -> None:
-    """Repack the contents of *tmp_dir* back into *zip_path*, replacing it in-place."""
-    root_name = zip_path.stem
-    tmp_items = list(tmp_dir.iterdir())
-    base = tmp_items[0] if len(tmp_items) == 1 and tmp_items[0].is_dir() else tmp_dir
 
-    try:
-        with ZipFile(zip_path, "w", compression=ZIP_DEFLATED) as zf:
-            for file in sorted(base.rglob("*")):
-                if file.is_file():
-                    arcname = f"{root_name}/{file.relative_to(base).as_posix()}"
-                    zf.write(file, arcname)
-        logger.debug(f"  Repacked '{zip_path.name}' successfully")
-    except OSError as exp:
-        logger.error(f"  [bold red]✘[/bold red] File system error while repacking '{zip_path.name}': {exp}")
-        raise
+def _patch_dataset_yaml(text: str, schema_name: str, db_uuid: str = "") -> str:
+    """Patch the schema and optionally pin ``database_uuid`` in a dataset YAML."""
+    match = _DATASET_SCHEMA_RE.search(text)
+    if match and match.group(2) != schema_name:
+        text = MultiReplacer({match.group(2): schema_name}).sub(text)
+    if db_uuid and "database_uuid" in text:
+        text = _DATASET_DB_UUID_RE.sub(lambda m: f"{m.group(1)}{db_uuid}", text)
+    return text
 
 
 # ---------------------------------------------------------------------------
@@ -705,10 +636,15 @@ def _import_zip_to_superset(
     base_url: str,
     superset_jwt: str,
     csrf_token: str,
-    zip_path: Path,
+    bundle: BinaryIO,
+    bundle_name: str,
 ) -> bool:
     """POST a zip bundle to the Superset API to import all assets at once.
 
+    Args:
+        bundle:      Readable ZIP content, positioned at its start.
+        bundle_name: File name sent with the upload.
+
     Returns:
         True on successful import (HTTP 2xx), False on any error.
     """
@@ -719,14 +655,13 @@ def _import_zip_to_superset(
         "Referer": base_url,
     }
     try:
-        with zip_path.open("rb") as fh:
-            files = {"bundle": (zip_path.name, fh, "application/zip")}
-            response = requests.post(url, headers=headers, files=files, data={"overwrite": "true"}, timeout=60)
+        files = {"bundle": (bundle_name, bundle, "application/zip")}
+        response = http_client.post(url, headers=headers, files=files, data={"overwrite": "true"}, timeout=60)
         response.raise_for_status()
-        logger.info(f"  [bold green]✔[/bold green] Zip [cyan]{zip_path.name}[/cyan] imported into Superset successfully")
+        logger.info(f"  [bold green]✔[/bold green] Zip [cyan]{bundle_name}[/cyan] imported into Superset successfully")
         return True
     except RequestException as exp:
-        logger.error(f"  [bold red]✘[/bold red] Failed to import '{zip_path.name}' into Superset: {exp}")
+        logger.error(f"  [bold red]✘[/bold red] Failed to import '{bundle_name}' into Superset: {exp}")
         if exp.response is not None:
             try:
                 logger.debug(f"  Response details: {exp.response.json()}")
@@ -734,7 +669,7 @@ def _import_zip_to_superset(
                 logger.debug(f"  Response details (raw): {exp.response.text[:2000]}")
         return False
     except Exception as exp:
-        logger.error(f"  [bold red]✘[/bold red] Unexpected error importing '{zip_path.name}': {exp}")
+        logger.error(f"  [bold red]✘[/bold red] Unexpected error importing '{bundle_name}': {exp}")
         return False
 
 
@@ -751,7 +686,7 @@ def _get_superset_csrf_token(base_url: str, bearer_token: str) -> str | None:
     """
     url = f"{base_url.rstrip('/')}/api/v1/security/csrf_token/"
     try:
-        response = requests.get(url, headers={"Authorization": f"Bearer {bearer_token}"}, timeout=10)
+        response = http_client.get(url, headers={"Authorization": f"Bearer {bearer_token}"}, timeout=10)
         response.raise_for_status()
         csrf = response.json().get("result")
         if not csrf:
@@ -767,10 +702,13 @@ def _get_superset_csrf_token(base_url: str, bearer_token: str) -> str | None:
 # ---------------------------------------------------------------------------
 
 
+@traced("superset.embedded_uuids", "superset")
 def _fetch_and_store_embedded_dashboard_uuids(
     base_url: str,
     superset_jwt: str,
     zip_uuids: set[str] | None = None,
+    max_workers: int = SUPERSET_EMBED_WORKERS,
+    refresh_jwt: Callable[[], str | None] | None = None,
 ) -> bool:
     """Enable embedding and fetch the embedded UUID for each imported dashboard,
     then persist them into the Babylon variables file.
@@ -786,6 +724,8 @@ def _fetch_and_store_embedded_dashboard_uuids(
         superset_jwt: Valid Superset Bearer token.
         zip_uuids:    Set of dashboard UUIDs from the imported ZIP.  When
                       provided, only dashboards matching this set are processed.
+        max_workers:  Maximum number of dashboards handled concurrently.
+        refresh_jwt:  Returns a new Superset token when the current one expires.
 
     Returns:
         True if at least one embedded UUID was written; False on total failure.
@@ -795,18 +735,21 @@ def _fetch_and_store_embedded_dashboard_uuids(
         return False
 
     variables_yaml_path = Path(env.variable_files[0])
-    auth_headers = {"Authorization": f"Bearer {superset_jwt}"}
+    session = SupersetSession(base_url, superset_jwt, refresh_jwt=refresh_jwt)
 
-    dashboards = _get_filtered_dashboards(base_url, auth_headers, zip_uuids)
+    dashboards = _get_filtered_dashboards(base_url, superset_jwt, zip_uuids)
     if dashboards is None:
         return False
     if not dashboards:
         logger.warning("  [yellow]⚠[/yellow] No imported dashboards found in Superset embedded UUID feedback skipped")
         return False
 
+    workers = max(1, min(max_workers, len(dashboards)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="superset-embed") as pool:
+        results = list(pool.map(lambda dashboard: _get_embedded_uuid_for_dashboard(session, dashboard), dashboards))
+
     updates: dict[str, dict] = {}
-    for dashboard in dashboards:
-        result = _get_embedded_uuid_for_dashboard(base_url, superset_jwt, auth_headers, dashboard)
+    for result in results:
         if result is None:
             continue
         key, embedded_uuid, original_id = result
@@ -829,23 +772,16 @@ def _fetch_and_store_embedded_dashboard_uuids(
 
 def _get_filtered_dashboards(
     base_url: str,
-    headers: dict,
+    superset_jwt: str,
     zip_uuids: set[str] | None,
 ) -> list[dict] | None:
-    """Fetch all Superset dashboards and filter to those present in *zip_uuids*.
+    """List Superset dashboards (from the shared asset index) and filter to those present in *zip_uuids*.
 
     Returns:
         Filtered list of dashboard dicts, or ``None`` on API error.
     """
     try:
-        resp = requests.get(
-            f"{base_url}/api/v1/dashboard/",
-            headers=headers,
-            params={"page_size": 1000},
-            timeout=15,
-        )
-        resp.raise_for_status()
-        all_dashboards: list[dict] = resp.json().get("result", [])
+        all_dashboards: list[dict] = list(get_asset_index(base_url, superset_jwt).assets("dashboards").values())
     except Exception as exc:
         logger.error(f"  [bold red]✘[/bold red] Could not list Superset dashboards: {exc}")
         return None
@@ -858,12 +794,7 @@ def _get_filtered_dashboards(
     return filtered
 
 
-def _get_embedded_uuid_for_dashboard(
-    base_url: str,
-    superset_jwt: str,
-    auth_headers: dict,
-    dashboard: dict,
-) -> tuple[str, str, str] | None:
+def _get_embedded_uuid_for_dashboard(session: SupersetSession, dashboard: dict) -> tuple[str, str, str] | None:
     """Enable embedding for one dashboard and return ``(key, uuid, original_id)``.
 
     Returns ``None`` when the dashboard should be skipped.
@@ -881,15 +812,11 @@ def _get_embedded_uuid_for_dashboard(
         logger.warning(f"  [yellow]⚠[/yellow] Dashboard '{name}' produced an empty sanitised key skipping")
         return None
 
-    if not _enable_dashboard_embedding(base_url, superset_jwt, auth_headers, integer_id, name):
+    if not _enable_dashboard_embedding(session, integer_id, name):
         return None
 
     try:
-        emb_resp = requests.get(
-            f"{base_url}/api/v1/dashboard/{integer_id}/embedded",
-            headers=auth_headers,
-            timeout=10,
-        )
+        emb_resp = session.get(f"/api/v1/dashboard/{integer_id}/embedded", timeout=10)
         emb_resp.raise_for_status()
     except Exception as exc:
         logger.error(f"  [bold red]✘[/bold red] Could not fetch embedded UUID for dashboard '{name}' (id={integer_id}).")
@@ -907,31 +834,17 @@ def _get_embedded_uuid_for_dashboard(
     return key, embedded_uuid, original_id
 
 
-def _enable_dashboard_embedding(
-    base_url: str,
-    superset_jwt: str,
-    auth_headers: dict,
-    integer_id: int,
-    name: str,
-) -> bool:
+def _enable_dashboard_embedding(session: SupersetSession, integer_id: int, name: str) -> bool:
     """Enable embedding on a single Superset dashboard via POST (idempotent).
 
     Returns:
         ``True`` if the POST succeeded (2xx), ``False`` otherwise.
     """
-    csrf = _get_superset_csrf_token(base_url, superset_jwt)
-    post_headers = {
-        **auth_headers,
-        "X-CSRFToken": csrf or "",
-        "Referer": base_url,
-        "Content-Type": "application/json",
-    }
-    enable_resp = requests.post(
-        f"{base_url}/api/v1/dashboard/{integer_id}/embedded",
-        headers=post_headers,
-        json={"allowed_domains": []},
-        timeout=10,
-    )
+    try:
+        enable_resp = session.post(f"/api/v1/dashboard/{integer_id}/embedded", json={"allowed_domains": []}, timeout=10)
+    except RequestException as exc:
+        logger.error(f"  [bold red]✘[/bold red] Could not enable embedding for '{name}' (id={integer_id}): {exc}")
+        return False
     if not enable_resp.ok:
         logger.error(f"  [bold red]✘[/bold red] Could not enable embedding for '{name}' (id={integer_id}).")
         logger.debug(f"  Status: {enable_resp.status_code}, Response: {enable_resp.text[:200]}")
@@ -950,27 +863,37 @@ def _write_dashboard_updates_to_yaml(
 ) -> bool:
     """Persist ``{key: {uuid, original_id}}`` mapping into the variables YAML.
 
+    The file is parsed and written once for all entries, atomically, and left
+    untouched when every entry already holds the same values.
+
     Returns:
-        ``True`` if at least one entry was written, ``False`` otherwise.
+        ``True`` if the file holds every entry, ``False`` otherwise.
     """
     if not variables_yaml_path.is_file():
         logger.error(f"  [bold red]✘[/bold red] Variables file not found: {variables_yaml_path}")
         return False
 
-    any_written = False
-    for key, entry in updates.items():
-        ok = update_variables_file_entry(
-            variables_path=variables_yaml_path,
-            key=key,
-            uuid=entry["uuid"],
-            original_id=entry.get("original_id"),
-        )
-        if not ok:
-            logger.warning(f"  [yellow]⚠[/yellow] Failed to write entry '{key}' to '{variables_yaml_path.name}'")
-            continue
-        any_written = True
-        logger.debug(f"  '{key}': original_id={entry.get('original_id')}, uuid={entry.get('uuid')}, path='{variables_yaml_path}'")
-    return any_written
+    try:
+        with VariablesFileEditor(variables_yaml_path) as editor:
+            for key, entry in updates.items():
+                editor.update_entry(key, _dashboard_entry(entry["uuid"], entry.get("original_id")))
+            for change in editor.changes:
+                logger.debug(f"  '{change.key}': {change.old} -> {change.new}, path='{variables_yaml_path}'")
+            if not editor.changed:
+                logger.debug(f"  '{variables_yaml_path.name}' already up to date")
+        return True
+    except (OSError, ValueError) as exc:
+        logger.error(f"  [bold red]✘[/bold red] Could not update '{variables_yaml_path.name}': {exc}")
+    except Exception as exc:
+        logger.error(f"  [bold red]✘[/bold red] YAML error updating '{variables_yaml_path.name}': {exc}")
+    return False
+
+
+def _dashboard_entry(uuid: str, original_id: str | None) -> dict:
+    entry = {"uuid": uuid}
+    if original_id is not None:
+        entry["original_id"] = str(original_id)
+    return entry
 
 
 def update_variables_file_entry(
@@ -983,6 +906,8 @@ def update_variables_file_entry(
 
     Uses ``ruamel.yaml`` to preserve all existing formatting, comments, and
     template variables verbatim. Only the target ``key`` block is touched.
+    To update several entries, use ``VariablesFileEditor`` directly so the
+    file is parsed and written once.
 
     Args:
         variables_path: Absolute path to the Babylon ``variables.yaml`` file.
@@ -997,36 +922,13 @@ def update_variables_file_entry(
     if not variables_path.is_file():
         logger.error(f"  [bold red]✘[/bold red] Variables file not found: {variables_path}")
         return False
-    if variables_path.suffix in {".tpl", ".tmpl", ".template"}:
-        logger.error(f"  [bold red]✘[/bold red] Refusing to modify a template file: {variables_path}")
-        return False
 
     try:
-        ry = _RYAML()
-        ry.preserve_quotes = True
-        ry.width = 4096
-        ry.best_map_flow_style = False
-
-        raw = variables_path.read_text(encoding="utf-8")
-        data = ry.load(raw)
-        if data is None:
-            data = ry.load("{}")
-
-        entry = data.get(key)
-        if isinstance(entry, dict):
-            entry["uuid"] = uuid
-            if original_id is not None:
-                entry["original_id"] = str(original_id)
-        else:
-            new_entry: dict = {"uuid": uuid}
-            if original_id is not None:
-                new_entry["original_id"] = str(original_id)
-            data[key] = new_entry
-
-        buf = StringIO()
-        ry.dump(data, buf)
-        variables_path.write_text(buf.getvalue(), encoding="utf-8", newline="\n")
+        with VariablesFileEditor(variables_path) as editor:
+            editor.update_entry(key, _dashboard_entry(uuid, original_id))
         return True
+    except ValueError as exc:
+        logger.error(f"  [bold red]✘[/bold red] {exc}")
     except OSError as exc:
         logger.error(f"  [bold red]✘[/bold red] File system error updating '{variables_path.name}': {exc}")
     except Exception as exc:
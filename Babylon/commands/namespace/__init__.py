@@ -1,20 +1,22 @@
 from click import group
 
-from Babylon.commands.namespace.get_all_states import get_states
-from Babylon.commands.namespace.get_contexts import get_contexts
-from Babylon.commands.namespace.use import use
-from Babylon.utils.environment import Environment
+from Babylon.utils.lazy_group import LazyGroup
 
-env = Environment()
+NAMESPACE_COMMANDS = {
+    "use": ("Babylon.commands.namespace.use:use", "Switch to a specific Babylon namespace or create a new one"),
+    "get-contexts": ("Babylon.commands.namespace.get_contexts:get_contexts", "Display the currently active namespace"),
+    "get-states": (
+        "Babylon.commands.namespace.get_all_states:get_states",
+        "Display states from local machine or remote Kubernetes storage.",
+    ),
+    "rollback-state": (
+        "Babylon.commands.namespace.rollback_state:rollback_state",
+        "List the local state versions of the active namespace, or restore VERSION",
+    ),
+}
 
 
-@group()
+@group(cls=LazyGroup, lazy_commands=NAMESPACE_COMMANDS)
 def namespace():
     """Babylon namespace"""
     pass
-
-
-list_groups = [use, get_contexts, get_states]
-
-for _group in list_groups:
-    namespace.add_command(_group)
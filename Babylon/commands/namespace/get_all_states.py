@@ -1,6 +1,6 @@
 from logging import getLogger
 
-from click import Choice, argument, command, echo, style
+from click import Choice, argument, command, echo, option, style
 
 from Babylon.utils.environment import Environment
 from Babylon.utils.response import CommandResponse
@@ -9,39 +9,57 @@ logger = getLogger(__name__)
 env = Environment()
 
 
+def _echo_table(headers: tuple[str, ...], rows: list[tuple[str, ...]]) -> None:
+    widths = [max(len(value) for value in column) + 2 for column in zip(headers, *rows)]
+    echo("    " + "".join(h.ljust(w) for h, w in zip(headers, widths)).rstrip())
+    for row in rows:
+        echo(style("  • ", fg="green") + "".join(v.ljust(w) for v, w in zip(row, widths)).rstrip())
+
+
+def _format_size(size: int | None) -> str:
+    if size is None:
+        return ""
+    return f"{size} B" if size < 1024 else f"{size / 1024:.1f} KiB"
+
+
 def _get_local_states() -> bool:
     echo(style("\n 📂 Local States", bold=True, fg="cyan"))
     if not env.state_dir.exists():
         logger.error(f"  [bold red]✘[/bold red] Directory not found: [dim]{env.state_dir}[/dim]")
         return False
-    local_files = sorted(env.state_dir.glob("state.*.yaml"))
-    if not local_files:
-        logger.warning("  [yellow]⚠[/yellow] No local state files found")
+    entries = env.local_state_backend.list_states()
+    if not entries:
+        logger.warning("  [yellow]⚠[/yellow] No local states found")
         return False
-    for f in local_files:
-        echo(style("  • ", fg="green") + f.name)
+    rows = [(e.context, e.tenant, "" if e.version is None else str(e.version), e.updated_at) for e in entries]
+    _echo_table(("CONTEXT", "TENANT", "VERSION", "UPDATED"), rows)
     return True
 
 
-def _get_remote_states() -> bool:
+def _get_remote_states(all_namespaces: bool = False) -> bool:
     echo(style("\n ☁️  Remote States", bold=True, fg="cyan"))
+    if not all_namespaces and not env.environ_id:
+        env.get_namespace_from_local()
     try:
-        remote_files = env.list_remote_states()
+        entries = env.list_remote_states(all_namespaces=all_namespaces)
     except Exception as e:
         logger.error(f"  [bold red]✘[/bold red] Failed to reach remote storage: {e}")
         return False
-    if not remote_files:
+    if not entries:
         logger.warning("  [yellow]⚠[/yellow] No remote states found")
         return False
-    for name in sorted(remote_files):
-        echo(style("  • ", fg="green") + name)
+    rows = [
+        (e.context, e.tenant, e.location, e.updated_at, _format_size(e.size))
+        for e in sorted(entries, key=lambda e: (e.context, e.tenant, e.location))
+    ]
+    _echo_table(("CONTEXT", "TENANT", "SECRET", "UPDATED", "SIZE"), rows)
     return True
 
 
 @command()
 @argument("target", type=Choice(["local", "remote"], case_sensitive=False))
-def get_states(target: str) -> CommandResponse:
+@option("-A", "--all-namespaces", is_flag=True, help="List remote states of every Kubernetes namespace.")
+def get_states(target: str, all_namespaces: bool) -> CommandResponse:
     """Display states from local machine or remote Kubernetes storage."""
-    handlers = {"local": _get_local_states, "remote": _get_remote_states}
-    results_found = handlers[target]()
+    results_found = _get_local_states() if target == "local" else _get_remote_states(all_namespaces)
     return CommandResponse.success() if results_found else CommandResponse.fail()
@@ -0,0 +1,38 @@
+from logging import getLogger
+
+from click import IntRange, argument, command, echo, style
+
+from Babylon.utils.decorators import injectcontext
+from Babylon.utils.environment import Environment
+from Babylon.utils.response import CommandResponse
+from Babylon.utils.state_backends import LOCAL_STATE_BACKEND_ENV_VAR, SqliteStateBackend
+
+logger = getLogger(__name__)
+env = Environment()
+
+
+@command()
+@injectcontext()
+@argument("version", type=IntRange(min=1), required=False)
+def rollback_state(version: int | None) -> CommandResponse:
+    """List the local state versions of the active namespace, or restore VERSION"""
+    backend = env.local_state_backend
+    if not isinstance(backend, SqliteStateBackend):
+        logger.error(f"  [bold red]✘[/bold red] State history requires {LOCAL_STATE_BACKEND_ENV_VAR}=sqlite")
+        return CommandResponse.fail()
+    if version is None:
+        history = backend.history_of(env.context_id, env.environ_id)
+        if not history:
+            logger.warning(f"  [yellow]⚠[/yellow] No local state for {env.context_id}/{env.environ_id}")
+            return CommandResponse.fail()
+        echo(style(f"\n 🕓 State versions of {env.context_id}/{env.environ_id}", bold=True, fg="cyan"))
+        for entry in history:
+            echo(style("  • ", fg="green") + f"{entry.version:<6}{entry.updated_at}")
+        return CommandResponse.success()
+    try:
+        new_version = backend.rollback(env.context_id, env.environ_id, version)
+    except KeyError as e:
+        logger.error(f"  [bold red]✘[/bold red] {e.args[0]}")
+        return CommandResponse.fail()
+    logger.info(f"  [green]✔[/green] State version [cyan]{version}[/cyan] restored as version [cyan]{new_version}[/cyan]")
+    return CommandResponse.success()
@@ -3,8 +3,8 @@ import os
 from pathlib import Path
 
 import polling2
-import requests
 
+from Babylon.utils import http_client
 from Babylon.utils.environment import Environment
 from Babylon.utils.interactive import confirm_deletion
 from Babylon.utils.request import oauth_request
@@ -103,10 +103,9 @@ class AzurePowerBIReportService:
         route = (
             f"https://api.powerbi.com/v1.0/myorg/groups/{workspace_id}/imports?datasetDisplayName={name}&nameConflict={name_conflict}"
         )
-        session = requests.Session()
         with open(pbix_filename, "rb") as _f:
             try:
-                response = session.post(url=route, headers=header, files={"file": _f})
+                response = http_client.post(route, headers=header, files={"file": _f})
             except Exception as e:
                 logger.error(f"[powerbi] request failed: {e}")
                 return None
@@ -6,14 +6,17 @@ from re import sub
 
 import click_log
 from click import Path as clickPath
-from click import echo, group, option
+from click import echo, get_current_context, group, option
 from rich.logging import RichHandler
 
-from Babylon.commands import list_groups
+from Babylon.commands import COMMANDS
 from Babylon.utils.decorators import prepend_doc_with_ascii
 from Babylon.utils.dry_run import display_dry_run
 from Babylon.utils.environment import Environment
+from Babylon.utils.http_metrics import finish_stats
 from Babylon.utils.interactive import INTERACTIVE_ARG_VALUE, interactive_run
+from Babylon.utils.lazy_group import LazyGroup
+from Babylon.utils.profiling import finish_profiling, profiler
 from Babylon.version import VERSION
 
 logger = logging.getLogger()
@@ -78,7 +81,7 @@ def setup_logging(log_path: pathlibPath = pathlibPath.cwd()) -> None:
     )
 
 
-@group(name="babylon", invoke_without_command=False)
+@group(name="babylon", cls=LazyGroup, lazy_commands=COMMANDS, invoke_without_command=False)
 @click_log.simple_verbosity_option(logger)
 @option(
     "-n",
@@ -105,6 +108,27 @@ def setup_logging(log_path: pathlibPath = pathlibPath.cwd()) -> None:
     default=pathlibPath.cwd(),
     help="Path to the directory where log files will be stored. If not set, defaults to current working directory.",
 )
+@option(
+    "--refresh-config",
+    "refresh_config",
+    is_flag=True,
+    help="Ignore cached configuration secrets and read them again from Kubernetes.",
+)
+@option(
+    "--profile-out",
+    "profile_out",
+    type=clickPath(dir_okay=False, writable=True, path_type=pathlibPath),
+    default=None,
+    help="Record the phases of the run, write them to this file in Chrome trace-event format and print the slowest ones.",
+)
+@option("--stats", "stats", is_flag=True, help="Print request counts and latencies per HTTP route at the end of the run.")
+@option(
+    "--stats-out",
+    "stats_out",
+    type=clickPath(dir_okay=False, writable=True, path_type=pathlibPath),
+    default=None,
+    help="Write the HTTP request metrics to this file in OpenMetrics text format.",
+)
 @option(
     INTERACTIVE_ARG_VALUE,
     "interactive",
@@ -113,17 +137,20 @@ def setup_logging(log_path: pathlibPath = pathlibPath.cwd()) -> None:
     help="Start an interactive session after command run.",
 )
 @prepend_doc_with_ascii
-def main(interactive, log_path):
+def main(interactive, log_path, refresh_config, profile_out, stats, stats_out):
     """
     CLI used for cloud interactions between CosmoTech and multiple cloud environment"""
     sys.tracebacklimit = 0
+    env.refresh_config = refresh_config
     setup_logging(pathlibPath(log_path))
+    if profile_out:
+        profiler.enable()
+        get_current_context().call_on_close(lambda: finish_profiling(profile_out))
+    if stats or stats_out:
+        get_current_context().call_on_close(lambda: finish_stats(stats, stats_out))
 
 
 main.result_callback()(interactive_run)
 
-for _group in list_groups:
-    main.add_command(_group)
-
 if __name__ == "__main__":
     main()
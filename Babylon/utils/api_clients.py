@@ -0,0 +1,102 @@
+"""
+Shared ``cosmotech_api.ApiClient`` registry.
+
+Building an ``ApiClient`` creates a new urllib3 pool manager, so every API
+class (organizations, solutions, workspaces, ...) now shares one pooled
+client per ``(api_url, token identity)`` for the whole process.
+
+The token identity is taken from the JWT claims (issuer, client and
+subject), which stay the same when the token is refreshed: a refreshed
+token is written into the existing client's ``Configuration`` instead of
+creating a new client. The registry also subscribes to the Keycloak token
+cache so clients are rotated as soon as the cache refreshes a token.
+"""
+
+import json
+import os
+from base64 import urlsafe_b64decode
+from hashlib import sha256
+from logging import getLogger
+from threading import Lock
+from typing import TypeVar
+
+from cosmotech_api import ApiClient, Configuration
+
+from Babylon.utils.credentials import keycloak_tokens
+from Babylon.utils.http_metrics import COSMOTECH_SERVICE, instrument_api_client
+
+logger = getLogger(__name__)
+
+# Maximum number of connections kept per host by each ApiClient.
+API_POOL_SIZE_ENV_VAR = "BABYLON_API_POOL_SIZE"
+DEFAULT_POOL_SIZE = 16
+
+ApiT = TypeVar("ApiT")
+
+
+def token_identity(token: str) -> str:
+    """Return a stable identity for *token*: its ``iss|azp|sub`` claims, or a hash if it is not a JWT."""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        identity = "|".join(str(claims.get(claim) or "") for claim in ("iss", "azp", "sub"))
+        if identity.strip("|"):
+            return identity
+    except (IndexError, ValueError, AttributeError):
+        pass
+    return sha256(token.encode("utf-8")).hexdigest()
+
+
+def _pool_size() -> int:
+    try:
+        return max(1, int(os.environ.get(API_POOL_SIZE_ENV_VAR, DEFAULT_POOL_SIZE)))
+    except ValueError:
+        logger.warning(f"  [yellow]⚠[/yellow] Ignoring invalid {API_POOL_SIZE_ENV_VAR} value")
+        return DEFAULT_POOL_SIZE
+
+
+class ApiClientRegistry:
+    """Process-wide cache of pooled ``ApiClient`` objects keyed by ``(api_url, token identity)``."""
+
+    def __init__(self, pool_size: int | None = None):
+        self.pool_size = pool_size
+        self._lock = Lock()
+        self._clients: dict[tuple[str, str], ApiClient] = {}
+
+    def get(self, api_url: str, token: str) -> ApiClient:
+        """Return the shared client for *api_url* authenticated with *token*."""
+        key = (api_url, token_identity(token))
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                configuration = Configuration(host=api_url)
+                configuration.access_token = token
+                configuration.connection_pool_maxsize = self.pool_size or _pool_size()
+                client = instrument_api_client(ApiClient(configuration), COSMOTECH_SERVICE)
+                self._clients[key] = client
+                logger.debug(f"  [dim]Created API client for {api_url}[/dim]")
+            elif client.configuration.access_token != token:
+                client.configuration.access_token = token
+            return client
+
+    def rotate(self, old_token: str, new_token: str) -> None:
+        """Replace *old_token* by *new_token* in every client using it."""
+        with self._lock:
+            for client in self._clients.values():
+                if client.configuration.access_token == old_token:
+                    client.configuration.access_token = new_token
+
+    def clear(self) -> None:
+        with self._lock:
+            for client in self._clients.values():
+                client.rest_client.pool_manager.clear()
+            self._clients.clear()
+
+
+api_clients = ApiClientRegistry()
+keycloak_tokens.subscribe(api_clients.rotate)
+
+
+def get_api(api_class: type[ApiT], config: dict, keycloak_token: str) -> ApiT:
+    """Return an *api_class* instance (``OrganizationApi``, ``RunnerApi``, ...) backed by the shared client."""
+    return api_class(api_clients.get(config.get("api_url"), keycloak_token))
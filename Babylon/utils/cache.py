@@ -0,0 +1,124 @@
+"""
+Process-wide and encrypted on-disk caches.
+
+On-disk entries are stored as a single JSON document encrypted with Fernet
+(AES-128-CBC + HMAC) and written atomically with ``0600`` permissions. A file
+that cannot be decrypted (wrong key, corruption, format change) is treated as
+an empty cache.
+"""
+
+import json
+import os
+import time
+from base64 import urlsafe_b64encode
+from hashlib import sha256
+from logging import getLogger
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import Lock
+
+from cryptography.fernet import Fernet, InvalidToken
+
+logger = getLogger(__name__)
+
+
+def is_enabled(variable: str) -> bool:
+    """Return ``True`` when the environment variable *variable* holds a truthy value."""
+    return os.environ.get(variable, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+class EncryptedFileCache:
+    """A JSON document stored encrypted in *path*.
+
+    Args:
+        path:   File holding the encrypted document.
+        secret: Key material; the Fernet key is derived from its SHA-256 digest.
+    """
+
+    def __init__(self, path: Path, secret: bytes):
+        self.path = Path(path)
+        self._fernet = Fernet(urlsafe_b64encode(sha256(secret).digest()))
+
+    def load(self) -> dict:
+        """Return the decrypted document, or an empty dict if unavailable."""
+        try:
+            return json.loads(self._fernet.decrypt(self.path.read_bytes()))
+        except FileNotFoundError:
+            return {}
+        except (InvalidToken, ValueError, OSError) as exc:
+            logger.debug(f"  Ignoring unreadable cache file {self.path}: {exc}")
+            return {}
+
+    def save(self, data: dict) -> None:
+        """Encrypt and atomically write *data*."""
+        token = self._fernet.encrypt(json.dumps(data).encode("utf-8"))
+        tmp_name = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with NamedTemporaryFile("wb", dir=self.path.parent, prefix=f".{self.path.name}.", delete=False) as tmp:
+                tmp_name = tmp.name
+                tmp.write(token)
+            os.chmod(tmp_name, 0o600)
+            os.replace(tmp_name, self.path)
+        except OSError as exc:
+            logger.debug(f"  Could not write cache file {self.path}: {exc}")
+            if tmp_name:
+                Path(tmp_name).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+class ConfigCache:
+    """Process-wide cache of configuration mappings with an optional on-disk mirror.
+
+    In memory, entries live for the whole process. When *ttl* is positive and
+    *secret* is given, entries are also written encrypted with *secret* in
+    *path* and reused by later processes for *ttl* seconds. The secret is never
+    stored next to the file: whoever can read the file still needs the secret.
+    """
+
+    def __init__(self, path: Path, ttl: int = 0, secret: bytes | None = None):
+        self.path = Path(path)
+        self.ttl = ttl if secret else 0
+        self._secret = secret
+        self._lock = Lock()
+        self._memory: dict[str, dict] = {}
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        return "|".join(parts)
+
+    def _disk(self) -> EncryptedFileCache | None:
+        if self.ttl <= 0:
+            return None
+        return EncryptedFileCache(self.path, self._secret)
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            if key in self._memory:
+                return self._memory[key]
+            disk = self._disk()
+            if disk is None:
+                return None
+            entry = disk.load().get(key)
+            if not entry or entry.get("stored_at", 0) + self.ttl < time.time():
+                return None
+            self._memory[key] = entry["value"]
+            return entry["value"]
+
+    def set(self, key: str, value: dict) -> None:
+        with self._lock:
+            self._memory[key] = value
+            disk = self._disk()
+            if disk is None:
+                return
+            now = time.time()
+            entries = {k: e for k, e in disk.load().items() if e.get("stored_at", 0) + self.ttl >= now}
+            entries[key] = {"stored_at": now, "value": value}
+            disk.save(entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self.path.unlink(missing_ok=True)
@@ -1,6 +1,9 @@
 import logging
 import sys
+import time
 from functools import wraps
+from hashlib import sha256
+from threading import Lock
 from typing import Any, Callable
 
 import requests
@@ -8,7 +11,10 @@ from azure.core.exceptions import ClientAuthenticationError
 from azure.identity import ClientSecretCredential, CredentialUnavailableError, DefaultAzureCredential
 from click import option
 
+from Babylon.utils import ORIGINAL_CONFIG_FOLDER_PATH, http_client
+from Babylon.utils.cache import EncryptedFileCache, is_enabled
 from Babylon.utils.checkers import check_email
+from Babylon.utils.profiling import traced
 from Babylon.utils.response import CommandResponse
 
 from .environment import Environment
@@ -16,6 +22,9 @@ from .environment import Environment
 logger = logging.getLogger("Babylon")
 env = Environment()
 
+# Set to a truthy value to persist Keycloak tokens (encrypted) between CLI invocations.
+TOKEN_CACHE_ENV_VAR = "BABYLON_TOKEN_CACHE"
+
 
 def get_default_powerbi_token():
     try:
@@ -43,6 +52,7 @@ def get_powerbi_token(email: str = None) -> str:
     return token.token
 
 
+@traced("auth.superset_token", "auth")
 def get_superset_token(base_url: str, config: dict) -> str | None:
     """
     Obtain a Superset-internal JWT for machine-to-machine API access.
@@ -76,7 +86,7 @@ def get_superset_token(base_url: str, config: dict) -> str | None:
 
     try:
         logger.debug(f"  [dim]→ Authenticating to Superset (db provider) at {url}[/dim]")
-        response = requests.post(url, json=payload, timeout=10)
+        response = http_client.post(url, json=payload, timeout=10)
         if not response.ok:
             logger.error(f"  [bold red]✘[/bold red] Superset login failed ({response.status_code}): {response.text}")
             return None
@@ -154,13 +164,100 @@ def get_keycloak_credentials() -> tuple[dict, dict]:
         logger.error(f"  [bold red]✘[/bold red] Unexpected error while retrieving Keycloak credentials: {e}")
 
 
-def get_keycloak_token() -> tuple[str, dict]:
-    """Returns keycloak token"""
-    try:
-        credentials, config = get_keycloak_credentials()
-        url = config["keycloak_token_url"]
+class KeycloakTokenCache:
+    """Process-wide, thread-safe cache of Keycloak access tokens.
+
+    Tokens are keyed by ``(token_url, client_id)`` and refreshed
+    ``REFRESH_MARGIN`` seconds before they expire.
+
+    When ``BABYLON_TOKEN_CACHE`` is enabled, tokens are also stored encrypted
+    under ``ORIGINAL_CONFIG_FOLDER_PATH`` with a key derived from the client
+    secret, so consecutive CLI invocations skip the identity-provider round trip.
+
+    Callbacks registered with ``subscribe()`` are called with
+    ``(old_token, new_token)`` whenever a cached token is replaced.
+    """
+
+    REFRESH_MARGIN = 30
+
+    def __init__(self):
+        # Guards ``_tokens``, ``_key_locks`` and ``_listeners``; never held during network or disk I/O.
+        self._lock = Lock()
+        self._tokens: dict[tuple[str, str], tuple[str, float]] = {}
+        # One lock per (token_url, client_id): concurrent callers of the same client share one request,
+        # different clients fetch their tokens in parallel.
+        self._key_locks: dict[tuple[str, str], Lock] = {}
+        self._listeners: list[Callable[[str, str], None]] = []
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens.clear()
+
+    def subscribe(self, callback: Callable[[str, str], None]) -> None:
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def _key_lock(self, key: tuple[str, str]) -> Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, Lock())
+
+    def _cached(self, key: tuple[str, str]) -> str | None:
+        with self._lock:
+            cached = self._tokens.get(key)
+        if cached and cached[1] - self.REFRESH_MARGIN > time.time():
+            return cached[0]
+        return None
+
+    def _store(self, key: tuple[str, str], access_token: str, expires_at: float) -> None:
+        with self._lock:
+            previous = self._tokens.get(key)
+            self._tokens[key] = (access_token, expires_at)
+            listeners = list(self._listeners)
+        if previous and previous[0] != access_token:
+            for callback in listeners:
+                callback(previous[0], access_token)
+
+    def get(self, url: str, credentials: dict) -> str:
+        """Return a valid access token, requesting a new one only when needed."""
+        key = (url, credentials["client_id"])
+        access_token = self._cached(key)
+        if access_token:
+            return access_token
+        with self._key_lock(key):
+            # Another thread may have refreshed the token while this one waited
+            access_token = self._cached(key)
+            if access_token:
+                return access_token
+
+            disk = self._disk_cache(url, credentials)
+            if disk is not None:
+                entry = disk.load()
+                if entry.get("access_token") and entry.get("expires_at", 0) - self.REFRESH_MARGIN > time.time():
+                    logger.debug("  Using Keycloak token from the on-disk cache")
+                    self._store(key, entry["access_token"], entry["expires_at"])
+                    return entry["access_token"]
+
+            access_token, expires_at = self._request(url, credentials)
+            if access_token:
+                self._store(key, access_token, expires_at)
+                if disk is not None:
+                    disk.save({"access_token": access_token, "expires_at": expires_at})
+            return access_token
+
+    @staticmethod
+    def _disk_cache(url: str, credentials: dict) -> EncryptedFileCache | None:
+        if not is_enabled(TOKEN_CACHE_ENV_VAR):
+            return None
+        name = sha256(f"{url}|{credentials['client_id']}".encode("utf-8")).hexdigest()[:16]
+        secret = f"{url}|{credentials['client_id']}|{credentials['client_secret']}".encode("utf-8")
+        return EncryptedFileCache(ORIGINAL_CONFIG_FOLDER_PATH / "cache" / f"token-{name}.bin", secret)
+
+    @staticmethod
+    def _request(url: str, credentials: dict) -> tuple[str | None, float]:
         headers = {"Content-Type": "application/x-www-form-urlencoded", "Accept": "application/json"}
-        response = requests.post(url=url, data=credentials, headers=headers, timeout=30)
+        requested_at = time.time()
+        response = http_client.post(url=url, data=credentials, headers=headers, timeout=30)
         response.raise_for_status()
 
         token_data = response.json()
@@ -169,6 +266,22 @@ def get_keycloak_token() -> tuple[str, dict]:
         )
         if not access_token:
             logger.error("  [bold red]✘[/bold red] Access token not found in Keycloak response")
+        expires_in = float(token_data.get("expires_in") or 0)
+        return access_token, requested_at + expires_in
+
+
+keycloak_tokens = KeycloakTokenCache()
+
+
+@traced("auth.keycloak_token", "auth")
+def get_keycloak_token() -> tuple[str, dict] | None:
+    """Returns keycloak token and configuration, or None when the credentials are missing or the request failed"""
+    try:
+        keycloak_credentials = get_keycloak_credentials()
+        if keycloak_credentials is None:
+            return None
+        credentials, config = keycloak_credentials
+        access_token = keycloak_tokens.get(config["keycloak_token_url"], credentials)
         return access_token, config
 
     except requests.exceptions.RequestException as e:
@@ -12,11 +12,11 @@ from click import Path as ClickPath
 from rich.console import Console
 from rich.padding import Padding
 from rich.syntax import Syntax
-from yaml import dump
 
 from Babylon.utils.checkers import check_special_char
 from Babylon.utils.environment import Environment
 from Babylon.utils.response import CommandResponse
+from Babylon.utils.yaml_utils import dump
 from Babylon.version import get_version
 
 logger = logging.getLogger("Babylon")
@@ -1,22 +1,22 @@
 import os
 import sys
 from base64 import b64decode
-from collections import defaultdict
-from json import loads
 from logging import getLogger
 from pathlib import Path
+from threading import RLock
+from typing import Any
 
-from flatten_json import flatten
-from kubernetes import client, config
-from kubernetes.client.exceptions import ApiException
-from kubernetes.config.config_exception import ConfigException
-from mako.template import Template
-from yaml import SafeLoader, YAMLError, dump, load, safe_load
+from yaml import YAMLError
 
 from Babylon.utils import ORIGINAL_CONFIG_FOLDER_PATH, ORIGINAL_TEMPLATE_FOLDER_PATH
-from Babylon.utils.kubernetes_state import STATE_LABEL_KEY, STATE_LABEL_VALUE, retrieve_state_from_kubernetes, save_state_in_kubernetes
+from Babylon.utils.cache import ConfigCache
+from Babylon.utils.kubernetes_client import get_api_client, get_core_v1
+from Babylon.utils.profiling import traced
+from Babylon.utils.state_backends import KubernetesSecretBackend, StateBackend, StateEntry, local_state_backend
+from Babylon.utils.templates import StateFlattener, TemplateCache
+from Babylon.utils.variables import VariablesFileError, VariableStore
 from Babylon.utils.working_dir import WorkingDir
-from Babylon.utils.yaml_utils import yaml_to_json
+from Babylon.utils.yaml_utils import dump, safe_load, yaml_to_dict
 
 logger = getLogger(__name__)
 
@@ -24,6 +24,10 @@ STORE_STRING = "datastore"
 TEMPLATES_STRING = "templates"
 PATH_SYMBOL = "%"
 NAMESPACE_FILE = "namespace.yaml"
+# Seconds during which Kubernetes config secrets are reused from the encrypted on-disk cache (0 disables it).
+CONFIG_CACHE_TTL_ENV_VAR = "BABYLON_CONFIG_CACHE_TTL"
+# Key material encrypting that cache; the on-disk cache stays disabled without it.
+CONFIG_CACHE_KEY_ENV_VAR = "BABYLON_CONFIG_CACHE_KEY"
 
 
 class SingletonMeta(type):
@@ -68,44 +72,83 @@ class Environment(metaclass=SingletonMeta):
             "csm_api": "",
         }
         self.state_dir = ORIGINAL_CONFIG_FOLDER_PATH
+        self._local_state_backend: tuple[Path, StateBackend] | None = None
         self.working_dir = WorkingDir(working_dir_path=self.pwd)
         self.variable_files: list[Path] = []
+        # Serialises state persistence when resources are deployed concurrently.
+        self.state_lock = RLock()
+        # Active StateSession of the running apply/destroy, if any.
+        self.state_session = None
+        # Config secrets read from Kubernetes, keyed by (kube context, tenant, secret name).
+        self.refresh_config = False
+        # Keys already read from Kubernetes during this run: ``refresh_config`` only bypasses the cache once per key.
+        self._refreshed_config_keys: set[str] = set()
+        self.config_cache = ConfigCache(
+            path=ORIGINAL_CONFIG_FOLDER_PATH / "cache" / "config.bin",
+            ttl=self._get_config_cache_ttl(),
+            secret=os.environ.get(CONFIG_CACHE_KEY_ENV_VAR, "").encode() or None,
+        )
+        # Rendering caches: compiled templates, merged variable files and flattened state.
+        self.template_cache = TemplateCache(ORIGINAL_CONFIG_FOLDER_PATH / "cache" / "templates")
+        self.state_flattener = StateFlattener()
+        self.variable_store = VariableStore()
+
+    @staticmethod
+    def _get_config_cache_ttl() -> int:
+        try:
+            ttl = max(0, int(os.environ.get(CONFIG_CACHE_TTL_ENV_VAR, "0")))
+        except ValueError:
+            logger.warning(f"  [yellow]⚠[/yellow] Ignoring invalid {CONFIG_CACHE_TTL_ENV_VAR} value")
+            return 0
+        if ttl and not os.environ.get(CONFIG_CACHE_KEY_ENV_VAR):
+            logger.warning(
+                f"  [yellow]⚠[/yellow] {CONFIG_CACHE_TTL_ENV_VAR} is ignored without {CONFIG_CACHE_KEY_ENV_VAR}: "
+                "config secrets are only cached in memory"
+            )
+            return 0
+        return ttl
 
     def get_variables(self):
-        merged_data, duplicate_keys = self.merge_yaml_files(self.variable_files)
-        if len(duplicate_keys) > 0:
-            for key, files in duplicate_keys.items():
+        """Return the merged variable files; a file is parsed again only when it changed on disk."""
+        try:
+            merged = self.variable_store.merged()
+        except VariablesFileError as e:
+            logger.error(f"  [bold red]✘[/bold red] {e}")
+            sys.exit(1)
+        if len(merged.duplicates) > 0:
+            for key, files in merged.duplicates.items():
                 logger.error(
                     f"  [bold red]✘[/bold red] The key [bold cyan]'{key}'[/bold cyan]"
                     f" is duplicated in variable files {' and '.join(files)}"
                 )
             sys.exit(1)
         else:
+            merged_data = merged.data
             merged_data["secret_powerbi"] = ""
             merged_data["github_secret"] = ""
             return merged_data
 
     def get_ns_from_text(self, content: str):
-        t = Template(text=content, strict_undefined=True)
+        t = self.template_cache.get(content)
         variables = self.get_variables()
         payload = t.render(**variables)
         payload_dict = safe_load(payload)
         remote: bool = payload_dict.get("remote", self.remote)
         self.remote = remote
 
+    @traced("template.render", "template")
     def fill_template(self, data: str, state: dict = None, ext_args: dict = None):
         result = data.replace("{{", "${").replace("}}", "}")
-        t = Template(text=result, strict_undefined=True)
+        t = self.template_cache.get(result)
         variables = self.get_variables()
         flattenstate = {}
         if ext_args:
             variables.update(ext_args)
         if state:
-            flattenstate = flatten(state.get("services", {}), separator=".")
+            with self.state_lock:
+                flattenstate = self.state_flattener.flatten(state.get("services", {}))
         payload = t.render(**variables, services=flattenstate)
-        payload_json = yaml_to_json(payload)
-        payload_dict = loads(payload_json)
-        return payload_dict
+        return yaml_to_dict(payload)
 
     def set_context(self, context_id):
         self.context_id = context_id
@@ -135,9 +178,10 @@ class Environment(metaclass=SingletonMeta):
             return "[dim]unavailable[/dim]"
 
     def _load_k8s_secret(self, secret_name: str, tenant: str):
+        from kubernetes.client.exceptions import ApiException
+
         try:
-            v1 = client.CoreV1Api()
-            return v1.read_namespaced_secret(name=secret_name, namespace=tenant)
+            return get_core_v1().read_namespaced_secret(name=secret_name, namespace=tenant)
         except ApiException:
             logger.error(
                 f"  [yellow]⚠[/yellow] Secret [green]{secret_name}[/green] could not be found in namespace [green]{tenant}[/green]."
@@ -158,8 +202,18 @@ class Environment(metaclass=SingletonMeta):
             sys.exit(1)
 
     def get_config_from_k8s_secret_by_tenant(self, secret_name: str, tenant: str):
+        """Return the decoded data of a Kubernetes secret, served from ``config_cache`` when possible."""
+        cache_key = self.config_cache.make_key(self._get_active_kubectl_context(), tenant, secret_name)
+        if not self.refresh_config or cache_key in self._refreshed_config_keys:
+            cached = self.config_cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"  Using cached configuration for secret {secret_name} in namespace {tenant}")
+                return cached
+
+        from kubernetes.config.config_exception import ConfigException
+
         try:
-            config.load_kube_config()
+            get_api_client()
         except ConfigException as e:
             logger.error("\n  [bold red]✘[/bold red] Failed to load kube config")
             logger.error(f"  [red]Reason:[/red] {e}")
@@ -174,94 +228,106 @@ class Environment(metaclass=SingletonMeta):
             logger.warning(f"  [yellow]⚠[/yellow] Secret {secret_name} in namespace '{tenant}' has no data")
             return {}
 
-        return {key: b64decode(value).decode("utf-8") for key, value in secret.data.items()}
+        data = {key: b64decode(value).decode("utf-8") for key, value in secret.data.items()}
+        self.config_cache.set(cache_key, data)
+        self._refreshed_config_keys.add(cache_key)
+        return data
+
+    @property
+    def local_state_backend(self) -> StateBackend:
+        """Backend storing local states in ``state_dir`` (see ``state_backends.local_state_backend``)."""
+        if self._local_state_backend is None or self._local_state_backend[0] != self.state_dir:
+            self._local_state_backend = (self.state_dir, local_state_backend(self.state_dir))
+        return self._local_state_backend[1]
+
+    @property
+    def remote_state_backend(self) -> KubernetesSecretBackend:
+        return KubernetesSecretBackend(self.environ_id)
+
+    def default_state(self) -> dict:
+        return {
+            "context": self.context_id,
+            "tenant": self.environ_id,
+            "remote": self.remote,
+            "services": {
+                "api": {
+                    "organization_id": "",
+                    "solution_id": "",
+                    "workspace_id": "",
+                },
+                "webapp": {
+                    "webapp_name": "",
+                    "webapp_url": "",
+                },
+                "postgres": {
+                    "schema_name": "",
+                },
+            },
+        }
 
     def store_state_in_local(self, state: dict):
-        state_file = f"state.{self.context_id}.{self.environ_id}.yaml"
-        self.state_dir.mkdir(parents=True, exist_ok=True)
-        s = self.state_dir / state_file
-        s.write_bytes(data=dump(state).encode("utf-8"))
+        self.local_state_backend.save(self.context_id, self.environ_id, state)
+
+    def state_secret_name(self) -> str:
+        return KubernetesSecretBackend.secret_name(self.context_id, self.environ_id)
+
+    def set_state_value(self, state: dict, path: tuple[str, ...], value: Any) -> None:
+        """Set the value at *path* inside *state* (creating missing sections) while holding ``state_lock``.
 
-    def store_state_in_kubernetes(self, state: dict, namespace: str = "", secret_name: str = "") -> None:
+        Parallel ``apply`` workers share one state dictionary: every write goes
+        through here so that readers (template rendering, session flushes) never
+        see a dictionary change size under them.
+        """
+        with self.state_lock:
+            node = state
+            for key in path[:-1]:
+                node = node.setdefault(key, {})
+            node[path[-1]] = value
+
+    def store_state(self, state: dict) -> None:
+        """Persist *state* locally and, when ``remote`` is enabled, in Kubernetes.
+
+        When a ``StateSession`` owns *state*, this only records a checkpoint and
+        the session decides when to write.
+        """
+        if self.state_session is not None and state is self.state_session.state:
+            self.state_session.checkpoint()
+            return
+        with self.state_lock:
+            self.store_state_in_local(state)
+            if self.remote:
+                self.store_state_in_kubernetes(state)
+
+    def store_state_in_kubernetes(self, state: dict) -> None:
         """Persist *state* as a Kubernetes Secret."""
-        ns = namespace or self.environ_id
-        name = secret_name or f"babylon-state-{self.context_id}-{self.environ_id}"
-        save_state_in_kubernetes(namespace=ns, secret_name=name, state_data=state)
+        self.remote_state_backend.save(self.context_id, self.environ_id, state)
 
-    def get_state_from_kubernetes(self, namespace: str = "", secret_name: str = "") -> dict:
+    def get_state_from_kubernetes(self) -> dict:
         """Retrieve state from a Kubernetes Secret.
 
         Returns the stored dictionary, or an empty default state when the
         secret does not exist yet (mirrors the behaviour of
-        ``get_state_from_local`` and ``get_state_from_kubernetes``).
+        ``get_state_from_local``).
         """
-        ns = namespace or self.environ_id
-        name = secret_name or f"babylon-state-{self.context_id}-{self.environ_id}"
-        result = retrieve_state_from_kubernetes(namespace=ns, secret_name=name)
-        if result is None:
-            return {
-                "context": self.context_id,
-                "tenant": self.environ_id,
-                "remote": self.remote,
-                "services": {
-                    "api": {
-                        "organization_id": "",
-                        "solution_id": "",
-                        "workspace_id": "",
-                    },
-                    "webapp": {
-                        "webapp_name": "",
-                        "webapp_url": "",
-                    },
-                    "postgres": {
-                        "schema_name": "",
-                    },
-                },
-            }
-        return result
+        result = self.remote_state_backend.load(self.context_id, self.environ_id)
+        return self.default_state() if result is None else result
 
-    def list_remote_states(self) -> list[str]:
-        """List state secret names matching 'babylon-state-*' in the current namespace.
+    def list_remote_states(self, all_namespaces: bool = False) -> list[StateEntry]:
+        """List the state secrets of the current namespace, or of every namespace.
 
-        Uses a server-side label selector so only matching secrets are transferred
-        over the wire — no client-side filtering needed.
+        Secrets are selected server-side by label and read page by page; each
+        entry is built from the secret metadata (context, tenant, last update,
+        size) without decoding the state.
         """
         try:
-            config.load_kube_config()
-            v1 = client.CoreV1Api()
-            secrets = v1.list_namespaced_secret(
-                namespace=self.environ_id,
-                label_selector=f"{STATE_LABEL_KEY}={STATE_LABEL_VALUE}",
-            )
-            return [s.metadata.name for s in secrets.items]
+            return self.remote_state_backend.list_states(all_namespaces=all_namespaces)
         except Exception as e:
             logger.error(f"  [bold red]✘[/bold red] Failed to list remote states: {e}")
             return []
 
     def get_state_from_local(self):
-        state_file = self.state_dir / f"state.{self.context_id}.{self.environ_id}.yaml"
-        if not state_file.exists():
-            return {
-                "context": self.context_id,
-                "tenant": self.environ_id,
-                "remote": self.remote,
-                "services": {
-                    "api": {
-                        "organization_id": "",
-                        "solution_id": "",
-                        "workspace_id": "",
-                    },
-                    "webapp": {
-                        "webapp_name": "",
-                        "webapp_url": "",
-                    },
-                    "postgres": {
-                        "schema_name": "",
-                    },
-                },
-            }
-        state_data = load(state_file.open("r"), Loader=SafeLoader)
-        return state_data
+        result = self.local_state_backend.load(self.context_id, self.environ_id)
+        return self.default_state() if result is None else result
 
     def store_namespace_in_local(self):
         ns_dir = self.state_dir
@@ -309,6 +375,8 @@ class Environment(metaclass=SingletonMeta):
         return self.get_config_from_k8s_secret_by_tenant("babylon-config", self.environ_id)
 
     def retrieve_state_func(self):
+        if self.state_session is not None:
+            return self.state_session.state
         if self.remote:
             state = self.get_state_from_kubernetes()
         else:
@@ -317,6 +385,7 @@ class Environment(metaclass=SingletonMeta):
 
     def set_variable_files(self, variable_files_updated: list[Path]):
         self.variable_files = variable_files_updated
+        self.variable_store.set_files(variable_files_updated)
 
     def load_yaml_file(self, file_path: Path):
         with open(file_path, "r") as file:
@@ -327,28 +396,9 @@ class Environment(metaclass=SingletonMeta):
                 sys.exit(1)
 
     def merge_yaml_files(self, file_paths: list[Path]):
-        merged_data = {}
-        keys_tracker = defaultdict(list)
-
-        for file_path in file_paths:
-            if not file_path.endswith(".yaml"):
-                logger.error(f"  [bold red]✘[/bold red] File '{file_path}' is not a valid YAML file.")
-                sys.exit(1)
-            if os.path.getsize(file_path) == 0:
-                logger.error(f"  [bold red]✘[/bold red] File '{file_path}' is empty.")
-                sys.exit(1)
-
-            data = self.load_yaml_file(file_path)
-
-            for key in data:
-                if key in merged_data:
-                    keys_tracker[key].append(file_path)
-                else:
-                    keys_tracker[key] = [file_path]
-
-                merged_data[key] = data[key]
-
-        # Check for duplicate keys
-        duplicate_keys = {key: files for key, files in keys_tracker.items() if len(files) > 1}
-
-        return merged_data, duplicate_keys
+        try:
+            merged = VariableStore(file_paths).merged()
+        except VariablesFileError as e:
+            logger.error(f"  [bold red]✘[/bold red] {e}")
+            sys.exit(1)
+        return merged.data, merged.duplicates
@@ -0,0 +1,151 @@
+"""
+Bounded, dependency-aware task executor.
+
+Runs a set of nodes forming a directed acyclic graph on a thread pool:
+
+- a node is started only once every node it depends on has succeeded
+- at most ``parallelism`` nodes run at the same time
+- on the first failure no new node is scheduled (fail fast); nodes already
+  running are allowed to finish and every node that did not start is
+  reported as skipped
+
+A node fails when its callable raises (``SystemExit`` included) or returns a
+``CommandResponse`` whose ``has_failed()`` is ``True``.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from logging import getLogger
+from typing import Any, Callable
+
+from click import get_current_context
+from click.globals import pop_context, push_context
+
+logger = getLogger(__name__)
+
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+@dataclass
+class Node:
+    """A unit of work in the graph.
+
+    Attributes:
+        id:         Unique identifier of the node.
+        run:        Callable executed without arguments.
+        depends_on: Identifiers of the nodes that must succeed first.
+        order:      Tie-breaker among ready nodes (lower runs first).
+    """
+
+    id: str
+    run: Callable[[], Any]
+    depends_on: set[str] = field(default_factory=set)
+    order: int = 0
+
+
+@dataclass
+class GraphResult:
+    """Outcome of a graph run: a status and an optional error/result per node."""
+
+    statuses: dict[str, str] = field(default_factory=dict)
+    results: dict[str, Any] = field(default_factory=dict)
+    errors: dict[str, BaseException] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return all(status == SUCCEEDED for status in self.statuses.values())
+
+    def with_status(self, status: str) -> list[str]:
+        return [node_id for node_id, s in self.statuses.items() if s == status]
+
+
+def validate_graph(nodes: list[Node]) -> None:
+    """Raise ``ValueError`` on duplicate ids, unknown dependencies or cycles."""
+    ids = [n.id for n in nodes]
+    if len(ids) != len(set(ids)):
+        raise ValueError("Duplicate node identifiers in graph")
+    known = set(ids)
+    for n in nodes:
+        unknown = n.depends_on - known
+        if unknown:
+            raise ValueError(f"Node '{n.id}' depends on unknown node(s): {', '.join(sorted(unknown))}")
+
+    remaining = {n.id: set(n.depends_on) for n in nodes}
+    while remaining:
+        ready = [node_id for node_id, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Dependency cycle detected between: {', '.join(sorted(remaining))}")
+        for node_id in ready:
+            del remaining[node_id]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+def _has_failed(result: Any) -> bool:
+    has_failed = getattr(result, "has_failed", None)
+    return bool(callable(has_failed) and has_failed())
+
+
+def run_graph(nodes: list[Node], parallelism: int = 1) -> GraphResult:
+    """Execute *nodes* respecting their dependencies with at most *parallelism* workers.
+
+    The current click context (if any) is made available to worker threads so
+    that callables building a ``CommandResponse`` keep working.
+
+    Returns:
+        A ``GraphResult`` holding the status of every node.
+    """
+    validate_graph(nodes)
+    parallelism = max(1, parallelism)
+    by_id = {n.id: n for n in nodes}
+    pending: dict[str, Node] = dict(by_id)
+    result = GraphResult()
+    ctx = get_current_context(silent=True)
+
+    def _call(node: Node) -> Any:
+        if ctx is not None:
+            push_context(ctx)
+        try:
+            return node.run()
+        finally:
+            if ctx is not None:
+                pop_context()
+
+    running: dict[Future, str] = {}
+    failed = False
+    with ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix="babylon") as pool:
+        while pending or running:
+            if not failed:
+                ready = sorted(
+                    (n for n in pending.values() if all(result.statuses.get(d) == SUCCEEDED for d in n.depends_on)),
+                    key=lambda n: n.order,
+                )
+                for node in ready[: parallelism - len(running)]:
+                    del pending[node.id]
+                    running[pool.submit(_call, node)] = node.id
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                node_id = running.pop(future)
+                try:
+                    value = future.result()
+                except (Exception, SystemExit) as exc:
+                    logger.debug(f"  Node '{node_id}' raised: {exc!r}", exc_info=True)
+                    result.errors[node_id] = exc
+                    result.statuses[node_id] = FAILED
+                    failed = True
+                    continue
+                result.results[node_id] = value
+                if _has_failed(value):
+                    result.statuses[node_id] = FAILED
+                    failed = True
+                else:
+                    result.statuses[node_id] = SUCCEEDED
+
+    for node_id in pending:
+        result.statuses[node_id] = SKIPPED
+    return result
@@ -0,0 +1,173 @@
+"""
+Shared HTTP session with connection pooling, default timeouts and retries.
+
+Every outgoing HTTP call (Keycloak, Superset, Power BI, ...) goes through
+``request()`` so connections are kept alive and reused across calls instead
+of paying a TCP + TLS handshake each time. ``requests`` keeps one urllib3
+connection pool per host; ``POOL_MAXSIZE`` bounds the connections kept per
+host.
+
+Retries use exponential backoff with full jitter. ``429`` and ``503``
+responses are retried for every method, honouring ``Retry-After``; other
+5xx responses and connection errors are only retried for idempotent
+methods so a POST is never replayed after the server may have processed it.
+"""
+
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from logging import getLogger
+from threading import Lock
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from Babylon.utils.http_metrics import metrics
+
+logger = getLogger(__name__)
+
+# (connect, read) timeout in seconds applied when the caller does not pass one.
+DEFAULT_TIMEOUT = (10, 60)
+POOL_CONNECTIONS = 16
+POOL_MAXSIZE = 16
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# Statuses meaning "the request was not processed, try again later".
+THROTTLE_STATUSES = frozenset({429, 503})
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass
+class RetryPolicy:
+    """Retry settings for ``request()``.
+
+    Args:
+        attempts:     Maximum number of attempts, including the first one.
+        backoff:      Base delay in seconds; attempt *n* waits up to ``backoff * 2**n``.
+        max_backoff:  Upper bound for a single delay, including ``Retry-After``.
+    """
+
+    attempts: int = 4
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+
+    def delay(self, attempt: int, response: requests.Response | None = None) -> float:
+        """Return the delay before retry number *attempt* (starting at 0)."""
+        retry_after = _parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+
+default_retry = RetryPolicy()
+
+_session: requests.Session | None = None
+_session_lock = Lock()
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def close_session() -> None:
+    """Close the pooled session; the next call to ``get_session()`` opens a new one."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def _rewind(kwargs: dict) -> None:
+    """Seek file objects of a multipart upload back to the start before a retry."""
+    for value in (kwargs.get("files") or {}).values():
+        fh = value[1] if isinstance(value, tuple) else value
+        if hasattr(fh, "seek"):
+            fh.seek(0)
+
+
+def request(method: str, url: str, retry: RetryPolicy | None = None, **kwargs: Any) -> requests.Response:
+    """Send a request through the pooled session.
+
+    Accepts the keyword arguments of ``requests.request``. Returns the last
+    response (which may still be an error status) and raises
+    ``requests.RequestException`` when the server could not be reached.
+    """
+    method = method.upper()
+    retry = retry or default_retry
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    host = urlsplit(url).netloc
+    session = get_session()
+
+    attempt = 0
+    while True:
+        last_attempt = attempt + 1 >= retry.attempts
+        started = time.perf_counter()
+        try:
+            response = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            elapsed = time.perf_counter() - started
+            metrics.observe(host, method, url, None, elapsed)
+            if last_attempt or method not in IDEMPOTENT_METHODS:
+                raise
+            delay = retry.delay(attempt)
+            logger.debug(f"  [dim]{method} {url} failed ({exc}), retrying in {delay:.1f}s[/dim]")
+        else:
+            elapsed = time.perf_counter() - started
+            metrics.observe(host, method, url, response.status_code, elapsed)
+            retryable = response.status_code in THROTTLE_STATUSES or (
+                response.status_code in RETRY_STATUSES and method in IDEMPOTENT_METHODS
+            )
+            if not retryable or last_attempt:
+                return response
+            delay = retry.delay(attempt, response)
+            logger.debug(f"  [dim]{method} {url} returned {response.status_code}, retrying in {delay:.1f}s[/dim]")
+            response.close()
+        time.sleep(delay)
+        attempt += 1
+        _rewind(kwargs)
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def put(url: str, **kwargs: Any) -> requests.Response:
+    return request("PUT", url, **kwargs)
+
+
+def patch(url: str, **kwargs: Any) -> requests.Response:
+    return request("PATCH", url, **kwargs)
+
+
+def delete(url: str, **kwargs: Any) -> requests.Response:
+    return request("DELETE", url, **kwargs)
@@ -0,0 +1,228 @@
+"""
+Per-request HTTP metrics: request counters and latency histograms.
+
+Every request is counted under ``(service, method, route template, status)``.
+The route template is the URL path with identifiers replaced by
+placeholders (``/organizations/{id}/workspaces/{id}``) so that a loop
+over a hundred workspaces shows up as one route with a hundred calls.
+
+The registry is fed from three places:
+
+* ``http_client.request()`` (Keycloak, Superset, Power BI, ...), where the
+  service is the host name;
+* the shared ``cosmotech_api.ApiClient`` objects (service ``cosmotech-api``);
+* the shared Kubernetes ``ApiClient`` objects (service ``kubernetes``).
+
+The two API clients are instrumented by ``instrument_api_client()``, which
+wraps the urllib3 pool manager of their REST client. ``babylon --stats``
+prints a summary at the end of the run; ``--stats-out FILE`` writes the
+metrics in the OpenMetrics text format.
+"""
+
+import re
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from logging import getLogger
+from pathlib import Path
+from threading import Lock
+from time import perf_counter
+from typing import Any
+from urllib.parse import urlsplit
+
+from click import echo, style
+
+logger = getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is +Inf.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Status label of a request that got no response (connection error, timeout).
+NO_RESPONSE = "error"
+# Rows printed by ``print_summary``.
+SUMMARY_ROWS = 25
+
+COSMOTECH_SERVICE = "cosmotech-api"
+KUBERNETES_SERVICE = "kubernetes"
+
+_ID_SEGMENT = re.compile(
+    r"""^(
+        [0-9]+                                                           # numeric id
+      | [0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}     # uuid
+      | [0-9a-f]{16,}                                                    # hex digest
+      | [a-z]{1,3}-[a-z0-9]*[0-9][a-z0-9]*                               # cosmotech id (o-xxxx, w-xxxx, ...)
+    )$""",
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+def route_template(url: str, service: str = "") -> str:
+    """Return the path of *url* with identifiers replaced by placeholders."""
+    parts = urlsplit(url).path.split("/")
+    if service == KUBERNETES_SERVICE and "namespaces" in parts:
+        # /api/v1/namespaces/{namespace}/<resource>/{name}/<subresource>
+        index = parts.index("namespaces")
+        if index + 1 < len(parts) and parts[index + 1]:
+            parts[index + 1] = "{namespace}"
+        if index + 3 < len(parts) and parts[index + 3]:
+            parts[index + 3] = "{name}"
+        return "/".join(parts) or "/"
+    return "/".join("{id}" if _ID_SEGMENT.match(part) else part for part in parts) or "/"
+
+
+@dataclass
+class LatencyHistogram:
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    count: int = 0
+    total: float = 0.0
+    maximum: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Estimate the *q* quantile as the upper bound of its bucket (capped by the maximum seen)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.maximum)
+        return self.maximum
+
+
+MetricKey = tuple[str, str, str, str]
+
+
+class HttpMetrics:
+    """Thread-safe registry of latency histograms keyed by ``(service, method, route, status)``."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.series: dict[MetricKey, LatencyHistogram] = {}
+
+    def observe(self, service: str, method: str, url: str, status: int | None, seconds: float) -> None:
+        key = (service, method.upper(), route_template(url, service), NO_RESPONSE if status is None else str(status))
+        with self._lock:
+            self.series.setdefault(key, LatencyHistogram()).observe(seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.series.clear()
+
+    def snapshot(self) -> list[tuple[MetricKey, LatencyHistogram]]:
+        """Return the series, most requested first."""
+        with self._lock:
+            items = [(key, LatencyHistogram(list(h.buckets), h.count, h.total, h.maximum)) for key, h in self.series.items()]
+        return sorted(items, key=lambda item: (-item[1].count, item[0]))
+
+    def print_summary(self, limit: int = SUMMARY_ROWS) -> None:
+        series = self.snapshot()
+        if not series:
+            return
+        echo(style("\n📡 HTTP requests", bold=True, fg="yellow"))
+        for service in sorted({key[0] for key, _ in series}):
+            histograms = [h for key, h in series if key[0] == service]
+            count = sum(h.count for h in histograms)
+            echo(f"  {service}: {count} requests, {sum(h.total for h in histograms):.3f}s")
+        rows = [
+            (f"{key[0]} {key[1]} {key[2]}", key[3], str(h.count), *(_ms(h.quantile(q)) for q in (0.5, 0.95, 0.99)), _ms(h.maximum))
+            for key, h in series[:limit]
+        ]
+        headers = ("REQUEST", "STATUS", "COUNT", "P50", "P95", "P99", "MAX")
+        width = max(len(row[0]) for row in [headers, *rows]) + 2
+        echo(f"  {headers[0]:<{width}}" + "".join(f"{h:>9}" for h in headers[1:]))
+        for row in rows:
+            echo(f"  {row[0]:<{width}}" + "".join(f"{value:>9}" for value in row[1:]))
+        if len(series) > limit:
+            echo(f"  ... {len(series) - limit} more")
+
+    def openmetrics(self) -> str:
+        """Return the metrics in the OpenMetrics text exposition format."""
+        lines = [
+            "# TYPE babylon_http_requests counter",
+            "# HELP babylon_http_requests HTTP requests sent by Babylon.",
+        ]
+        series = self.snapshot()
+        for key, h in series:
+            lines.append(f"babylon_http_requests_total{{{_labels(key)}}} {h.count}")
+        lines += [
+            "# TYPE babylon_http_request_duration_seconds histogram",
+            "# UNIT babylon_http_request_duration_seconds seconds",
+            "# HELP babylon_http_request_duration_seconds Time until the response headers were received.",
+        ]
+        for key, h in series:
+            labels = _labels(key)
+            cumulative = 0
+            for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), h.buckets):
+                cumulative += count
+                lines.append(f'babylon_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"babylon_http_request_duration_seconds_count{{{labels}}} {h.count}")
+            lines.append(f"babylon_http_request_duration_seconds_sum{{{labels}}} {h.total:.6f}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_openmetrics(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.openmetrics(), encoding="utf-8")
+        logger.info(f"  [green]✔[/green] HTTP metrics written to [cyan]{path}[/cyan]")
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.0f}ms"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(key: MetricKey) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(("service", "method", "route", "status"), key))
+
+
+metrics = HttpMetrics()
+
+
+class MeteredPoolManager:
+    """urllib3 pool manager wrapper recording the latency and status of every ``request()``."""
+
+    def __init__(self, pool_manager: Any, service: str, registry: HttpMetrics | None = None):
+        self._pool_manager = pool_manager
+        self._service = service
+        self._registry = registry or metrics
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> Any:
+        started = perf_counter()
+        try:
+            response = self._pool_manager.request(method, url, *args, **kwargs)
+        except Exception:
+            self._registry.observe(self._service, method, url, None, perf_counter() - started)
+            raise
+        self._registry.observe(self._service, method, url, getattr(response, "status", None), perf_counter() - started)
+        return response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pool_manager, name)
+
+
+def instrument_api_client(api_client: Any, service: str) -> Any:
+    """Record the requests of a generated ``ApiClient`` (cosmotech_api, kubernetes) under *service*."""
+    rest_client = api_client.rest_client
+    if not isinstance(rest_client.pool_manager, MeteredPoolManager):
+        rest_client.pool_manager = MeteredPoolManager(rest_client.pool_manager, service)
+    return api_client
+
+
+def finish_stats(print_summary: bool, openmetrics_path: Path | None) -> None:
+    """Print the summary and/or write the OpenMetrics file at the end of the run."""
+    if openmetrics_path:
+        try:
+            metrics.write_openmetrics(openmetrics_path)
+        except OSError as exc:
+            logger.error(f"  [bold red]✘[/bold red] Could not write HTTP metrics to {openmetrics_path}: {exc}")
+    if print_summary:
+        metrics.print_summary()
@@ -0,0 +1,129 @@
+"""
+Process-wide Kubernetes client provider.
+
+``config.load_kube_config()`` re-parses the kubeconfig and, for clusters
+authenticating through an exec credential plugin (``kubelogin``,
+``aws eks get-token``, ...), runs the plugin every time it is called. The
+provider loads the configuration once per ``(kubeconfig path, context)``
+into a dedicated ``Configuration`` and hands out one pooled ``ApiClient``
+and shared ``CoreV1Api`` / ``BatchV1Api`` instances built on it.
+
+Tokens stay valid for long runs: ``load_kube_config`` installs a
+``refresh_api_key_hook`` on the configuration, which the client calls before
+each request and which runs the plugin again only once the token expired.
+
+The global ``kubernetes.client.Configuration`` default is left untouched, so
+API classes must be created through the provider (``client.CoreV1Api()``
+without a client would not be authenticated).
+"""
+
+import os
+from logging import getLogger
+from threading import Lock
+from typing import TYPE_CHECKING, Callable
+
+from Babylon.utils.http_metrics import KUBERNETES_SERVICE, instrument_api_client
+
+if TYPE_CHECKING:
+    from kubernetes import client
+
+logger = getLogger(__name__)
+
+# Maximum number of connections kept to the API server by each ApiClient.
+KUBE_POOL_SIZE = 16
+
+# (config_file, context, client_configuration) -> None
+ConfigLoader = Callable[..., None]
+
+
+def kubeconfig_path() -> str:
+    """Return the kubeconfig location(s) used by the Kubernetes client (``$KUBECONFIG`` or ``~/.kube/config``)."""
+    return os.environ.get("KUBECONFIG") or "~/.kube/config"
+
+
+def _load_kube_config(config_file: str, context: str | None, client_configuration) -> None:
+    from kubernetes import config
+
+    config.load_kube_config(config_file=config_file, context=context, client_configuration=client_configuration)
+
+
+class KubernetesClientProvider:
+    """Shared Kubernetes API clients, one per ``(kubeconfig path, context)``.
+
+    Args:
+        pool_size: Connections kept per ``ApiClient``.
+        loader:    Fills a ``Configuration`` from a kubeconfig; defaults to
+                   ``config.load_kube_config``.
+    """
+
+    def __init__(self, pool_size: int = KUBE_POOL_SIZE, loader: ConfigLoader | None = None):
+        self.pool_size = pool_size
+        self._loader = loader or _load_kube_config
+        self._lock = Lock()
+        self._clients: dict[tuple[str, str | None], "client.ApiClient"] = {}
+        self._apis: dict[tuple[str, str | None, str], object] = {}
+
+    def _key(self, config_file: str | None, context: str | None) -> tuple[str, str | None]:
+        return (config_file or kubeconfig_path(), context)
+
+    def api_client(self, config_file: str | None = None, context: str | None = None) -> "client.ApiClient":
+        """Return the shared ``ApiClient``, loading the kubeconfig on first use.
+
+        *context* ``None`` is the kubeconfig current context.
+
+        Raises:
+            kubernetes.config.ConfigException: when the kubeconfig cannot be loaded;
+                the next call tries again.
+        """
+        key = self._key(config_file, context)
+        with self._lock:
+            api_client = self._clients.get(key)
+            if api_client is None:
+                from kubernetes import client
+
+                configuration = client.Configuration()
+                self._loader(key[0], context, configuration)
+                configuration.connection_pool_maxsize = self.pool_size
+                api_client = self._clients[key] = instrument_api_client(client.ApiClient(configuration), KUBERNETES_SERVICE)
+                logger.debug(f"  [dim]Loaded kubeconfig {key[0]} (context: {context or 'current'})[/dim]")
+            return api_client
+
+    def _api(self, api_class_name: str, config_file: str | None, context: str | None):
+        api_client = self.api_client(config_file, context)
+        key = (*self._key(config_file, context), api_class_name)
+        with self._lock:
+            api = self._apis.get(key)
+            if api is None:
+                from kubernetes import client
+
+                api = self._apis[key] = getattr(client, api_class_name)(api_client)
+            return api
+
+    def core_v1(self, config_file: str | None = None, context: str | None = None) -> "client.CoreV1Api":
+        return self._api("CoreV1Api", config_file, context)
+
+    def batch_v1(self, config_file: str | None = None, context: str | None = None) -> "client.BatchV1Api":
+        return self._api("BatchV1Api", config_file, context)
+
+    def clear(self) -> None:
+        """Close every client; the next call reloads the kubeconfig."""
+        with self._lock:
+            for api_client in self._clients.values():
+                api_client.rest_client.pool_manager.clear()
+            self._clients.clear()
+            self._apis.clear()
+
+
+kube_clients = KubernetesClientProvider()
+
+
+def get_api_client(context: str | None = None) -> "client.ApiClient":
+    return kube_clients.api_client(context=context)
+
+
+def get_core_v1(context: str | None = None) -> "client.CoreV1Api":
+    return kube_clients.core_v1(context=context)
+
+
+def get_batch_v1(context: str | None = None) -> "client.BatchV1Api":
+    return kube_clients.batch_v1(context=context)
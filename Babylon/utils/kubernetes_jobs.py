@@ -0,0 +1,183 @@
+"""
+Kubernetes Job monitoring through the Python client.
+
+``JobWatcher`` replaces ``kubectl wait`` + ``kubectl logs``: the job is
+watched with ``watch.Watch`` over ``BatchV1Api.list_namespaced_job``
+(filtered on the job name) until one of its conditions is terminal, while a
+second thread follows the logs of the job pods with
+``read_namespaced_pod_log(follow=True)`` as they are written. Several jobs
+can be watched at once with ``wait_all``.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from logging import getLogger
+from threading import Event, Thread
+from time import monotonic
+from typing import Callable
+
+from Babylon.utils.kubernetes_client import get_batch_v1, get_core_v1
+from Babylon.utils.profiling import span
+
+logger = getLogger(__name__)
+
+JOB_COMPLETE = "complete"
+JOB_FAILED = "failed"
+JOB_TIMEOUT = "timeout"
+
+# Condition types ending a job (SuccessCriteriaMet / FailureTarget come first on Kubernetes >= 1.31).
+_COMPLETE_CONDITIONS = frozenset({"Complete", "SuccessCriteriaMet"})
+_FAILED_CONDITIONS = frozenset({"Failed", "FailureTarget"})
+# Seconds between two looks for new job pods, and granted to log followers once the job is done.
+POD_POLL_INTERVAL = 1.0
+LOG_DRAIN_TIMEOUT = 15.0
+
+# (job name, log line)
+LogCallback = Callable[[str, str], None]
+
+
+@dataclass
+class JobResult:
+    """Outcome of a watched job; ``logs`` holds the output of every pod of the job."""
+
+    name: str
+    status: str
+    logs: str = ""
+    reason: str = ""
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status == JOB_COMPLETE
+
+
+def job_state(job) -> tuple[str | None, str]:
+    """Return ``(JOB_COMPLETE | JOB_FAILED | None, reason)`` from the conditions of a ``V1Job``."""
+    conditions = (job.status.conditions if job.status else None) or []
+    for condition in conditions:
+        if condition.status != "True":
+            continue
+        if condition.type in _COMPLETE_CONDITIONS:
+            return JOB_COMPLETE, condition.reason or ""
+        if condition.type in _FAILED_CONDITIONS:
+            return JOB_FAILED, condition.message or condition.reason or ""
+    return None, ""
+
+
+def _debug_log_line(job_name: str, line: str) -> None:
+    logger.debug(f"  [dim]{job_name}: {line}[/dim]")
+
+
+class JobWatcher:
+    """Wait for Kubernetes Jobs of one namespace and collect their logs.
+
+    Args:
+        namespace:     Namespace of the jobs.
+        batch_api:     ``BatchV1Api`` (the shared client of ``kubernetes_client`` when omitted).
+        core_api:      ``CoreV1Api`` (the shared client of ``kubernetes_client`` when omitted).
+        on_log:        Called with every log line as it is received; lines go
+                       to the debug log by default.
+        watch_factory: Returns a ``kubernetes.watch.Watch``-like object.
+    """
+
+    def __init__(self, namespace: str, batch_api=None, core_api=None, on_log: LogCallback | None = None, watch_factory=None):
+        self.namespace = namespace
+        self._batch_api = batch_api
+        self._core_api = core_api
+        self.on_log = on_log or _debug_log_line
+        self._watch_factory = watch_factory
+
+    @property
+    def batch_api(self):
+        if self._batch_api is None:
+            self._batch_api = get_batch_v1()
+        return self._batch_api
+
+    @property
+    def core_api(self):
+        if self._core_api is None:
+            self._core_api = get_core_v1()
+        return self._core_api
+
+    def _watch(self):
+        if self._watch_factory is None:
+            from kubernetes import watch
+
+            return watch.Watch()
+        return self._watch_factory()
+
+    def wait(self, name: str, timeout: float) -> JobResult:
+        """Watch job *name* until it completes, fails or *timeout* seconds elapse."""
+        done = Event()
+        lines: list[str] = []
+        follower = Thread(target=self._follow_logs, args=(name, done, lines), name=f"logs-{name}", daemon=True)
+        follower.start()
+        try:
+            with span("k8s.job_wait", "kubernetes", job=name):
+                status, reason = self._watch_job(name, timeout)
+        except Exception as exc:
+            status, reason = JOB_FAILED, f"could not watch the job: {exc}"
+        finally:
+            done.set()
+        follower.join(LOG_DRAIN_TIMEOUT)
+        return JobResult(name=name, status=status, logs="\n".join(lines), reason=reason)
+
+    def wait_all(self, timeouts: dict[str, float]) -> dict[str, JobResult]:
+        """Watch several jobs concurrently; *timeouts* maps each job name to its timeout."""
+        if not timeouts:
+            return {}
+        with ThreadPoolExecutor(max_workers=len(timeouts), thread_name_prefix="job-watch") as pool:
+            futures = {name: pool.submit(self.wait, name, timeout) for name, timeout in timeouts.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+    def _watch_job(self, name: str, timeout: float) -> tuple[str, str]:
+        from kubernetes.client.exceptions import ApiException
+
+        deadline = monotonic() + timeout
+        while (remaining := deadline - monotonic()) > 0:
+            watch = self._watch()
+            try:
+                for event in watch.stream(
+                    self.batch_api.list_namespaced_job,
+                    namespace=self.namespace,
+                    field_selector=f"metadata.name={name}",
+                    timeout_seconds=max(1, int(remaining)),
+                ):
+                    if event["type"] == "DELETED":
+                        watch.stop()
+                        return JOB_FAILED, "the job was deleted"
+                    status, reason = job_state(event["object"])
+                    if status:
+                        watch.stop()
+                        return status, reason
+            except ApiException as exc:
+                # 410 Gone: the watch expired, start again from a new list
+                if exc.status != 410:
+                    raise
+        return JOB_TIMEOUT, f"not finished after {timeout:g}s"
+
+    def _follow_logs(self, name: str, done: Event, lines: list[str]) -> None:
+        """Follow the logs of every pod of job *name*, oldest first, until the job is done."""
+        followed: set[str] = set()
+        while True:
+            last_pass = done.is_set()
+            try:
+                pods = self.core_api.list_namespaced_pod(namespace=self.namespace, label_selector=f"job-name={name}").items
+            except Exception as exc:
+                logger.debug(f"  Could not list pods of job {name}: {exc}")
+                return
+            for pod in sorted(pods, key=lambda p: str(p.metadata.creation_timestamp or "")):
+                if pod.metadata.name in followed or (pod.status and pod.status.phase == "Pending"):
+                    continue
+                followed.add(pod.metadata.name)
+                self._follow_pod(name, pod.metadata.name, lines)
+            if last_pass:
+                return
+            done.wait(POD_POLL_INTERVAL)
+
+    def _follow_pod(self, job_name: str, pod_name: str, lines: list[str]) -> None:
+        try:
+            for line in self._watch().stream(self.core_api.read_namespaced_pod_log, name=pod_name, namespace=self.namespace):
+                lines.append(line)
+                self.on_log(job_name, line)
+        except Exception as exc:
+            logger.debug(f"  Could not read logs of pod {pod_name}: {exc}")
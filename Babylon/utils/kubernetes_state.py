@@ -12,39 +12,105 @@ Secret layout
   metadata:
     name: <secret_name>
     namespace: <namespace>
+    labels:
+      app.kubernetes.io/managed-by: babylon-state
+      babylon.cosmotech.com/context: <context>
+      babylon.cosmotech.com/tenant: <tenant>
+    annotations:
+      babylon.cosmotech.com/state-format: "2"
+      babylon.cosmotech.com/state-sha256: <hash of the whole state>
+      babylon.cosmotech.com/updated-at: <ISO 8601 time of the last write>
+      babylon.cosmotech.com/state-size: <bytes stored in data>
   data:
-    state.yaml: <base64-encoded YAML string>
+    state.meta: <payload: every top-level key except services>
+    services.<name>: <payload: one entry per service>
 
-The single key inside the secret is always ``STATE_KEY`` ("state.yaml").
+Each payload is ``STATE_PAYLOAD_MAGIC`` followed by the gzip-compressed YAML
+document, base64-encoded. Splitting the state per service lets a store send
+a JSON merge-patch carrying only the services that changed, and a store whose
+hash matches the annotation writes nothing at all.
+
+Secrets written by older versions hold the whole state as plain YAML under
+``STATE_KEY`` ("state.yaml"); they are read transparently and converted on
+the next write.
+
+The labels and annotations let ``list_state_secrets`` describe every state
+from the secrets' metadata alone, page by page, without transferring or
+decoding their data.
+
+The ``kubernetes`` package is imported on first use only: loading it takes
+longer than most Babylon commands that never touch the cluster.
 """
 
+import gzip
+import json
+import re
 import sys
 from base64 import b64decode, b64encode
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from hashlib import sha256
 from logging import getLogger
+from typing import TYPE_CHECKING, Callable, Iterator
+
+from Babylon.utils.kubernetes_client import get_core_v1
+from Babylon.utils.yaml_utils import dump, safe_load
 
-from kubernetes import client, config
-from kubernetes.client.exceptions import ApiException
-from kubernetes.config.config_exception import ConfigException
-from yaml import dump, safe_load
+if TYPE_CHECKING:
+    from kubernetes import client
 
 logger = getLogger(__name__)
 
-# The key name stored inside the Kubernetes Secret's data map.
+# Data key of the single-document layout written by older versions.
 STATE_KEY = "state.yaml"
+# Data keys of the split layout.
+STATE_META_KEY = "state.meta"
+SERVICE_KEY_PREFIX = "services."
+STATE_FORMAT = "2"
+STATE_FORMAT_ANNOTATION = "babylon.cosmotech.com/state-format"
+STATE_HASH_ANNOTATION = "babylon.cosmotech.com/state-sha256"
+STATE_PAYLOAD_MAGIC = b"BABYLON-STATE/2\n"
+MERGE_PATCH = "application/merge-patch+json"
+# Written at save time so states can be listed from their metadata only.
+CONTEXT_LABEL = "babylon.cosmotech.com/context"
+TENANT_LABEL = "babylon.cosmotech.com/tenant"
+UPDATED_AT_ANNOTATION = "babylon.cosmotech.com/updated-at"
+STATE_SIZE_ANNOTATION = "babylon.cosmotech.com/state-size"
+LIST_PAGE_SIZE = 100
+# Ask for the metadata of the secrets only; servers that cannot send it fall back to the full list.
+_METADATA_ONLY = "application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1,application/json"
 # Label applied to every Babylon state secret enables fast server-side listing.
 STATE_LABEL_KEY = "app.kubernetes.io/managed-by"
 STATE_LABEL_VALUE = "babylon-state"
 
+# Valid Secret data key suffix
+_SERVICE_NAME = re.compile(r"[-._a-zA-Z0-9]+")
+_LABEL_VALUE = re.compile(r"(?=.{1,63}$)[A-Za-z0-9]([-A-Za-z0-9_.]*[A-Za-z0-9])?")
+
+
+@dataclass(frozen=True)
+class StateSecretInfo:
+    """A state secret described from its metadata; ``updated_at`` and ``size`` are empty for older secrets."""
+
+    namespace: str
+    name: str
+    context: str
+    tenant: str
+    updated_at: str = ""
+    size: int | None = None
+
 
 # ---------------------------------------------------------------------------
 # Internal helpers
 # ---------------------------------------------------------------------------
 
 
-def _load_kube_config() -> None:
-    """Load kubeconfig, with a clear error message on failure."""
+def _core_v1() -> "client.CoreV1Api":
+    """Return the shared CoreV1Api, with a clear error message when the kubeconfig cannot be loaded."""
+    from kubernetes.config.config_exception import ConfigException
+
     try:
-        config.load_kube_config()
+        return get_core_v1()
     except ConfigException as exc:
         logger.error("\n  [bold red]✘[/bold red] Failed to load kube config")
         logger.error(f"  [red]Reason:[/red] {exc}")
@@ -54,29 +120,83 @@ def _load_kube_config() -> None:
         sys.exit(1)
 
 
-def _core_v1() -> client.CoreV1Api:
-    """Return a CoreV1Api instance (kubeconfig must already be loaded)."""
-    return client.CoreV1Api()
-
-
 def _encode(data: dict) -> str:
-    """Serialise *data* to YAML and return a base64 string (utf-8)."""
-    yaml_str = dump(data, allow_unicode=True)
-    return b64encode(yaml_str.encode("utf-8")).decode("utf-8")
+    """Serialise *data* to a gzip-compressed YAML payload and return it base64-encoded."""
+    yaml_bytes = dump(data, allow_unicode=True).encode("utf-8")
+    # mtime=0: the same state always gives the same bytes, so unchanged keys are left out of patches
+    payload = STATE_PAYLOAD_MAGIC + gzip.compress(yaml_bytes, mtime=0)
+    return b64encode(payload).decode("ascii")
 
 
 def _decode(raw: bytes | str) -> dict:
-    """Decode a base64 value coming from a Secret's ``data`` field."""
+    """Decode a value coming from a Secret's ``data`` field (compressed payload or legacy plain YAML)."""
     if isinstance(raw, (bytes, bytearray)):
-        yaml_str = raw.decode("utf-8")
+        payload = bytes(raw)
     else:
         # Still base64-encoded (older client versions or raw JSON payload).
-        yaml_str = b64decode(raw).decode("utf-8")
-    return safe_load(yaml_str) or {}
+        payload = b64decode(raw)
+    if payload.startswith(STATE_PAYLOAD_MAGIC):
+        payload = gzip.decompress(payload[len(STATE_PAYLOAD_MAGIC) :])
+    return safe_load(payload.decode("utf-8")) or {}
+
+
+def _state_hash(state: dict) -> str:
+    try:
+        canonical = json.dumps(state, sort_keys=True, default=str, separators=(",", ":"))
+    except TypeError:
+        canonical = dump(state)
+    return sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _split_state(state: dict) -> dict[str, dict]:
+    """Return ``{data key: document}`` for *state*, one document per service."""
+    services = state.get("services")
+    if not isinstance(services, dict) or not all(isinstance(name, str) and _SERVICE_NAME.fullmatch(name) for name in services):
+        return {STATE_META_KEY: state}
+    parts = {STATE_META_KEY: {key: value for key, value in state.items() if key != "services"}}
+    parts.update({f"{SERVICE_KEY_PREFIX}{name}": {"value": value} for name, value in services.items()})
+    return parts
 
 
-def _build_secret(namespace: str, secret_name: str, encoded_value: str) -> client.V1Secret:
-    """Build a V1Secret object ready for create / replace calls."""
+def _is_state_key(key: str) -> bool:
+    return key in (STATE_KEY, STATE_META_KEY) or key.startswith(SERVICE_KEY_PREFIX)
+
+
+def _read_state(secret: "client.V1Secret") -> dict | None:
+    """Return the state stored in *secret*, or ``None`` when it holds none."""
+    data = secret.data or {}
+    if STATE_META_KEY not in data:
+        return _decode(data[STATE_KEY]) if STATE_KEY in data else None
+    state = _decode(data[STATE_META_KEY])
+    if "services" not in state:
+        services = {}
+        for key in sorted(data):
+            if key.startswith(SERVICE_KEY_PREFIX):
+                services[key[len(SERVICE_KEY_PREFIX) :]] = _decode(data[key]).get("value")
+        state["services"] = services
+    return state
+
+
+def _state_metadata(state: dict, state_hash: str, data: dict[str, str]) -> tuple[dict, dict]:
+    """Return the labels and annotations describing *state*, read by ``list_state_secrets``."""
+    labels = {STATE_LABEL_KEY: STATE_LABEL_VALUE}
+    for label, key in ((CONTEXT_LABEL, "context"), (TENANT_LABEL, "tenant")):
+        value = state.get(key)
+        if isinstance(value, str) and _LABEL_VALUE.fullmatch(value):
+            labels[label] = value
+    annotations = {
+        STATE_FORMAT_ANNOTATION: STATE_FORMAT,
+        STATE_HASH_ANNOTATION: state_hash,
+        UPDATED_AT_ANNOTATION: datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        STATE_SIZE_ANNOTATION: str(sum(len(value) for value in data.values())),
+    }
+    return labels, annotations
+
+
+def _build_secret(namespace: str, secret_name: str, data: dict[str, str], labels: dict, annotations: dict) -> "client.V1Secret":
+    """Build a V1Secret object ready for the create call."""
+    from kubernetes import client
+
     return client.V1Secret(
         api_version="v1",
         kind="Secret",
@@ -84,48 +204,132 @@ def _build_secret(namespace: str, secret_name: str, encoded_value: str) -> clien
         metadata=client.V1ObjectMeta(
             name=secret_name,
             namespace=namespace,
-            labels={STATE_LABEL_KEY: STATE_LABEL_VALUE},
+            labels=labels,
+            annotations=annotations,
         ),
-        data={STATE_KEY: encoded_value},
+        data=data,
     )
 
 
+def _write_state(v1: "client.CoreV1Api", namespace: str, secret_name: str, state: dict, existing) -> str:
+    """Store *state* in the secret read as *existing* (``None`` if absent).
+
+    A new secret is created whole; an existing one is merge-patched with the
+    changed data keys only, guarded by the ``resourceVersion`` that was read
+    (a concurrent write makes the API server answer 409 Conflict).
+
+    Returns:
+        ``"created"``, ``"updated"`` or ``"unchanged"``.
+    """
+    state_hash = _state_hash(state)
+    if existing is not None and (existing.metadata.annotations or {}).get(STATE_HASH_ANNOTATION) == state_hash:
+        return "unchanged"
+
+    data = {key: _encode(part) for key, part in _split_state(state).items()}
+    labels, annotations = _state_metadata(state, state_hash, data)
+    if existing is None:
+        v1.create_namespaced_secret(namespace=namespace, body=_build_secret(namespace, secret_name, data, labels, annotations))
+        return "created"
+
+    current = existing.data or {}
+    changed: dict[str, str | None] = {key: value for key, value in data.items() if current.get(key) != value}
+    # null removes a key: services gone from the state, and the legacy single document
+    changed.update({key: None for key in current if _is_state_key(key) and key not in data})
+    patch = {
+        "metadata": {
+            "resourceVersion": existing.metadata.resource_version,
+            "labels": labels,
+            "annotations": annotations,
+        },
+        "data": changed,
+    }
+    v1.patch_namespaced_secret(name=secret_name, namespace=namespace, body=patch, _content_type=MERGE_PATCH)
+    logger.debug(f"  State secret {secret_name}: {len(changed)} data key(s) patched")
+    return "updated"
+
+
+def _log_write(outcome: str, namespace: str, secret_name: str) -> None:
+    if outcome == "unchanged":
+        logger.info(f"  [dim]State secret [cyan]{secret_name}[/cyan] unchanged in namespace [cyan]{namespace}[/cyan][/dim]")
+    else:
+        logger.info(f"  [green]✔[/green] State secret [cyan]{secret_name}[/cyan] {outcome} in namespace [cyan]{namespace}[/cyan]")
+
+
 # Public API
 
 
 def save_state_in_kubernetes(namespace: str, secret_name: str, state_data: dict) -> None:
-    """Persist *state_data* as a Kubernetes Secret in *namespace*."""
-    _load_kube_config()
+    """Persist *state_data* as a Kubernetes Secret in *namespace*; nothing is written when it is unchanged."""
+    from kubernetes.client.exceptions import ApiException
+
     v1 = _core_v1()
-    encoded = _encode(state_data)
-    secret = _build_secret(namespace, secret_name, encoded)
 
     try:
-        existing_secret = v1.read_namespaced_secret(name=secret_name, namespace=namespace)
-        if existing_secret.metadata and secret.metadata:
-            secret.metadata.resource_version = existing_secret.metadata.resource_version
-            v1.replace_namespaced_secret(name=secret_name, namespace=namespace, body=secret)
-            logger.info(f"  [green]✔[/green] State secret [cyan]{secret_name}[/cyan] updated in namespace [cyan]{namespace}[/cyan]")
-    except ApiException as exc:
-        if exc.status == 404:
+        try:
+            existing = v1.read_namespaced_secret(name=secret_name, namespace=namespace)
+        except ApiException as exc:
+            if exc.status != 404:
+                raise
             # Secret does not exist → create it.
-            v1.create_namespaced_secret(namespace=namespace, body=secret)
-            logger.info(f"  [green]✔[/green] State secret [cyan]{secret_name}[/cyan] created in namespace [cyan]{namespace}[/cyan]")
-        else:
-            logger.error(f"  [bold red]✘[/bold red] Kubernetes API error while storing state (HTTP {exc.status}): {exc.reason}")
-            sys.exit(1)
+            existing = None
+        _log_write(_write_state(v1, namespace, secret_name, state_data, existing), namespace, secret_name)
+    except ApiException as exc:
+        logger.error(f"  [bold red]✘[/bold red] Kubernetes API error while storing state (HTTP {exc.status}): {exc.reason}")
+        sys.exit(1)
     except Exception as exc:
         logger.error(f"  [bold red]✘[/bold red] Failed to connect to the Kubernetes cluster: {exc}")
         sys.exit(1)
 
 
+def update_state_in_kubernetes(
+    namespace: str,
+    secret_name: str,
+    mutate: Callable[[dict], dict],
+    retries: int = 5,
+) -> None:
+    """Apply *mutate* to the stored state with optimistic concurrency.
+
+    The secret is read, *mutate* receives the decoded state (empty when the
+    secret does not exist) and returns the state to store. The write carries the
+    ``resourceVersion`` that was read, so a concurrent writer makes the API
+    server answer 409 Conflict; the read-mutate-write cycle is then retried up
+    to *retries* times.
+    """
+    from kubernetes.client.exceptions import ApiException
+
+    v1 = _core_v1()
+
+    for attempt in range(1, retries + 1):
+        try:
+            try:
+                existing = v1.read_namespaced_secret(name=secret_name, namespace=namespace)
+            except ApiException as exc:
+                if exc.status != 404:
+                    raise
+                existing = None
+
+            current = (_read_state(existing) if existing is not None else None) or {}
+            _log_write(_write_state(v1, namespace, secret_name, mutate(current), existing), namespace, secret_name)
+            return
+        except ApiException as exc:
+            if exc.status == 409 and attempt < retries:
+                logger.debug(f"  State secret {secret_name} changed concurrently, retrying ({attempt}/{retries})")
+                continue
+            logger.error(f"  [bold red]✘[/bold red] Kubernetes API error while storing state (HTTP {exc.status}): {exc.reason}")
+            sys.exit(1)
+        except Exception as exc:
+            logger.error(f"  [bold red]✘[/bold red] Failed to connect to the Kubernetes cluster: {exc}")
+            sys.exit(1)
+
+
 def retrieve_state_from_kubernetes(namespace: str, secret_name: str) -> dict | None:
     """Read state from a Kubernetes Secret and return it as a dictionary.
 
     Returns ``None`` when the secret does not exist so the caller can decide
     whether to initialise a fresh state or raise an error.
     """
-    _load_kube_config()
+    from kubernetes.client.exceptions import ApiException
+
     v1 = _core_v1()
 
     try:
@@ -142,12 +346,60 @@ def retrieve_state_from_kubernetes(namespace: str, secret_name: str) -> dict | N
         logger.error(f"  [bold red]✘[/bold red] Failed to connect to the Kubernetes cluster: {exc}")
         sys.exit(1)
 
-    if not secret.data or STATE_KEY not in secret.data:
-        logger.warning(
-            f"  [yellow]⚠[/yellow] State secret [cyan]{secret_name}[/cyan] exists but contains no [cyan]{STATE_KEY}[/cyan] key"
-        )
+    state = _read_state(secret)
+    if state is None:
+        logger.warning(f"  [yellow]⚠[/yellow] State secret [cyan]{secret_name}[/cyan] exists but contains no state")
         return None
 
-    state = _decode(secret.data[STATE_KEY])
     logger.info(f"  [green]✔[/green] State loaded from secret [cyan]{secret_name}[/cyan] in namespace [cyan]{namespace}[/cyan]")
     return state
+
+
+def _secret_info(metadata: dict) -> StateSecretInfo:
+    labels = metadata.get("labels") or {}
+    annotations = metadata.get("annotations") or {}
+    namespace, name = metadata.get("namespace", ""), metadata.get("name", "")
+    tenant = labels.get(TENANT_LABEL, namespace)
+    context = labels.get(CONTEXT_LABEL)
+    if context is None:
+        # Secrets saved before the labels existed: babylon-state-<context>-<tenant>
+        context = name.removeprefix("babylon-state-").removesuffix(f"-{tenant}")
+    size = annotations.get(STATE_SIZE_ANNOTATION, "")
+    return StateSecretInfo(
+        namespace=namespace,
+        name=name,
+        context=context,
+        tenant=tenant,
+        updated_at=annotations.get(UPDATED_AT_ANNOTATION, ""),
+        size=int(size) if size.isdigit() else None,
+    )
+
+
+def list_state_secrets(namespace: str | None = None, page_size: int = LIST_PAGE_SIZE) -> Iterator[StateSecretInfo]:
+    """Yield the state secrets of *namespace*, or of every namespace when it is ``None``.
+
+    Secrets are listed page by page (``limit`` / ``continue``) through the
+    state label selector, and only their metadata is requested and parsed.
+
+    Raises:
+        kubernetes.client.exceptions.ApiException: when a page cannot be listed.
+    """
+    v1 = _core_v1()
+    kwargs = {
+        "label_selector": f"{STATE_LABEL_KEY}={STATE_LABEL_VALUE}",
+        "limit": page_size,
+        "_preload_content": False,
+        "_headers": {"Accept": _METADATA_ONLY},
+    }
+    token = None
+    while True:
+        if namespace is None:
+            response = v1.list_secret_for_all_namespaces(_continue=token, **kwargs)
+        else:
+            response = v1.list_namespaced_secret(namespace=namespace, _continue=token, **kwargs)
+        page = json.loads(response.data)
+        for item in page.get("items") or []:
+            yield _secret_info(item.get("metadata") or {})
+        token = (page.get("metadata") or {}).get("continue")
+        if not token:
+            return
@@ -0,0 +1,52 @@
+"""
+Click group whose sub-commands are imported on first use.
+
+Sub-commands are registered by dotted path (``"package.module:attribute"``)
+together with the short help shown in ``--help``, so listing commands does
+not import them. A command module, with the SDKs it pulls in (Kubernetes,
+Azure, the Cosmo Tech API client...), is only imported when the command line
+resolves to it.
+"""
+
+from importlib import import_module
+
+from click import Command, Context, Group, HelpFormatter
+
+
+class LazyGroup(Group):
+    """``click.Group`` resolving sub-commands from ``{name: (import path, short help)}``."""
+
+    def __init__(self, *args, lazy_commands: dict[str, tuple[str, str]] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+
+    def list_commands(self, ctx: Context) -> list[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+
+    def get_command(self, ctx: Context | None, cmd_name: str) -> Command | None:
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            self.add_command(self._load(cmd_name), cmd_name)
+        return self.commands.get(cmd_name)
+
+    def _load(self, cmd_name: str) -> Command:
+        import_path = self.lazy_commands[cmd_name][0]
+        module_name, _, attribute = import_path.partition(":")
+        cmd = getattr(import_module(module_name), attribute)
+        if not isinstance(cmd, Command):
+            raise TypeError(f"{import_path} is not a click command")
+        return cmd
+
+    def format_commands(self, ctx: Context, formatter: HelpFormatter) -> None:
+        """List sub-commands with their registered short help, without importing them."""
+        rows = []
+        for name in self.list_commands(ctx):
+            if name in self.commands:
+                cmd = self.commands[name]
+                if cmd.hidden:
+                    continue
+                rows.append((name, cmd.get_short_help_str(formatter.width - 6 - len(name))))
+            else:
+                rows.append((name, self.lazy_commands[name][1]))
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
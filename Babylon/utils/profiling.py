@@ -0,0 +1,198 @@
+"""
+Lightweight span instrumentation for the macro commands.
+
+``span("name")`` (context manager) and ``traced("name")`` (decorator) record
+nested phases of a run (template rendering, token fetch, API calls, security
+sync, Kubernetes job waits, Superset imports, Terraform runs). Nothing is
+recorded until ``profiler.enable()`` is called (``babylon --profile-out
+trace.json ...``); a disabled span costs one attribute check.
+
+At the end of the run the spans are written in the Chrome trace-event format
+(open the file in ``chrome://tracing`` or https://ui.perfetto.dev), and the
+slowest phases are printed with their call count, total, self and maximum
+time. Spans opened in worker threads (``--parallelism``) appear on their own
+track; self time only subtracts children of the same thread.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from logging import getLogger
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Callable, Iterator
+
+from click import echo, style
+
+logger = getLogger(__name__)
+
+# Rows printed by ``print_summary``.
+SUMMARY_ROWS = 15
+
+
+@dataclass
+class Span:
+    name: str
+    category: str
+    start_ns: int
+    thread_id: int
+    thread_name: str
+    args: dict = field(default_factory=dict)
+    duration_ns: int = 0
+    children_ns: int = 0
+
+    @property
+    def self_ns(self) -> int:
+        return max(0, self.duration_ns - self.children_ns)
+
+
+@dataclass
+class PhaseStats:
+    name: str
+    calls: int = 0
+    total_ns: int = 0
+    self_ns: int = 0
+    max_ns: int = 0
+
+
+class Profiler:
+    """Collects finished spans of every thread while enabled."""
+
+    def __init__(self):
+        self.enabled = False
+        self.spans: list[Span] = []
+        self._origin_ns = perf_counter_ns()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self) -> None:
+        with self._lock:
+            self.enabled = True
+            self.spans = []
+            self._origin_ns = perf_counter_ns()
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def _stack(self) -> list[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, name: str, category: str = "babylon", **args: Any) -> Iterator[Span | None]:
+        if not self.enabled:
+            yield None
+            return
+        current = Span(name, category, perf_counter_ns(), threading.get_ident(), threading.current_thread().name, args)
+        stack = self._stack()
+        stack.append(current)
+        try:
+            yield current
+        finally:
+            current.duration_ns = perf_counter_ns() - current.start_ns
+            stack.pop()
+            if stack:
+                stack[-1].children_ns += current.duration_ns
+            with self._lock:
+                self.spans.append(current)
+
+    def trace_events(self) -> list[dict]:
+        """Return the spans as Chrome trace "complete" events (microseconds), after one thread-name event per thread."""
+        pid = os.getpid()
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start_ns)
+        threads = {s.thread_id: s.thread_name for s in spans}
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}}
+            for tid, thread_name in threads.items()
+        ]
+        return metadata + [
+            {
+                "name": s.name,
+                "cat": s.category,
+                "ph": "X",
+                "ts": (s.start_ns - self._origin_ns) / 1000,
+                "dur": s.duration_ns / 1000,
+                "pid": pid,
+                "tid": s.thread_id,
+                "args": {key: str(value) for key, value in s.args.items()},
+            }
+            for s in spans
+        ]
+
+    def write_trace(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as file:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, file)
+        logger.info(f"  [green]✔[/green] Trace written to [cyan]{path}[/cyan]")
+
+    def phases(self) -> list[PhaseStats]:
+        """Aggregate the spans by name, slowest total first."""
+        stats: dict[str, PhaseStats] = {}
+        with self._lock:
+            for s in self.spans:
+                phase = stats.setdefault(s.name, PhaseStats(s.name))
+                phase.calls += 1
+                phase.total_ns += s.duration_ns
+                phase.self_ns += s.self_ns
+                phase.max_ns = max(phase.max_ns, s.duration_ns)
+        return sorted(stats.values(), key=lambda p: p.total_ns, reverse=True)
+
+    def print_summary(self, limit: int = SUMMARY_ROWS) -> None:
+        phases = self.phases()[:limit]
+        if not phases:
+            return
+        echo(style("\n⏱  Slowest phases", bold=True, fg="yellow"))
+        width = max(len("PHASE"), *(len(p.name) for p in phases)) + 2
+        echo(f"  {'PHASE':<{width}}{'CALLS':>7}{'TOTAL':>11}{'SELF':>11}{'MAX':>11}")
+        for p in phases:
+            echo(f"  {p.name:<{width}}{p.calls:>7}{_seconds(p.total_ns):>11}{_seconds(p.self_ns):>11}{_seconds(p.max_ns):>11}")
+
+
+def _seconds(ns: int) -> str:
+    return f"{ns / 1e9:.3f}s"
+
+
+profiler = Profiler()
+
+
+def span(name: str, category: str = "babylon", **args: Any):
+    """Record the enclosed block as phase *name* (no-op when profiling is off)."""
+    return profiler.span(name, category, **args)
+
+
+def traced(name: str | None = None, category: str = "babylon") -> Callable[[Callable], Callable]:
+    """Decorator recording each call of the function as phase *name* (default: its qualified name)."""
+
+    def decorator(func: Callable) -> Callable:
+        phase = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            with profiler.span(phase, category):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def finish_profiling(trace_path: Path | None) -> None:
+    """Write the trace to *trace_path* and print the slowest phases."""
+    if not profiler.enabled:
+        return
+    profiler.disable()
+    if trace_path:
+        try:
+            profiler.write_trace(trace_path)
+        except OSError as exc:
+            logger.error(f"  [bold red]✘[/bold red] Could not write trace to {trace_path}: {exc}")
+    profiler.print_summary()
@@ -1,7 +1,7 @@
 import logging
 from typing import Any, Optional
 
-import requests
+from Babylon.utils import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -21,19 +21,11 @@ def oauth_request(
         headers = {"Authorization": f"Bearer {access_token}"}
     else:
         headers = {"Authorization": f"Bearer {access_token}", "Content-Type": content_type, **kwargs.pop("headers", {})}
-    request_funcs = {
-        "POST": requests.post,
-        "PATCH": requests.patch,
-        "PUT": requests.put,
-        "GET": requests.get,
-        "DELETE": requests.delete,
-    }
-    request_func = request_funcs.get(type.upper())
-    if not request_func:
+    if type.upper() not in {"POST", "PATCH", "PUT", "GET", "DELETE"}:
         logger.warning(f"Could not find request of type {type}")
         return None
     try:
-        response = request_func(url=url, headers=headers, **kwargs)
+        response = http_client.request(type, url, headers=headers, **kwargs)
     except Exception as e:
         logger.warning(f"Request failed: {e}")
         return None
@@ -6,13 +6,13 @@ import tempfile
 from datetime import datetime
 from typing import Any, Optional
 
-import yaml
 from click import get_current_context
 from rich.console import Console
 from rich.pretty import pprint
 from rich.table import Table
 
 from .environment import Environment
+from .yaml_utils import dump
 
 logger = logging.getLogger(__name__)
 console = Console()
@@ -53,7 +53,7 @@ class CommandResponse:
         return json.dumps(self.data, indent=4, ensure_ascii=False)
 
     def toYAML(self) -> str:
-        return yaml.dump(self.data)
+        return dump(self.data)
 
     def _get_normalized_items(self) -> list:
         raw_data = self.data
@@ -110,7 +110,7 @@ class CommandResponse:
 
     def dump_yaml(self, output_file: pathlib.Path):
         """Dump command response data in a yaml file"""
-        yaml_file = yaml.dump(self.data)
+        yaml_file = dump(self.data)
         tmpf = tempfile.NamedTemporaryFile(mode="w+")
         tmpf.write(yaml_file)
         tmpf.seek(0)
@@ -0,0 +1,247 @@
+"""
+Storage backends for the Babylon state of a ``(context, tenant)`` namespace.
+
+Every backend implements ``StateBackend``:
+
+- ``YamlFileBackend``: one ``state.<context>.<tenant>.yaml`` file per
+  namespace (the historical local layout).
+- ``KubernetesSecretBackend``: the ``babylon-state-<context>-<tenant>``
+  Secret of the tenant namespace (see ``kubernetes_state``).
+- ``SqliteStateBackend``: every namespace in a single SQLite database. Each
+  store that changes the state adds a version, so previous states can be
+  listed and restored; listing and point lookups are indexed queries.
+
+The local backend is chosen with ``BABYLON_LOCAL_STATE_BACKEND``
+(``sqlite``, the default, or ``yaml``). When the SQLite backend is first
+used in a process it imports every YAML state file that is newer than the
+namespace's latest version in the database (all of them right after an
+upgrade, or those written while the ``yaml`` backend was selected).
+"""
+
+import json
+import os
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from logging import getLogger
+from pathlib import Path
+from typing import Protocol, runtime_checkable
+
+from Babylon.utils.kubernetes_state import list_state_secrets, retrieve_state_from_kubernetes, save_state_in_kubernetes
+from Babylon.utils.yaml_utils import dump, safe_load
+
+logger = getLogger(__name__)
+
+LOCAL_STATE_BACKEND_ENV_VAR = "BABYLON_LOCAL_STATE_BACKEND"
+STATE_DB_FILE = "states.db"
+# Versions kept per namespace by the SQLite backend.
+DEFAULT_HISTORY = 50
+
+
+@dataclass(frozen=True)
+class StateEntry:
+    """A stored state; ``version``, ``updated_at`` and ``size`` are empty when the backend does not track them."""
+
+    context: str
+    tenant: str
+    location: str
+    version: int | None = None
+    updated_at: str = ""
+    size: int | None = None
+
+
+@runtime_checkable
+class StateBackend(Protocol):
+    def load(self, context: str, tenant: str) -> dict | None:
+        """Return the stored state, or ``None`` when there is none."""
+        ...
+
+    def save(self, context: str, tenant: str, state: dict) -> None: ...
+
+    def list_states(self) -> list[StateEntry]: ...
+
+
+class YamlFileBackend:
+    """``state.<context>.<tenant>.yaml`` files in *state_dir*."""
+
+    def __init__(self, state_dir: Path):
+        self.state_dir = Path(state_dir)
+
+    def path(self, context: str, tenant: str) -> Path:
+        return self.state_dir / f"state.{context}.{tenant}.yaml"
+
+    def load(self, context: str, tenant: str) -> dict | None:
+        state_file = self.path(context, tenant)
+        if not state_file.exists():
+            return None
+        with state_file.open("r") as file:
+            return safe_load(file)
+
+    def save(self, context: str, tenant: str, state: dict) -> None:
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.path(context, tenant).write_bytes(data=dump(state).encode("utf-8"))
+
+    def list_states(self) -> list[StateEntry]:
+        entries = []
+        for state_file in sorted(self.state_dir.glob("state.*.yaml")):
+            # Context names cannot contain dots, tenants (Kubernetes namespaces) neither
+            _, context, tenant = state_file.stem.split(".", 2)
+            updated = datetime.fromtimestamp(state_file.stat().st_mtime, timezone.utc)
+            entries.append(StateEntry(context, tenant, state_file.name, updated_at=updated.isoformat(timespec="seconds")))
+        return entries
+
+
+class KubernetesSecretBackend:
+    """State Secrets, stored in *namespace* (by default the namespace named after the tenant)."""
+
+    def __init__(self, namespace: str = ""):
+        self.namespace = namespace
+
+    @staticmethod
+    def secret_name(context: str, tenant: str) -> str:
+        return f"babylon-state-{context}-{tenant}"
+
+    def load(self, context: str, tenant: str) -> dict | None:
+        return retrieve_state_from_kubernetes(namespace=self.namespace or tenant, secret_name=self.secret_name(context, tenant))
+
+    def save(self, context: str, tenant: str, state: dict) -> None:
+        save_state_in_kubernetes(namespace=self.namespace or tenant, secret_name=self.secret_name(context, tenant), state_data=state)
+
+    def list_states(self, all_namespaces: bool = False) -> list[StateEntry]:
+        """List the state Secrets of ``namespace``, or of every namespace, from their metadata."""
+        secrets = list_state_secrets(None if all_namespaces else self.namespace)
+        return [
+            StateEntry(info.context, info.tenant, f"{info.namespace}/{info.name}", None, info.updated_at, info.size)
+            for info in secrets
+        ]
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS state_versions (
+    context    TEXT    NOT NULL,
+    tenant     TEXT    NOT NULL,
+    version    INTEGER NOT NULL,
+    created_at TEXT    NOT NULL,
+    state      TEXT    NOT NULL,
+    PRIMARY KEY (context, tenant, version)
+);
+CREATE TABLE IF NOT EXISTS states (
+    context    TEXT    NOT NULL,
+    tenant     TEXT    NOT NULL,
+    version    INTEGER NOT NULL,
+    updated_at TEXT    NOT NULL,
+    PRIMARY KEY (context, tenant)
+);
+"""
+
+
+def _serialize(state: dict) -> str:
+    return json.dumps(state, sort_keys=True, default=str, separators=(",", ":"))
+
+
+class SqliteStateBackend:
+    """Versioned states of every namespace in one SQLite database.
+
+    Args:
+        path:         Database file, created on first write.
+        history:      Versions kept per namespace (older ones are pruned).
+        import_from:  Directory of ``state.<context>.<tenant>.yaml`` files
+                      imported when they are newer than the stored state.
+    """
+
+    def __init__(self, path: Path, history: int = DEFAULT_HISTORY, import_from: Path | None = None):
+        self.path = Path(path)
+        self.history = max(1, history)
+        self.import_from = YamlFileBackend(import_from) if import_from else None
+        self._ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        if not self._ready:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            self._ready = True
+            if self.import_from is not None:
+                self._import_yaml_states(connection)
+        return connection
+
+    def _import_yaml_states(self, db: sqlite3.Connection) -> None:
+        """Store the YAML state files modified after the latest version of their namespace."""
+        stored = {(c, t): updated_at for c, t, updated_at in db.execute("SELECT context, tenant, updated_at FROM states")}
+        for entry in self.import_from.list_states():
+            if entry.updated_at <= stored.get((entry.context, entry.tenant), ""):
+                continue
+            state = self.import_from.load(entry.context, entry.tenant)
+            if state is not None:
+                logger.debug(f"  Importing {self.import_from.path(entry.context, entry.tenant)} into {self.path}")
+                self.save(entry.context, entry.tenant, state)
+
+    def load(self, context: str, tenant: str, version: int | None = None) -> dict | None:
+        """Return the latest state of the namespace, or the given *version* of it."""
+        query = "SELECT state FROM state_versions WHERE context = ? AND tenant = ?"
+        if version is None:
+            query, params = f"{query} ORDER BY version DESC LIMIT 1", (context, tenant)
+        else:
+            query, params = f"{query} AND version = ?", (context, tenant, version)
+        with closing(self._connect()) as db:
+            row = db.execute(query, params).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def save(self, context: str, tenant: str, state: dict) -> int:
+        """Store *state* as a new version unless it equals the latest one; return the current version."""
+        payload = _serialize(state)
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        with closing(self._connect()) as db, db:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute(
+                "SELECT version, state FROM state_versions WHERE context = ? AND tenant = ? ORDER BY version DESC LIMIT 1",
+                (context, tenant),
+            ).fetchone()
+            if row is not None and row[1] == payload:
+                return row[0]
+            version = (row[0] if row else 0) + 1
+            db.execute("INSERT INTO state_versions VALUES (?, ?, ?, ?, ?)", (context, tenant, version, now, payload))
+            db.execute("INSERT OR REPLACE INTO states VALUES (?, ?, ?, ?)", (context, tenant, version, now))
+            db.execute(
+                "DELETE FROM state_versions WHERE context = ? AND tenant = ? AND version <= ?",
+                (context, tenant, version - self.history),
+            )
+        return version
+
+    def list_states(self) -> list[StateEntry]:
+        with closing(self._connect()) as db:
+            rows = db.execute("SELECT context, tenant, version, updated_at FROM states ORDER BY context, tenant").fetchall()
+        return [StateEntry(context, tenant, self.path.name, version, updated_at) for context, tenant, version, updated_at in rows]
+
+    def history_of(self, context: str, tenant: str) -> list[StateEntry]:
+        """Return the stored versions of a namespace, newest first."""
+        with closing(self._connect()) as db:
+            rows = db.execute(
+                "SELECT version, created_at FROM state_versions WHERE context = ? AND tenant = ? ORDER BY version DESC",
+                (context, tenant),
+            ).fetchall()
+        return [StateEntry(context, tenant, self.path.name, version, created_at) for version, created_at in rows]
+
+    def rollback(self, context: str, tenant: str, version: int) -> int:
+        """Make *version* the current state again (stored as a new version); return the new version.
+
+        Raises:
+            KeyError: when the version is not stored.
+        """
+        state = self.load(context, tenant, version=version)
+        if state is None:
+            raise KeyError(f"State version {version} of {context}/{tenant} not found")
+        return self.save(context, tenant, state)
+
+
+def local_state_backend(state_dir: Path) -> StateBackend:
+    """Return the local backend selected by ``BABYLON_LOCAL_STATE_BACKEND``."""
+    kind = os.environ.get(LOCAL_STATE_BACKEND_ENV_VAR, "sqlite").strip().lower()
+    if kind == "yaml":
+        return YamlFileBackend(state_dir)
+    if kind != "sqlite":
+        logger.warning(f"  [yellow]⚠[/yellow] Unknown {LOCAL_STATE_BACKEND_ENV_VAR} value '{kind}', using sqlite")
+    return SqliteStateBackend(Path(state_dir) / STATE_DB_FILE, import_from=state_dir)
@@ -0,0 +1,150 @@
+"""
+State session shared by every deployment of an ``apply`` / ``destroy`` run.
+
+The state is loaded once when the session opens. Deployments mutate the
+shared dictionary and call ``checkpoint()`` when they are done; the session
+only writes when there are dirty keys. A checkpoint that records a new
+value for a key that was empty (the id of a resource just created) is
+written immediately, so a crashed run never loses track of what it
+created; other changes are written every ``checkpoint_every`` checkpoints
+or when the run ends.
+
+Remote writes apply the dirty keys on top of the state currently stored in
+the Kubernetes Secret (optimistic concurrency on ``resourceVersion``) so a
+concurrent run touching other keys is not overwritten.
+"""
+
+from copy import deepcopy
+from logging import getLogger
+from typing import Any
+
+from Babylon.utils.kubernetes_state import update_state_in_kubernetes
+
+logger = getLogger(__name__)
+
+# Marker for keys removed from the state since the last flush.
+_DELETED = object()
+
+
+def _flatten(data: dict, prefix: tuple = ()) -> dict[tuple, Any]:
+    """Flatten nested dictionaries into ``{(key, subkey, ...): value}``."""
+    flat: dict[tuple, Any] = {}
+    for key, value in data.items():
+        path = (*prefix, key)
+        if isinstance(value, dict) and value:
+            flat.update(_flatten(value, path))
+        else:
+            flat[path] = value
+    return flat
+
+
+def _set_path(data: dict, path: tuple, value: Any) -> None:
+    """Set (or delete, for ``_DELETED``) the value at *path* inside *data*."""
+    node = data
+    for key in path[:-1]:
+        if not isinstance(node.get(key), dict):
+            if value is _DELETED:
+                return
+            node[key] = {}
+        node = node[key]
+    if value is _DELETED:
+        node.pop(path[-1], None)
+    else:
+        node[path[-1]] = deepcopy(value)
+
+
+class StateSession:
+    """Load-once / flush-once view of the Babylon state for a whole run.
+
+    Usage::
+
+        with StateSession(env, checkpoint_every=0) as session:
+            deploy(state=session.state)
+            env.store_state(session.state)  # counts as a checkpoint
+
+    Args:
+        env:              The ``Environment`` singleton.
+        checkpoint_every: Flush after this many checkpoints, ``0`` to flush only
+                          when the session closes. Checkpoints recording a newly
+                          created resource id always flush.
+    """
+
+    def __init__(self, env, checkpoint_every: int = 0):
+        self.env = env
+        self.checkpoint_every = checkpoint_every
+        self.remote = env.remote
+        self.state: dict = {}
+        self._snapshot: dict[tuple, Any] = {}
+        self._checkpoints = 0
+
+    def __enter__(self) -> "StateSession":
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def open(self) -> dict:
+        """Load the state and register the session on the environment."""
+        self.remote = self.env.remote
+        self.state = self.env.retrieve_state_func()
+        self._snapshot = _flatten(deepcopy(self.state))
+        self.env.state_session = self
+        return self.state
+
+    def close(self) -> None:
+        """Flush pending changes and unregister the session."""
+        try:
+            self.flush()
+        finally:
+            if self.env.state_session is self:
+                self.env.state_session = None
+
+    def dirty_keys(self) -> dict[tuple, Any]:
+        """Return ``{path: new_value}`` for every key changed since the last flush."""
+        current = _flatten(self.state)
+        changes = {path: value for path, value in current.items() if self._snapshot.get(path, _DELETED) != value}
+        changes.update({path: _DELETED for path in self._snapshot if path not in current})
+        return changes
+
+    def has_new_values(self) -> bool:
+        """Return ``True`` when a key that was missing or empty at the last flush now holds a value."""
+        return any(value not in (None, "", _DELETED) and not self._snapshot.get(path) for path, value in self.dirty_keys().items())
+
+    def checkpoint(self) -> None:
+        """Record the end of a unit of work, flushing new resource ids at once and other changes every ``checkpoint_every`` calls."""
+        with self.env.state_lock:
+            self._checkpoints += 1
+            if self.has_new_values() or (self.checkpoint_every and self._checkpoints % self.checkpoint_every == 0):
+                self.flush()
+
+    def flush(self) -> bool:
+        """Write dirty keys locally and, for remote states, to Kubernetes.
+
+        Returns:
+            ``True`` if something was written.
+        """
+        with self.env.state_lock:
+            changes = self.dirty_keys()
+            if not changes:
+                logger.debug("  State unchanged, nothing to flush")
+                return False
+
+            logger.debug(f"  Flushing {len(changes)} state key(s): {', '.join('.'.join(map(str, p)) for p in changes)}")
+            self.env.store_state_in_local(self.state)
+            if self.remote:
+
+                def _merge(remote_state: dict) -> dict:
+                    merged = remote_state or deepcopy(self.state)
+                    # Deletions first: a leaf replaced by a mapping shows up as both
+                    for path, value in sorted(changes.items(), key=lambda c: c[1] is not _DELETED):
+                        _set_path(merged, path, value)
+                    return merged
+
+                update_state_in_kubernetes(
+                    namespace=self.env.environ_id,
+                    secret_name=self.env.state_secret_name(),
+                    mutate=_merge,
+                )
+            self._snapshot = _flatten(deepcopy(self.state))
+            return True
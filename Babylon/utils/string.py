@@ -27,3 +27,66 @@ def to_header_line(string: str) -> str:
         return "-" * MAX_LINE_LENGTH
     missing = MAX_LINE_LENGTH - length - 2
     return f"{'-' * (missing // 2)} {string} {'-' * (missing // 2)}"
+
+
+UUID_PATTERN = r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+
+
+class MultiReplacer:
+    """Replace many literal strings in a single scan of the text.
+
+    By default the keys of *mapping* are compiled into one alternation regex
+    (longest keys first, so a key that is a prefix of another never shadows
+    it). When every key has the same shape, pass a *token* regex matching that
+    shape instead (e.g. ``UUID_PATTERN``): the text is scanned for tokens and
+    each one is looked up in the mapping, so the cost no longer depends on the
+    number of keys.
+
+    Either way a text is rewritten in one pass, instead of one ``str.replace``
+    per key.
+
+    :param mapping: ``{old: new}`` literal replacements
+    :param ignore_case: match keys case-insensitively (keys must then be unique once lower-cased)
+    :param token: optional regex matching every key in any accepted case, and only whole keys
+    """
+
+    def __init__(self, mapping: dict[str, str], ignore_case: bool = False, token: str | None = None):
+        self.ignore_case = ignore_case
+        self._mapping = {(key.lower() if ignore_case else key): value for key, value in mapping.items() if key}
+        flags = re.IGNORECASE if ignore_case else 0
+        if not self._mapping:
+            self._pattern = None
+        elif token:
+            self._pattern = re.compile(token)
+        else:
+            keys = sorted(self._mapping, key=len, reverse=True)
+            self._pattern = re.compile("|".join(map(re.escape, keys)), flags)
+
+    def __bool__(self) -> bool:
+        return self._pattern is not None
+
+    def subn(self, text: str) -> tuple[str, int]:
+        """
+        Replace every key found in *text*
+        :param text: the text to rewrite
+        :return: the new text and the number of substitutions made
+        """
+        if self._pattern is None:
+            return text, 0
+        count = 0
+        mapping = self._mapping
+        ignore_case = self.ignore_case
+
+        def _replacement(match: re.Match) -> str:
+            nonlocal count
+            found = match.group(0)
+            new = mapping.get(found.lower() if ignore_case else found)
+            if new is None:
+                return found
+            count += 1
+            return new
+
+        return self._pattern.sub(_replacement, text), count
+
+    def sub(self, text: str) -> str:
+        return self.subn(text)[0]
@@ -0,0 +1,112 @@
+"""
+Compiled Mako template cache and incremental state flattening used by
+``Environment.fill_template``.
+
+Templates are keyed by the SHA-256 of their text. The first use in a process
+compiles the template through Mako's ``module_directory`` support: the text
+is stored as ``<hash>.mako`` in the cache directory and Mako writes (and on
+later runs reloads) the generated Python module next to it, so a template is
+only compiled once across runs. Within a process the ``Template`` object is
+reused directly.
+"""
+
+import json
+import os
+from hashlib import sha256
+from logging import getLogger
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from mako.template import Template
+
+logger = getLogger(__name__)
+
+
+class TemplateCache:
+    """Process-wide ``{sha256(text): Template}`` cache backed by Mako module files.
+
+    Args:
+        cache_dir: Directory receiving template sources and compiled modules;
+                   ``None`` keeps compiled templates in memory only.
+    """
+
+    def __init__(self, cache_dir: Path | None = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._templates: dict[str, "Template"] = {}
+        self._lock = Lock()
+
+    def get(self, text: str) -> "Template":
+        """Return the compiled template for *text* (``strict_undefined`` mode)."""
+        key = sha256(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            template = self._templates.get(key)
+            if template is None:
+                template = self._compile(key, text)
+                self._templates[key] = template
+            return template
+
+    def _compile(self, key: str, text: str) -> "Template":
+        from mako.template import Template
+
+        if self.cache_dir is not None:
+            try:
+                source = self._store_source(key, text)
+                return Template(
+                    filename=str(source),
+                    uri=source.name,
+                    module_directory=str(self.cache_dir / "modules"),
+                    strict_undefined=True,
+                )
+            except OSError as exc:
+                logger.debug(f"  Template cache unavailable in {self.cache_dir}: {exc}")
+        return Template(text=text, strict_undefined=True)
+
+    def _store_source(self, key: str, text: str) -> Path:
+        source = self.cache_dir / f"{key}.mako"
+        if not source.is_file():
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with NamedTemporaryFile("w", encoding="utf-8", newline="", dir=self.cache_dir, prefix=f".{key}.", delete=False) as tmp:
+                tmp.write(text)
+            os.replace(tmp.name, source)
+        return source
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+
+
+class StateFlattener:
+    """Flatten ``state["services"]`` to ``{"api.organization_id": ...}`` incrementally.
+
+    Each top-level service is flattened separately and reused as long as its
+    content (compared through its JSON serialization) has not changed, so
+    rendering several templates during one apply only re-flattens the
+    services updated in between.
+    """
+
+    def __init__(self):
+        self._parts: dict[str, tuple[str | None, dict]] = {}
+        self._lock = Lock()
+
+    def flatten(self, services: dict) -> dict:
+        from flatten_json import flatten
+
+        result = {}
+        with self._lock:
+            for name, value in services.items():
+                try:
+                    fingerprint = json.dumps(value, sort_keys=True, default=str)
+                except TypeError:
+                    # Keys that cannot be sorted: never reuse
+                    fingerprint = None
+                cached = self._parts.get(name)
+                if cached is None or fingerprint is None or cached[0] != fingerprint:
+                    cached = (fingerprint, flatten({name: value}, separator="."))
+                    self._parts[name] = cached
+                result.update(cached[1])
+            for name in set(self._parts) - set(services):
+                del self._parts[name]
+        return result
@@ -0,0 +1,244 @@
+"""
+Babylon variables YAML files: cached merged view and transactional editor.
+
+``VariableStore`` parses each ``--var-file`` once and keeps the merged
+variables and the duplicate-key report until one of the files changes on
+disk (its ``(mtime_ns, size, inode)`` differs), e.g. when the dashboard UUID
+feedback rewrites it mid-run.
+
+``VariablesFileEditor`` edits one file transactionally: it is parsed once
+with ``ruamel.yaml`` round-trip mode (comments, quotes and template
+expressions are kept verbatim), every update is applied in memory, and the
+result is written once, atomically, through a temporary file in the same
+directory and ``os.replace``. An interrupted run leaves
+either the old or the new file, never a half-written one, and the file is not
+touched at all when the updates change nothing.
+
+Usage::
+
+    with VariablesFileEditor(path) as editor:
+        editor.update_entry("expertview", {"uuid": "...", "original_id": "42"})
+    # written on exit when something changed
+"""
+
+import os
+from dataclasses import dataclass
+from io import StringIO
+from logging import getLogger
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import Any
+
+from yaml import YAMLError
+
+from Babylon.utils.yaml_utils import safe_load
+
+logger = getLogger(__name__)
+
+TEMPLATE_SUFFIXES = frozenset({".tpl", ".tmpl", ".template"})
+
+
+class VariablesFileError(ValueError):
+    """A variables file is missing, empty or not valid YAML."""
+
+
+@dataclass(frozen=True)
+class MergedVariables:
+    """Merged content of the variable files; ``duplicates`` maps each key defined more than once to its files."""
+
+    data: dict
+    duplicates: dict[str, list[str]]
+
+
+def _file_signature(path: str) -> tuple[int, int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class VariableStore:
+    """Parse-once cache of the merged variable files.
+
+    Args:
+        files: Variable file paths, in precedence order (later files win).
+    """
+
+    def __init__(self, files: list | None = None):
+        self.files = [str(f) for f in files or []]
+        self._parsed: dict[str, tuple[tuple[int, int, int], dict]] = {}
+        self._merged: tuple[tuple, MergedVariables] | None = None
+        self._lock = Lock()
+
+    def set_files(self, files: list) -> None:
+        with self._lock:
+            self.files = [str(f) for f in files]
+            self._merged = None
+
+    def _load_file(self, path: str) -> tuple[tuple[int, int, int], dict]:
+        if not path.endswith(".yaml"):
+            raise VariablesFileError(f"File '{path}' is not a valid YAML file.")
+        try:
+            signature = _file_signature(path)
+        except OSError as exc:
+            raise VariablesFileError(f"File '{path}' cannot be read: {exc}") from exc
+        cached = self._parsed.get(path)
+        if cached and cached[0] == signature:
+            return cached
+        if signature[1] == 0:
+            raise VariablesFileError(f"File '{path}' is empty.")
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                data = safe_load(file) or {}
+        except YAMLError as exc:
+            raise VariablesFileError(f"File '{path}' is not a valid YAML file. Details: {exc}") from exc
+        if not isinstance(data, dict):
+            raise VariablesFileError(f"File '{path}' must contain a mapping of variables.")
+        self._parsed[path] = (signature, data)
+        return self._parsed[path]
+
+    def merged(self) -> MergedVariables:
+        """Return the merged variables, re-reading only the files that changed.
+
+        The returned ``data`` is a new dict on each call; nested values are shared.
+
+        Raises:
+            VariablesFileError: when a file is not a readable, non-empty YAML mapping.
+        """
+        with self._lock:
+            loaded = [self._load_file(path) for path in self.files]
+            key = tuple((path, signature) for path, (signature, _) in zip(self.files, loaded))
+            if self._merged is None or self._merged[0] != key:
+                data: dict = {}
+                sources: dict[str, list[str]] = {}
+                for path, (_, content) in zip(self.files, loaded):
+                    for name, value in content.items():
+                        sources.setdefault(name, []).append(path)
+                        data[name] = value
+                duplicates = {name: files for name, files in sources.items() if len(files) > 1}
+                self._merged = (key, MergedVariables(data, duplicates))
+                logger.debug(f"  Merged {len(self.files)} variable file(s)")
+            merged = self._merged[1]
+            return MergedVariables(dict(merged.data), merged.duplicates)
+
+
+@dataclass(frozen=True)
+class VariableChange:
+    """One top-level key modified by the editor; ``old`` is ``None`` for a new key."""
+
+    key: str
+    old: Any
+    new: Any
+
+
+def _round_trip_yaml():
+    from ruamel.yaml import YAML
+
+    ry = YAML()
+    ry.preserve_quotes = True
+    ry.width = 4096
+    ry.best_map_flow_style = False
+    return ry
+
+
+def _plain(value: Any) -> Any:
+    """Copy ruamel containers into plain dicts/lists (for change records)."""
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+class VariablesFileEditor:
+    """Load a variables file once, apply updates, write it atomically.
+
+    Args:
+        path: Variables YAML file. Template files (``.tpl``, ``.tmpl``,
+              ``.template``) are refused.
+
+    Raises:
+        FileNotFoundError: when *path* does not exist.
+        ValueError:        when *path* is a template file.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        if self.path.suffix in TEMPLATE_SUFFIXES:
+            raise ValueError(f"Refusing to modify a template file: {self.path}")
+        self._yaml = _round_trip_yaml()
+        self._raw = self.path.read_text(encoding="utf-8")
+        self.data = self._yaml.load(self._raw)
+        if self.data is None:
+            self.data = self._yaml.load("{}")
+        self.changes: list[VariableChange] = []
+
+    def __enter__(self) -> "VariablesFileEditor":
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is None:
+            self.commit()
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.changes)
+
+    def update_entry(self, key: str, values: dict) -> bool:
+        """Merge *values* into the mapping stored under *key*, creating it if needed.
+
+        A key holding a scalar (or nothing) is replaced by *values*.
+
+        Returns:
+            ``True`` when the entry was modified.
+        """
+        entry = self.data.get(key)
+        if isinstance(entry, dict):
+            if all(k in entry and entry[k] == v for k, v in values.items()):
+                return False
+            old = _plain(entry)
+            entry.update(values)
+        else:
+            old = entry
+            self.data[key] = dict(values)
+        self.changes.append(VariableChange(key, old, _plain(self.data[key])))
+        return True
+
+    def render(self) -> str:
+        """Return the file content with all updates applied."""
+        buffer = StringIO()
+        self._yaml.dump(self.data, buffer)
+        return buffer.getvalue()
+
+    def commit(self) -> bool:
+        """Write the file if any update changed it.
+
+        Returns:
+            ``True`` when the file was rewritten.
+
+        Raises:
+            OSError: when the file cannot be written; the original is left intact.
+        """
+        if not self.changes:
+            return False
+        content = self.render()
+        if content == self._raw:
+            return False
+        tmp_name = None
+        try:
+            with NamedTemporaryFile(
+                "w", encoding="utf-8", newline="\n", dir=self.path.parent, prefix=f".{self.path.name}.", delete=False
+            ) as tmp:
+                tmp_name = tmp.name
+                tmp.write(content)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.chmod(tmp_name, self.path.stat().st_mode & 0o777)
+            os.replace(tmp_name, self.path)
+        except OSError:
+            if tmp_name:
+                Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self._raw = content
+        logger.debug(f"  Wrote {len(self.changes)} change(s) to {self.path}")
+        self.changes = []
+        return True
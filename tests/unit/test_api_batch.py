@@ -0,0 +1,111 @@
+import json
+from pathlib import Path
+
+import pytest
+from click import Context, Group, argument, command, option
+from yaml import safe_load
+
+from Babylon.commands.api import batch as batch_module
+from Babylon.commands.api.batch import BatchError, load_operations, resolve_references, run_batch
+from Babylon.utils.decorators import injectcontext
+from Babylon.utils.environment import Environment
+from Babylon.utils.response import CommandResponse
+
+env = Environment()
+
+
+@command()
+@argument("payload_file")
+def create(payload_file) -> CommandResponse:
+    with open(payload_file) as f:
+        payload = safe_load(f)
+    return CommandResponse.success({"id": f"o-{payload['name']}", "name": payload["name"]})
+
+
+@command()
+@option("--oid", "organization_id")
+def get(organization_id) -> CommandResponse:
+    if organization_id == "missing":
+        return CommandResponse.fail()
+    return CommandResponse.success({"id": organization_id, "tags": ["a", "b"]})
+
+
+@command()
+@injectcontext()
+def whoami() -> CommandResponse:
+    return CommandResponse.success({"context": env.context_id, "tenant": env.environ_id})
+
+
+organizations = Group(name="organizations", commands={"create": create, "get": get, "whoami": whoami})
+root = Group(name="api", commands={"organizations": organizations})
+
+
+def _run(operations, concurrency=1, base_dir=Path(".")):
+    with Context(root):
+        return run_batch(root, operations, base_dir, concurrency)
+
+
+def test_resolve_references():
+    outputs = {0: {"id": "o-1", "tags": ["x", "y"]}}
+    keys = {"0": 0, "org": 0}
+    assert resolve_references({"a": "$ops[org].id", "b": ["$ops[0].tags[1]"]}, outputs, keys) == {"a": "o-1", "b": ["y"]}
+    assert resolve_references("id=$ops[0].id", outputs, keys) == "id=o-1"
+    assert resolve_references("$ops[0].tags", outputs, keys) == ["x", "y"]
+    with pytest.raises(BatchError):
+        resolve_references("$ops[0].unknown", outputs, keys)
+
+
+def test_batch_chains_outputs():
+    records = _run(
+        [
+            {"id": "org", "op": "organizations.create", "params": {"payload": {"name": "acme"}}},
+            {"op": "organizations.get", "params": {"organization_id": "$ops[org].id"}},
+        ]
+    )
+    assert [r["status"] for r in records] == ["succeeded", "succeeded"]
+    assert records[1]["data"]["id"] == "o-acme"
+
+
+def test_batch_failure_skips_remaining_operations():
+    records = _run(
+        [
+            {"op": "organizations.get", "params": {"organization_id": "missing"}},
+            {"op": "organizations.get", "params": {"organization_id": "o-1"}},
+        ]
+    )
+    assert [r["status"] for r in records] == ["failed", "skipped"]
+
+
+def test_batch_rejects_forward_references_and_unknown_ops():
+    with pytest.raises(BatchError):
+        _run([{"op": "organizations.get", "params": {"organization_id": "$ops[1].id"}}, {"op": "organizations.get"}])
+    with pytest.raises(BatchError):
+        _run([{"op": "organizations.archive"}])
+
+
+def test_load_operations_jsonl(tmp_path):
+    ops_file = tmp_path / "ops.jsonl"
+    ops_file.write_text("# comment\n" + json.dumps({"op": "organizations.get"}) + "\n\n")
+    assert load_operations(ops_file) == [{"op": "organizations.get"}]
+
+
+def test_batch_fails_cleanly_without_keycloak_credentials(tmp_path, monkeypatch):
+    operations_file = tmp_path / "ops.jsonl"
+    operations_file.write_text('{"op": "organizations.get", "params": {"oid": "o-1"}}\n')
+    monkeypatch.setattr(batch_module, "get_keycloak_token", lambda: None)
+    monkeypatch.setattr(batch_module, "run_batch", lambda *args: pytest.fail("operations must not run"))
+
+    with Context(batch_module.batch):
+        response = batch_module.batch.callback.__wrapped__(operations_file=operations_file, concurrency=1, results_file=None)
+    assert response.has_failed()
+
+
+def test_batch_keeps_the_namespace_given_with_context_and_tenant(tmp_path, monkeypatch):
+    (tmp_path / "namespace.yaml").write_text("context: ctxA\ntenant: tenantA\n")
+    monkeypatch.setattr(env, "state_dir", tmp_path)
+    # What the batch command's own -c ctxB -t tenantB options set before running the operations
+    monkeypatch.setattr(env, "context_id", "ctxB")
+    monkeypatch.setattr(env, "environ_id", "tenantB")
+
+    records = _run([{"op": "organizations.whoami"}, {"op": "organizations.whoami"}], concurrency=2)
+    assert [r["data"] for r in records] == [{"context": "ctxB", "tenant": "tenantB"}] * 2
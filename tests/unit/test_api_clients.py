@@ -0,0 +1,43 @@
+import json
+from base64 import urlsafe_b64encode
+
+from cosmotech_api import OrganizationApi, SolutionApi
+
+from Babylon.utils.api_clients import ApiClientRegistry, get_api, token_identity
+
+API_URL = "https://api.example.com/v5"
+
+
+def _jwt(**claims) -> str:
+    payload = urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip("=")
+    return f"header.{payload}.signature"
+
+
+def test_token_identity_is_stable_across_refresh():
+    first = _jwt(iss="https://kc/realms/r", azp="babylon", sub="u1", exp=1)
+    second = _jwt(iss="https://kc/realms/r", azp="babylon", sub="u1", exp=2)
+    assert token_identity(first) == token_identity(second)
+    assert token_identity(first) != token_identity(_jwt(iss="https://kc/realms/r", azp="other", sub="u2"))
+    assert token_identity("opaque") != token_identity("other-opaque")
+
+
+def test_client_is_shared_and_token_rotated_in_place():
+    registry = ApiClientRegistry(pool_size=4)
+    token = _jwt(iss="kc", azp="babylon", sub="u1", exp=1)
+    client = registry.get(API_URL, token)
+    assert client.configuration.connection_pool_maxsize == 4
+
+    refreshed = _jwt(iss="kc", azp="babylon", sub="u1", exp=2)
+    assert registry.get(API_URL, refreshed) is client
+    assert client.configuration.access_token == refreshed
+
+    rotated = _jwt(iss="kc", azp="babylon", sub="u1", exp=3)
+    registry.rotate(refreshed, rotated)
+    assert client.configuration.access_token == rotated
+    assert registry.get("https://other.example.com", rotated) is not client
+
+
+def test_get_api_shares_one_client_between_api_classes():
+    config = {"api_url": API_URL}
+    token = _jwt(iss="kc", azp="babylon", sub="u1")
+    assert get_api(OrganizationApi, config, token).api_client is get_api(SolutionApi, config, token).api_client
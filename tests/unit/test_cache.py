@@ -0,0 +1,69 @@
+import time
+
+from Babylon.utils import cache
+from Babylon.utils.cache import ConfigCache
+
+KEY = ConfigCache.make_key("ctx", "tenant", "keycloak-babylon")
+
+
+def test_config_cache_memory_only_without_ttl(tmp_path):
+    store = ConfigCache(tmp_path / "config.bin")
+    store.set(KEY, {"url": "https://example.com"})
+    assert store.get(KEY) == {"url": "https://example.com"}
+    assert not (tmp_path / "config.bin").exists()
+    assert ConfigCache(tmp_path / "config.bin").get(KEY) is None
+
+
+def test_config_cache_disk_entries_expire(tmp_path, monkeypatch):
+    ConfigCache(tmp_path / "config.bin", ttl=60, secret=b"k1").set(KEY, {"password": "s3cr3t"})
+    assert b"s3cr3t" not in (tmp_path / "config.bin").read_bytes()
+    assert [p.name for p in tmp_path.iterdir()] == ["config.bin"]
+    assert ConfigCache(tmp_path / "config.bin", ttl=60, secret=b"k1").get(KEY) == {"password": "s3cr3t"}
+    assert ConfigCache(tmp_path / "config.bin", ttl=60, secret=b"k2").get(KEY) is None
+
+    now = time.time()
+    monkeypatch.setattr(cache.time, "time", lambda: now + 61)
+    assert ConfigCache(tmp_path / "config.bin", ttl=60, secret=b"k1").get(KEY) is None
+
+
+def test_config_cache_needs_a_key_to_use_the_disk(tmp_path, monkeypatch):
+    from Babylon.utils import environment
+
+    monkeypatch.setenv(environment.CONFIG_CACHE_TTL_ENV_VAR, "60")
+    monkeypatch.delenv(environment.CONFIG_CACHE_KEY_ENV_VAR, raising=False)
+    assert environment.Environment._get_config_cache_ttl() == 0
+
+    store = ConfigCache(tmp_path / "config.bin", ttl=60)
+    store.set(KEY, {"password": "s3cr3t"})
+    assert not (tmp_path / "config.bin").exists()
+
+    monkeypatch.setenv(environment.CONFIG_CACHE_KEY_ENV_VAR, "from-a-vault")
+    assert environment.Environment._get_config_cache_ttl() == 60
+
+
+def test_refresh_config_reads_each_secret_once(tmp_path, monkeypatch):
+    from base64 import b64encode
+    from types import SimpleNamespace
+
+    from Babylon.utils import environment
+
+    env = environment.Environment()
+    reads = []
+
+    def load_secret(secret_name, tenant):
+        reads.append(secret_name)
+        return SimpleNamespace(data={"url": b64encode(f"https://{len(reads)}".encode()).decode()})
+
+    store = ConfigCache(tmp_path / "config.bin")
+    store.set(ConfigCache.make_key("ctx", "tenant", "keycloak"), {"url": "https://stale"})
+    monkeypatch.setattr(env, "config_cache", store)
+    monkeypatch.setattr(env, "refresh_config", True)
+    monkeypatch.setattr(env, "_refreshed_config_keys", set())
+    monkeypatch.setattr(env, "_get_active_kubectl_context", lambda: "ctx")
+    monkeypatch.setattr(env, "_load_k8s_secret", load_secret)
+    monkeypatch.setattr(environment, "get_api_client", lambda: None)
+
+    assert env.get_config_from_k8s_secret_by_tenant("keycloak", "tenant") == {"url": "https://1"}
+    assert env.get_config_from_k8s_secret_by_tenant("keycloak", "tenant") == {"url": "https://1"}
+    assert env.get_config_from_k8s_secret_by_tenant("superset", "tenant") == {"url": "https://2"}
+    assert reads == ["keycloak", "superset"]
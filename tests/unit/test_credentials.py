@@ -0,0 +1,112 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from Babylon.utils import credentials
+from Babylon.utils.credentials import KeycloakTokenCache
+
+URL = "https://keycloak.example.com/token"
+CREDENTIALS = {"grant_type": "client_credentials", "client_id": "babylon", "client_secret": "s3cr3t", "scope": "openid"}
+
+
+class FakeResponse:
+    def __init__(self, payload: dict):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+@pytest.fixture
+def token_server(monkeypatch):
+    calls = []
+
+    def fake_post(url, data, headers, timeout):
+        calls.append(url)
+        return FakeResponse({"access_token": f"token-{len(calls)}", "expires_in": 300})
+
+    monkeypatch.setattr(credentials.http_client, "post", fake_post)
+    return calls
+
+
+def test_token_is_reused_until_expiry(token_server, monkeypatch):
+    monkeypatch.delenv(credentials.TOKEN_CACHE_ENV_VAR, raising=False)
+    cache = KeycloakTokenCache()
+    assert cache.get(URL, CREDENTIALS) == "token-1"
+    assert cache.get(URL, CREDENTIALS) == "token-1"
+    assert len(token_server) == 1
+
+
+def test_token_is_refreshed_before_expiry(token_server, monkeypatch):
+    monkeypatch.delenv(credentials.TOKEN_CACHE_ENV_VAR, raising=False)
+    cache = KeycloakTokenCache()
+    cache.get(URL, CREDENTIALS)
+    now = time.time()
+    monkeypatch.setattr(credentials.time, "time", lambda: now + 300 - KeycloakTokenCache.REFRESH_MARGIN + 1)
+    assert cache.get(URL, CREDENTIALS) == "token-2"
+
+
+def test_disk_cache_is_shared_between_processes(token_server, monkeypatch, tmp_path):
+    monkeypatch.setenv(credentials.TOKEN_CACHE_ENV_VAR, "true")
+    monkeypatch.setattr(credentials, "ORIGINAL_CONFIG_FOLDER_PATH", tmp_path)
+    assert KeycloakTokenCache().get(URL, CREDENTIALS) == "token-1"
+    # A fresh cache (i.e. a new CLI invocation) reads the encrypted file
+    assert KeycloakTokenCache().get(URL, CREDENTIALS) == "token-1"
+    assert len(token_server) == 1
+    cache_files = list((tmp_path / "cache").iterdir())
+    assert len(cache_files) == 1
+    assert b"token-1" not in cache_files[0].read_bytes()
+
+
+def test_disk_cache_ignored_with_another_secret(token_server, monkeypatch, tmp_path):
+    monkeypatch.setenv(credentials.TOKEN_CACHE_ENV_VAR, "1")
+    monkeypatch.setattr(credentials, "ORIGINAL_CONFIG_FOLDER_PATH", tmp_path)
+    KeycloakTokenCache().get(URL, CREDENTIALS)
+    assert KeycloakTokenCache().get(URL, {**CREDENTIALS, "client_secret": "rotated"}) == "token-2"
+
+
+def test_subscribers_are_notified_on_refresh(token_server, monkeypatch):
+    monkeypatch.delenv(credentials.TOKEN_CACHE_ENV_VAR, raising=False)
+    cache = KeycloakTokenCache()
+    rotations = []
+    cache.subscribe(lambda old, new: rotations.append((old, new)))
+    cache.get(URL, CREDENTIALS)
+    now = time.time()
+    monkeypatch.setattr(credentials.time, "time", lambda: now + 300)
+    cache.get(URL, CREDENTIALS)
+    assert rotations == [("token-1", "token-2")]
+
+
+def test_get_keycloak_token_without_credentials(monkeypatch):
+    monkeypatch.setattr(credentials, "get_keycloak_credentials", lambda: None)
+    assert credentials.get_keycloak_token() is None
+
+
+def test_different_clients_fetch_tokens_in_parallel(monkeypatch):
+    monkeypatch.delenv(credentials.TOKEN_CACHE_ENV_VAR, raising=False)
+    other_client_posted = threading.Event()
+    calls = []
+
+    def fake_post(url, data, headers, timeout):
+        calls.append(data["client_id"])
+        if data["client_id"] == "slow":
+            # Only returns once the other client's request went through: a shared lock would block it
+            assert other_client_posted.wait(timeout=2)
+        else:
+            other_client_posted.set()
+        return FakeResponse({"access_token": f"token-{data['client_id']}", "expires_in": 300})
+
+    monkeypatch.setattr(credentials.http_client, "post", fake_post)
+    cache = KeycloakTokenCache()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        slow = [pool.submit(cache.get, URL, {**CREDENTIALS, "client_id": "slow"}) for _ in range(2)]
+        time.sleep(0.05)
+        fast = pool.submit(cache.get, URL, {**CREDENTIALS, "client_id": "fast"})
+        assert fast.result() == "token-fast"
+        assert [future.result() for future in slow] == ["token-slow", "token-slow"]
+    assert sorted(calls) == ["fast", "slow"]  # concurrent callers of one client share a single request
@@ -0,0 +1,98 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from Babylon.commands.macro.apply import build_deploy_graph
+from Babylon.utils.executor import FAILED, SKIPPED, SUCCEEDED, Node, run_graph, validate_graph
+
+
+def test_run_graph_respects_dependencies():
+    calls = []
+    nodes = [
+        Node(id="a", run=lambda: calls.append("a")),
+        Node(id="b", run=lambda: calls.append("b"), depends_on={"a"}),
+        Node(id="c", run=lambda: calls.append("c"), depends_on={"b"}),
+    ]
+    result = run_graph(nodes, parallelism=4)
+    assert result.ok
+    assert calls == ["a", "b", "c"]
+
+
+def test_run_graph_runs_independent_nodes_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+    nodes = [Node(id="a", run=barrier.wait), Node(id="b", run=barrier.wait)]
+    result = run_graph(nodes, parallelism=2)
+    assert result.ok
+
+
+def test_run_graph_bounds_parallelism():
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.pop()
+
+    run_graph([Node(id=str(i), run=work) for i in range(6)], parallelism=2)
+    assert max(peak) <= 2
+
+
+def test_run_graph_fails_fast_and_skips_dependents():
+    def boom():
+        raise RuntimeError("boom")
+
+    nodes = [
+        Node(id="a", run=boom, order=0),
+        Node(id="b", run=lambda: None, depends_on={"a"}, order=1),
+        Node(id="c", run=lambda: None, order=2),
+    ]
+    result = run_graph(nodes, parallelism=1)
+    assert not result.ok
+    assert result.statuses == {"a": FAILED, "b": SKIPPED, "c": SKIPPED}
+    assert isinstance(result.errors["a"], RuntimeError)
+
+
+def test_run_graph_treats_system_exit_as_failure():
+    def leave():
+        raise SystemExit(1)
+
+    result = run_graph([Node(id="a", run=leave), Node(id="b", run=lambda: None, depends_on={"a"})])
+    assert result.statuses == {"a": FAILED, "b": SKIPPED}
+
+
+def test_validate_graph_detects_cycles():
+    with pytest.raises(ValueError):
+        validate_graph([Node(id="a", run=lambda: None, depends_on={"b"}), Node(id="b", run=lambda: None, depends_on={"a"})])
+
+
+def _resource(kind: str, name: str, content: str = "") -> dict:
+    return {"kind": kind, "namespace": "", "content": content, "file_path": Path(name)}
+
+
+def test_build_deploy_graph_dependencies():
+    resources = [
+        _resource("Webapp", "webapp.yaml", "organization_id: ${services['api.organization_id']}"),
+        _resource("Workspace", "ws1.yaml", "solutionId: ${services['api.solution_id']}"),
+        _resource("Workspace", "ws2.yaml", "solutionId: ${services['api.solution_id']}"),
+        _resource("Solution", "solution.yaml"),
+        _resource("Organization", "organization.yaml"),
+    ]
+    nodes = {n.id: n for n in build_deploy_graph(resources, deploy_dir=Path("."))}
+    assert nodes["Organization:organization.yaml"].depends_on == set()
+    assert nodes["Solution:solution.yaml"].depends_on == {"Organization:organization.yaml"}
+    assert nodes["Workspace:ws1.yaml"].depends_on == {"Organization:organization.yaml", "Solution:solution.yaml"}
+    assert nodes["Workspace:ws2.yaml"].depends_on == {"Organization:organization.yaml", "Solution:solution.yaml", "Workspace:ws1.yaml"}
+    assert nodes["Webapp:webapp.yaml"].depends_on == {"Organization:organization.yaml"}
+
+
+def test_run_graph_statuses_on_success():
+    result = run_graph([Node(id="a", run=lambda: 1)])
+    assert result.statuses == {"a": SUCCEEDED}
+    assert result.results == {"a": 1}
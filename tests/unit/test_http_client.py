@@ -0,0 +1,81 @@
+import pytest
+import requests
+
+from Babylon.utils import http_client
+from Babylon.utils.http_client import RetryPolicy
+from Babylon.utils.http_metrics import metrics
+
+URL = "https://superset.example.com/api/v1/dashboard/"
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers: dict | None = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, outcomes: list):
+        self.outcomes = outcomes
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, kwargs))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def session(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(http_client.time, "sleep", sleeps.append)
+
+    def install(*outcomes):
+        fake = FakeSession(list(outcomes))
+        fake.sleeps = sleeps
+        monkeypatch.setattr(http_client, "get_session", lambda: fake)
+        return fake
+
+    metrics.reset()
+    return install
+
+
+def test_retries_server_errors_then_succeeds(session):
+    fake = session(FakeResponse(502), FakeResponse(200))
+    assert http_client.get(URL).status_code == 200
+    assert len(fake.calls) == 2
+    assert fake.calls[0][1]["timeout"] == http_client.DEFAULT_TIMEOUT
+    counts = {key[3]: series.count for key, series in metrics.snapshot()}
+    assert counts == {"502": 1, "200": 1}
+
+
+def test_honours_retry_after(session):
+    fake = session(FakeResponse(429, {"Retry-After": "7"}), FakeResponse(201))
+    assert http_client.post(URL, json={}).status_code == 201
+    assert fake.sleeps == [7.0]
+
+
+def test_post_is_not_replayed_on_server_error(session):
+    fake = session(FakeResponse(500), FakeResponse(200))
+    assert http_client.post(URL).status_code == 500
+    assert len(fake.calls) == 1
+
+
+def test_connection_errors_raise_after_last_attempt(session):
+    fake = session(*[requests.ConnectionError("down")] * 3)
+    with pytest.raises(requests.ConnectionError):
+        http_client.get(URL, retry=RetryPolicy(attempts=3))
+    assert len(fake.calls) == 3
+    assert [(key, series.count) for key, series in metrics.snapshot()] == [
+        (("superset.example.com", "GET", "/api/v1/dashboard/", "error"), 3)
+    ]
+
+
+def test_backoff_is_bounded():
+    policy = RetryPolicy(backoff=1, max_backoff=5)
+    assert all(0 <= policy.delay(attempt) <= 5 for attempt in range(10))
@@ -0,0 +1,70 @@
+import pytest
+
+from Babylon.utils import http_client
+from Babylon.utils.http_metrics import HttpMetrics, MeteredPoolManager, metrics, route_template
+
+
+@pytest.mark.parametrize(
+    "service, url, expected",
+    [
+        ("cosmotech-api", "https://api/v5/organizations/o-abc123/workspaces/w-9x8y7z?x=1", "/v5/organizations/{id}/workspaces/{id}"),
+        ("superset", "https://ss/api/v1/dashboard/42/embedded", "/api/v1/dashboard/{id}/embedded"),
+        (
+            "kubernetes",
+            "https://k8s/api/v1/namespaces/tenant-a/secrets/babylon-state-dev",
+            "/api/v1/namespaces/{namespace}/secrets/{name}",
+        ),
+        ("kubernetes", "https://k8s/apis/batch/v1/namespaces/tenant-a/jobs", "/apis/batch/v1/namespaces/{namespace}/jobs"),
+    ],
+)
+def test_route_template(service, url, expected):
+    assert route_template(url, service) == expected
+
+
+class FakePoolManager:
+    class Response:
+        status = 200
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.cleared = False
+
+    def request(self, method, url, **kwargs):
+        if self.fail:
+            raise ConnectionError("refused")
+        return self.Response()
+
+    def clear(self):
+        self.cleared = True
+
+
+def test_metered_pool_manager_counts_and_openmetrics():
+    registry = HttpMetrics()
+    pool = MeteredPoolManager(FakePoolManager(), "cosmotech-api", registry)
+    for n in range(3):
+        pool.request("GET", f"https://api/organizations/o-00{n}1")
+    with pytest.raises(ConnectionError):
+        MeteredPoolManager(FakePoolManager(fail=True), "cosmotech-api", registry).request("post", "https://api/organizations")
+    pool.clear()
+    assert pool._pool_manager.cleared
+
+    (top_key, top), (error_key, _) = registry.snapshot()
+    assert top_key == ("cosmotech-api", "GET", "/organizations/{id}", "200") and top.count == 3
+    assert error_key == ("cosmotech-api", "POST", "/organizations", "error")
+
+    text = registry.openmetrics()
+    labels = 'service="cosmotech-api",method="GET",route="/organizations/{id}",status="200"'
+    assert f"babylon_http_requests_total{{{labels}}} 3" in text
+    assert f'babylon_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in text
+    assert text.endswith("# EOF\n")
+
+
+def test_http_client_requests_are_recorded(monkeypatch):
+    class Session:
+        def request(self, method, url, **kwargs):
+            return type("Response", (), {"status_code": 404, "headers": {}})()
+
+    monkeypatch.setattr(http_client, "get_session", Session)
+    metrics.reset()
+    http_client.get("https://superset.example.com/api/v1/chart/7")
+    assert [key for key, _ in metrics.snapshot()] == [("superset.example.com", "GET", "/api/v1/chart/{id}", "404")]
@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from kubernetes.config.config_exception import ConfigException
+
+from Babylon.utils.kubernetes_client import KubernetesClientProvider
+
+
+class CountingLoader:
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, config_file, context, client_configuration):
+        self.calls.append((config_file, context))
+        if self.fail:
+            raise ConfigException("Invalid kube-config file.")
+        client_configuration.host = f"https://{context or 'current'}.example"
+        client_configuration.api_key["BearerToken"] = "Bearer token"
+
+
+def test_kubeconfig_loaded_once_per_path_and_context(monkeypatch):
+    monkeypatch.setenv("KUBECONFIG", "/tmp/kubeconfig")
+    loader = CountingLoader()
+    provider = KubernetesClientProvider(pool_size=4, loader=loader)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        clients = list(pool.map(lambda _: provider.api_client(), range(16)))
+    core = provider.core_v1()
+    batch = provider.batch_v1()
+    other = provider.api_client(context="staging")
+
+    assert loader.calls == [("/tmp/kubeconfig", None), ("/tmp/kubeconfig", "staging")]
+    assert all(c is clients[0] for c in clients)
+    assert core is provider.core_v1() and core.api_client is clients[0]
+    assert batch.api_client is clients[0]
+    assert other is not clients[0] and other.configuration.host == "https://staging.example"
+    assert clients[0].configuration.connection_pool_maxsize == 4
+    provider.clear()
+    provider.api_client()
+    assert len(loader.calls) == 3
+
+
+def test_failed_load_is_retried():
+    loader = CountingLoader(fail=True)
+    provider = KubernetesClientProvider(loader=loader)
+    with pytest.raises(ConfigException):
+        provider.core_v1(config_file="/tmp/missing")
+    loader.fail = False
+    assert provider.core_v1(config_file="/tmp/missing").api_client.configuration.host == "https://current.example"
+    assert len(loader.calls) == 2
@@ -0,0 +1,80 @@
+import threading
+from types import SimpleNamespace
+
+from Babylon.utils.kubernetes_jobs import JOB_COMPLETE, JOB_FAILED, JOB_TIMEOUT, JobWatcher
+
+
+def _job(*conditions):
+    return SimpleNamespace(
+        status=SimpleNamespace(conditions=[SimpleNamespace(type=t, status="True", reason=t, message=m) for t, m in conditions])
+    )
+
+
+def _pod(name, phase="Running"):
+    return SimpleNamespace(metadata=SimpleNamespace(name=name, creation_timestamp=name), status=SimpleNamespace(phase=phase))
+
+
+class FakeApis:
+    """BatchV1Api / CoreV1Api stand-in: job events and pod logs per job name."""
+
+    def __init__(self, events, logs):
+        self.events = events
+        self.logs = logs
+        self.watched = []
+
+    def list_namespaced_job(self, namespace, field_selector, timeout_seconds):
+        name = field_selector.split("=", 1)[1]
+        self.watched.append(threading.current_thread().name)
+        return [{"type": "MODIFIED", "object": job} for job in self.events.get(name, [])]
+
+    def list_namespaced_pod(self, namespace, label_selector):
+        name = label_selector.split("=", 1)[1]
+        return SimpleNamespace(items=[_pod(pod) for pod in self.logs.get(name, {})])
+
+    def read_namespaced_pod_log(self, name, namespace):
+        return next(lines for pods in self.logs.values() for pod, lines in pods.items() if pod == name)
+
+
+class FakeWatch:
+    def stream(self, func, **kwargs):
+        yield from func(**kwargs)
+
+    def stop(self):
+        pass
+
+
+def _watcher(apis, received=None):
+    return JobWatcher(
+        "tenant",
+        batch_api=apis,
+        core_api=apis,
+        on_log=lambda job, line: received.append((job, line)) if received is not None else None,
+        watch_factory=FakeWatch,
+    )
+
+
+def test_wait_returns_terminal_state_and_streams_logs():
+    apis = FakeApis(
+        events={"init": [_job(), _job(("Complete", ""))]},
+        logs={"init": {"init-a": ["INFO: Starting", "SUCCESS: Schema created"]}},
+    )
+    received = []
+    result = _watcher(apis, received).wait("init", timeout=5)
+
+    assert result.status == JOB_COMPLETE and result.succeeded
+    assert result.logs == "INFO: Starting\nSUCCESS: Schema created"
+    assert received == [("init", "INFO: Starting"), ("init", "SUCCESS: Schema created")]
+
+
+def test_wait_all_watches_jobs_concurrently():
+    apis = FakeApis(
+        events={"ok": [_job(("Complete", ""))], "ko": [_job(("Failed", "BackoffLimitExceeded"))]},
+        logs={"ok": {"ok-1": ["done"]}, "ko": {"ko-1": ["ERROR: boom"], "ko-2": ["ERROR: again"]}},
+    )
+    results = _watcher(apis).wait_all({"ok": 5, "ko": 5, "slow": 0.2})
+
+    assert results["ok"].status == JOB_COMPLETE
+    assert results["ko"].status == JOB_FAILED and results["ko"].reason == "BackoffLimitExceeded"
+    assert results["ko"].logs == "ERROR: boom\nERROR: again"
+    assert results["slow"].status == JOB_TIMEOUT
+    assert len(set(apis.watched)) > 1
@@ -0,0 +1,153 @@
+import json
+from base64 import b64encode
+from copy import deepcopy
+from types import SimpleNamespace
+
+import pytest
+from kubernetes.client.exceptions import ApiException
+
+from Babylon.utils import kubernetes_state
+from Babylon.utils.kubernetes_state import (
+    CONTEXT_LABEL,
+    MERGE_PATCH,
+    STATE_HASH_ANNOTATION,
+    STATE_KEY,
+    STATE_META_KEY,
+    STATE_SIZE_ANNOTATION,
+    TENANT_LABEL,
+    UPDATED_AT_ANNOTATION,
+    _decode,
+    _encode,
+    list_state_secrets,
+    retrieve_state_from_kubernetes,
+    save_state_in_kubernetes,
+    update_state_in_kubernetes,
+)
+
+STATE = {
+    "context": "dev",
+    "tenant": "tenant-a",
+    "services": {"api": {"organization_id": "o-1", "workspace_id": "w-1"}, "postgres": {"schema_name": "s1"}},
+}
+
+
+class FakeCoreV1:
+    """Secret storage applying creates and JSON merge-patches like the API server."""
+
+    def __init__(self):
+        self.secret = None
+        self.patches = []
+        self.creates = 0
+
+    def read_namespaced_secret(self, name, namespace):
+        if self.secret is None:
+            raise ApiException(status=404, reason="Not Found")
+        return deepcopy(self.secret)
+
+    def create_namespaced_secret(self, namespace, body):
+        self.creates += 1
+        self.secret = SimpleNamespace(
+            metadata=SimpleNamespace(annotations=dict(body.metadata.annotations), resource_version="1"), data=dict(body.data)
+        )
+
+    def patch_namespaced_secret(self, name, namespace, body, _content_type):
+        assert _content_type == MERGE_PATCH
+        if body["metadata"]["resourceVersion"] != self.secret.metadata.resource_version:
+            raise ApiException(status=409, reason="Conflict")
+        self.patches.append(body)
+        self.secret.metadata.annotations = {**(self.secret.metadata.annotations or {}), **body["metadata"]["annotations"]}
+        self.secret.metadata.resource_version = str(int(self.secret.metadata.resource_version) + 1)
+        for key, value in body["data"].items():
+            if value is None:
+                self.secret.data.pop(key, None)
+            else:
+                self.secret.data[key] = value
+
+
+@pytest.fixture
+def v1(monkeypatch):
+    fake = FakeCoreV1()
+    monkeypatch.setattr(kubernetes_state, "_core_v1", lambda: fake)
+    return fake
+
+
+def test_payload_is_compressed_and_legacy_yaml_still_decodes():
+    big = {"services": {"api": {"key": "x" * 5000}}}
+    assert len(_encode(big)) < 500
+    assert _decode(_encode(big)) == big
+    assert _decode(b64encode(b"context: dev\n").decode()) == {"context": "dev"}
+
+
+def test_unchanged_state_is_not_written_and_changes_patch_only_modified_keys(v1):
+    save_state_in_kubernetes("ns", "babylon-state-dev", STATE)
+    assert v1.creates == 1 and set(v1.secret.data) == {STATE_META_KEY, "services.api", "services.postgres"}
+
+    save_state_in_kubernetes("ns", "babylon-state-dev", deepcopy(STATE))
+    assert v1.patches == []
+
+    changed = deepcopy(STATE)
+    changed["services"]["postgres"]["schema_name"] = "s2"
+    del changed["services"]["api"]
+    save_state_in_kubernetes("ns", "babylon-state-dev", changed)
+    (patch,) = v1.patches
+    assert set(patch["data"]) == {"services.postgres", "services.api"}
+    assert patch["data"]["services.api"] is None
+    assert v1.secret.metadata.annotations[STATE_HASH_ANNOTATION] == patch["metadata"]["annotations"][STATE_HASH_ANNOTATION]
+    assert retrieve_state_from_kubernetes("ns", "babylon-state-dev") == changed
+
+
+def test_legacy_secret_is_read_and_converted(v1):
+    legacy = b64encode(b"context: dev\nservices:\n  api:\n    organization_id: o-1\n").decode()
+    v1.secret = SimpleNamespace(metadata=SimpleNamespace(annotations=None, resource_version="7"), data={STATE_KEY: legacy})
+
+    def mutate(state):
+        state["services"]["api"]["workspace_id"] = "w-1"
+        return state
+
+    update_state_in_kubernetes("ns", "babylon-state-dev", mutate)
+    assert v1.patches[0]["data"][STATE_KEY] is None
+    assert STATE_KEY not in v1.secret.data
+    assert retrieve_state_from_kubernetes("ns", "babylon-state-dev") == {
+        "context": "dev",
+        "services": {"api": {"organization_id": "o-1", "workspace_id": "w-1"}},
+    }
+
+
+class FakeResponse:
+    def __init__(self, page):
+        self.data = json.dumps(page).encode()
+
+
+def test_state_secrets_are_listed_by_page_from_metadata(v1, monkeypatch):
+    save_state_in_kubernetes("t1", "babylon-state-dev-t1", {**STATE, "tenant": "t1"})
+    created = v1.secret.metadata.annotations
+    pages = {
+        None: {
+            "metadata": {"continue": "page-2"},
+            "items": [
+                {
+                    "metadata": {
+                        "namespace": "t1",
+                        "name": "babylon-state-dev-t1",
+                        "annotations": created,
+                        "labels": {CONTEXT_LABEL: "dev", TENANT_LABEL: "t1"},
+                    }
+                }
+            ],
+        },
+        "page-2": {"metadata": {}, "items": [{"metadata": {"namespace": "t2", "name": "babylon-state-prod-t2"}}]},
+    }
+    calls = []
+
+    def list_secret_for_all_namespaces(_continue, label_selector, limit, _preload_content, _headers):
+        calls.append((_continue, limit))
+        assert "PartialObjectMetadataList" in _headers["Accept"]
+        return FakeResponse(pages[_continue])
+
+    v1.list_secret_for_all_namespaces = list_secret_for_all_namespaces
+    first, second = list_state_secrets(page_size=1)
+
+    assert calls == [(None, 1), ("page-2", 1)]
+    assert (first.context, first.tenant, first.size) == ("dev", "t1", int(created[STATE_SIZE_ANNOTATION]))
+    assert first.updated_at == created[UPDATED_AT_ANNOTATION]
+    assert (second.context, second.tenant, second.updated_at, second.size) == ("prod", "t2", "", None)
@@ -1,10 +1,15 @@
+import time
+
 import pytest
 from click import Abort
+from cosmotech_api.exceptions import ApiException
 from cosmotech_api.models.organization_access_control import OrganizationAccessControl
+from cosmotech_api.models.organization_security import OrganizationSecurity
 from cosmotech_api.models.solution_access_control import SolutionAccessControl
 from cosmotech_api.models.workspace_access_control import WorkspaceAccessControl
 
-from Babylon.commands.macro.helpers.common import diff, resolve_inclusion_exclusion
+from Babylon.commands.macro.helpers.common import AclChange, diff, resolve_inclusion_exclusion, update_object_security
+from Babylon.utils.http_client import RetryPolicy
 
 
 def test_organization_diff():
@@ -101,3 +106,90 @@ def test_resolve_inclusion_exclusion_partial_exclude_mixed():
 def test_resolve_inclusion_exclusion_conflicting_filters_variation():
     with pytest.raises(Abort):
         resolve_inclusion_exclusion(include=("solution", "workspace"), exclude=("organization",))
+
+
+class FakeOrganizationApi:
+    def __init__(self, failures: dict | None = None):
+        self.calls = []
+        self.failures = failures or {}
+
+    def _call(self, name, *args):
+        self.calls.append((name, *args))
+        failure = self.failures.get((name, args[1] if len(args) > 1 else None))
+        if failure:
+            raise failure.pop(0) if isinstance(failure, list) else failure
+
+    def update_organization_default_security(self, organization_id, role):
+        self._call("default", organization_id, role)
+
+    def create_organization_access_control(self, organization_id, entry):
+        self._call("create", organization_id, entry.id)
+
+    def update_organization_access_control(self, organization_id, identity_id, role):
+        self._call("update", organization_id, identity_id)
+
+    def delete_organization_access_control(self, organization_id, identity_id):
+        self._call("delete", organization_id, identity_id)
+
+
+def _security(default: str, *entries: tuple[str, str]) -> OrganizationSecurity:
+    return OrganizationSecurity.from_dict(
+        {"default": default, "accessControlList": [{"id": identity, "role": role} for identity, role in entries]}
+    )
+
+
+def test_update_object_security_no_changes_makes_no_calls():
+    api = FakeOrganizationApi()
+    current = _security("none", ("toto@cosmotech.com", "admin"), ("tata@cosmotech.com", "reader"))
+    desired = _security("none", ("tata@cosmotech.com", "reader"), ("toto@cosmotech.com", "admin"))
+    report = update_object_security("organization", current, desired, api, ["o-1"])
+    assert api.calls == []
+    assert report.ok and report.applied == [] and report.skipped == []
+
+
+def test_update_object_security_applies_diff_in_parallel_with_retries(monkeypatch):
+    monkeypatch.setattr("Babylon.commands.macro.helpers.common.time.sleep", lambda _: None)
+    users = [f"user{n}@cosmotech.com" for n in range(20)]
+    current = _security("none", *[(user, "reader") for user in users], ("gone@cosmotech.com", "admin"))
+    desired = _security(
+        "viewer",
+        *[(user, "writer" if n % 2 else "reader") for n, user in enumerate(users)],
+        ("new@cosmotech.com", "admin"),
+        ("new@cosmotech.com", "reader"),
+        ("broken@cosmotech.com", "admin"),
+    )
+    api = FakeOrganizationApi(
+        {
+            ("update", users[1]): [ApiException(status=503)],
+            ("create", "broken@cosmotech.com"): ApiException(status=500),
+        }
+    )
+    report = update_object_security("organization", current, desired, api, ["o-1"], max_workers=4, retry=RetryPolicy(attempts=3))
+
+    assert len(report.applied) == 1 + 1 + 10 + 1  # default, create, updates, delete
+    assert [(change.action, change.id) for change, _ in report.failed] == [("create", "broken@cosmotech.com")]
+    assert report.skipped == [AclChange("create", "new@cosmotech.com", "reader")]
+    assert not report.ok
+    assert sum(1 for call in api.calls if call[:3] == ("update", "o-1", users[1])) == 2  # retried once after the 503
+    assert sum(1 for call in api.calls if call[0] == "create" and call[2] == "broken@cosmotech.com") == 1  # creates are not replayed
+    assert ("delete", "o-1", "gone@cosmotech.com") in api.calls
+
+
+def test_update_object_security_deletes_after_creates_and_updates():
+    events = []
+
+    class SlowApi(FakeOrganizationApi):
+        def _call(self, name, *args):
+            events.append(("start", name))
+            if name != "delete":
+                time.sleep(0.01)
+            super()._call(name, *args)
+            events.append(("end", name))
+
+    current = _security("none", ("old-admin@cosmotech.com", "admin"), ("toto@cosmotech.com", "reader"))
+    desired = _security("none", ("new-admin@cosmotech.com", "admin"), ("toto@cosmotech.com", "writer"))
+    report = update_object_security("organization", current, desired, SlowApi(), ["o-1"], max_workers=4)
+
+    assert report.ok and len(report.applied) == 3
+    first_delete = events.index(("start", "delete"))
+    assert ("end", "create") in events[:first_delete] and ("end", "update") in events[:first_delete]
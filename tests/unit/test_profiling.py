@@ -0,0 +1,48 @@
+import json
+import threading
+import time
+
+from Babylon.utils.profiling import Profiler, finish_profiling, profiler, traced
+
+
+def test_nested_spans_self_time_and_chrome_trace(tmp_path):
+    p = Profiler()
+    p.enable()
+    with p.span("apply", "macro"):
+        with p.span("template.render", "template"):
+            time.sleep(0.01)
+        with p.span("api.create", "api", kind="Organization"):
+            time.sleep(0.01)
+
+    phases = {phase.name: phase for phase in p.phases()}
+    children_ns = phases["template.render"].total_ns + phases["api.create"].total_ns
+    assert next(iter(phases)) == "apply"
+    assert phases["apply"].calls == 1
+    assert phases["apply"].self_ns == phases["apply"].total_ns - children_ns
+
+    trace = tmp_path / "trace.json"
+    p.write_trace(trace)
+    events = json.loads(trace.read_text())["traceEvents"]
+    complete = [e for e in events if e["ph"] == "X"]
+    assert [e["name"] for e in complete] == ["apply", "template.render", "api.create"]
+    assert complete[2]["args"] == {"kind": "Organization"}
+    assert [e["args"]["name"] for e in events if e["ph"] == "M"] == [threading.current_thread().name]
+
+
+def test_traced_records_only_when_enabled(tmp_path, capsys):
+    @traced("phase.work", "test")
+    def work(value):
+        return value * 2
+
+    assert work(2) == 4
+    assert all(s.name != "phase.work" for s in profiler.spans)
+
+    profiler.enable()
+    try:
+        assert work(3) == 6
+        assert [s.name for s in profiler.spans] == ["phase.work"]
+    finally:
+        finish_profiling(tmp_path / "trace.json")
+    assert not profiler.enabled
+    assert "phase.work" in capsys.readouterr().out
+    assert (tmp_path / "trace.json").exists()
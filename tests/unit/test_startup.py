@@ -0,0 +1,30 @@
+import subprocess
+import sys
+
+# Cumulative import time of Babylon.main, in seconds. Importing every command
+# eagerly took about 3 s; lazy loading brings it to about 0.2 s.
+STARTUP_BUDGET = 1.0
+HEAVY_PACKAGES = {"kubernetes", "cosmotech_api", "azure", "mako", "ruamel", "flatten_json", "requests"}
+
+
+def _run(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+
+
+def test_help_does_not_import_command_modules_or_sdks():
+    code = (
+        "import sys\n"
+        "from Babylon.main import main\n"
+        "main(['namespace', '--help'], standalone_mode=False)\n"
+        "print(','.join(sorted({m.split('.')[0] for m in sys.modules} | {m for m in sys.modules if m.startswith('Babylon.')})))\n"
+    )
+    modules = set(_run(code).stdout.strip().splitlines()[-1].split(","))
+    assert not modules & HEAVY_PACKAGES
+    assert not {m for m in modules if m.startswith("Babylon.commands.")} - {"Babylon.commands.namespace"}
+
+
+def test_import_time_is_within_budget():
+    stderr = _run("import Babylon.main").stderr
+    line = next(line for line in stderr.splitlines() if line.rstrip().endswith("| Babylon.main"))
+    cumulative_us = int(line.split("|")[1])
+    assert cumulative_us / 1e6 < STARTUP_BUDGET, f"Babylon.main imports in {cumulative_us / 1e6:.2f}s"
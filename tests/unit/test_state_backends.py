@@ -0,0 +1,66 @@
+import os
+import time
+
+from Babylon.utils.state_backends import (
+    LOCAL_STATE_BACKEND_ENV_VAR,
+    SqliteStateBackend,
+    StateBackend,
+    YamlFileBackend,
+    local_state_backend,
+)
+
+
+def _state(workspace_id: str) -> dict:
+    return {"context": "dev", "tenant": "t1", "services": {"api": {"workspace_id": workspace_id}}}
+
+
+def test_sqlite_versions_listing_and_rollback(tmp_path):
+    backend = SqliteStateBackend(tmp_path / "states.db", history=3)
+    assert isinstance(backend, StateBackend)
+    assert backend.load("dev", "t1") is None
+
+    assert backend.save("dev", "t1", _state("w-1")) == 1
+    assert backend.save("dev", "t1", _state("w-1")) == 1  # unchanged: no new version
+    for n in range(2, 5):
+        backend.save("dev", "t1", _state(f"w-{n}"))
+    backend.save("prod", "t2", _state("p-1"))
+
+    assert backend.load("dev", "t1") == _state("w-4")
+    assert [e.version for e in backend.history_of("dev", "t1")] == [4, 3, 2]
+    assert [(e.context, e.tenant, e.version) for e in backend.list_states()] == [("dev", "t1", 4), ("prod", "t2", 1)]
+
+    assert backend.rollback("dev", "t1", 2) == 5
+    assert backend.load("dev", "t1") == _state("w-2")
+    assert backend.load("dev", "t1", version=4) == _state("w-4")
+
+
+def test_sqlite_lists_yaml_states_right_after_upgrade(tmp_path):
+    YamlFileBackend(tmp_path).save("dev", "t1", _state("w-1"))
+    YamlFileBackend(tmp_path).save("prod", "t2", _state("p-1"))
+
+    backend = local_state_backend(tmp_path)
+    assert [(e.context, e.tenant, e.version) for e in backend.list_states()] == [("dev", "t1", 1), ("prod", "t2", 1)]
+    assert backend.load("dev", "t1") == _state("w-1")
+
+
+def test_sqlite_imports_yaml_states_written_after_switching_back(tmp_path):
+    SqliteStateBackend(tmp_path / "states.db", import_from=tmp_path).save("dev", "t1", _state("w-1"))
+    yaml_file = YamlFileBackend(tmp_path).path("dev", "t1")
+    YamlFileBackend(tmp_path).save("dev", "t1", _state("stale"))
+    os.utime(yaml_file, (0, 0))  # older than the database version: ignored
+    assert SqliteStateBackend(tmp_path / "states.db", import_from=tmp_path).load("dev", "t1") == _state("w-1")
+
+    YamlFileBackend(tmp_path).save("dev", "t1", _state("w-2"))
+    os.utime(yaml_file, (time.time() + 5, time.time() + 5))  # written with the yaml backend later on
+    backend = SqliteStateBackend(tmp_path / "states.db", import_from=tmp_path)
+    assert backend.load("dev", "t1") == _state("w-2")
+    assert [e.version for e in backend.history_of("dev", "t1")] == [2, 1]
+
+
+def test_local_backend_selection(tmp_path, monkeypatch):
+    assert isinstance(local_state_backend(tmp_path), SqliteStateBackend)
+    monkeypatch.setenv(LOCAL_STATE_BACKEND_ENV_VAR, "yaml")
+    backend = local_state_backend(tmp_path)
+    backend.save("dev", "t1", _state("w-1"))
+    assert (tmp_path / "state.dev.t1.yaml").exists()
+    assert [(e.context, e.tenant) for e in backend.list_states()] == [("dev", "t1")]
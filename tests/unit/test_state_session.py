@@ -0,0 +1,118 @@
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from threading import RLock
+
+from Babylon.utils import state_session
+from Babylon.utils.state_session import StateSession
+
+
+class FakeEnv:
+    def __init__(self, state: dict, remote: bool = False):
+        self.remote = remote
+        self.environ_id = "tenant"
+        self.state_lock = RLock()
+        self.state_session = None
+        self.loaded = state
+        self.stored = []
+
+    def retrieve_state_func(self):
+        return self.loaded
+
+    def store_state_in_local(self, state):
+        self.stored.append(state)
+
+    def state_secret_name(self):
+        return "babylon-state-ctx-tenant"
+
+
+def _state():
+    return {"context": "ctx", "services": {"api": {"organization_id": "o-1", "solution_id": ""}}}
+
+
+def test_flush_is_noop_when_state_unchanged():
+    env = FakeEnv(_state())
+    with StateSession(env):
+        pass
+    assert env.stored == []
+    assert env.state_session is None
+
+
+def test_updates_flush_once_at_close():
+    env = FakeEnv(_state())
+    with StateSession(env) as session:
+        assert env.state_session is session
+        session.state["services"]["api"]["organization_id"] = "o-2"
+        session.checkpoint()
+        session.state["context"] = "ctx-2"
+        session.checkpoint()
+        assert env.stored == []
+    assert len(env.stored) == 1
+
+
+def test_created_ids_flush_at_checkpoint():
+    env = FakeEnv(_state())
+    with StateSession(env) as session:
+        session.state["services"]["api"]["solution_id"] = "sol-1"
+        session.checkpoint()
+        assert len(env.stored) == 1
+        session.state["services"]["api"]["workspace_id"] = "w-1"
+        session.checkpoint()
+        assert len(env.stored) == 2
+    assert len(env.stored) == 2
+
+
+def test_checkpoint_every_flushes_periodically():
+    env = FakeEnv(_state())
+    with StateSession(env, checkpoint_every=1) as session:
+        session.state["services"]["api"]["solution_id"] = "sol-1"
+        session.checkpoint()
+        assert len(env.stored) == 1
+    assert len(env.stored) == 1
+
+
+def test_dirty_keys_reports_changes_and_deletions():
+    env = FakeEnv(_state())
+    session = StateSession(env)
+    session.open()
+    session.state["services"]["api"]["solution_id"] = "sol-1"
+    del session.state["context"]
+    changes = session.dirty_keys()
+    assert changes[("services", "api", "solution_id")] == "sol-1"
+    assert ("context",) in changes
+    assert len(changes) == 2
+
+
+def test_remote_flush_merges_only_dirty_keys(monkeypatch):
+    env = FakeEnv(_state(), remote=True)
+    remote = {"context": "ctx", "services": {"api": {"organization_id": "o-1", "solution_id": "", "workspace_id": "w-other"}}}
+    written = {}
+
+    def fake_update(namespace, secret_name, mutate):
+        written.update(mutate(remote))
+
+    monkeypatch.setattr(state_session, "update_state_in_kubernetes", fake_update)
+    with StateSession(env) as session:
+        session.state["services"]["api"]["solution_id"] = "sol-1"
+    assert written["services"]["api"] == {"organization_id": "o-1", "solution_id": "sol-1", "workspace_id": "w-other"}
+
+
+def test_parallel_state_writes_and_flushes_do_not_race():
+    from Babylon.utils.environment import Environment
+
+    env = Environment()
+    state = {"services": {"api": {}}}
+
+    def write(worker: int):
+        for n in range(300):
+            env.set_state_value(state, ("services", f"worker{worker}", f"key{n}"), n)
+
+    def read(_):
+        for _ in range(300):
+            with env.state_lock:
+                state_session._flatten(deepcopy(state))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(write, worker) for worker in range(3)] + [pool.submit(read, None)]
+    for future in futures:
+        future.result()
+    assert state["services"]["worker2"]["key299"] == 299
@@ -0,0 +1,25 @@
+from Babylon.utils.string import UUID_PATTERN, MultiReplacer
+
+
+def test_multi_replacer_single_pass_and_counts():
+    replacer = MultiReplacer({"aaaa-1": "bbbb-2", "bbbb-2": "cccc-3"})
+    # Replacements are not chained: each match is rewritten once
+    assert replacer.subn("x aaaa-1 y bbbb-2") == ("x bbbb-2 y cccc-3", 2)
+
+
+def test_multi_replacer_ignore_case_and_longest_match():
+    replacer = MultiReplacer({"abc": "1", "abcdef": "2"}, ignore_case=True)
+    assert replacer.sub("ABCDEF abc AbC") == "2 1 1"
+
+
+def test_empty_multi_replacer_is_noop():
+    replacer = MultiReplacer({})
+    assert not replacer
+    assert replacer.subn("unchanged") == ("unchanged", 0)
+
+
+def test_multi_replacer_token_mode_leaves_unknown_tokens():
+    old = "0f0e0d0c-1111-2222-3333-444444444444"
+    other = "99999999-1111-2222-3333-444444444444"
+    replacer = MultiReplacer({old: "new-uuid"}, ignore_case=True, token=UUID_PATTERN)
+    assert replacer.subn(f"{old.upper()} {other} {old}") == (f"new-uuid {other} new-uuid", 2)
@@ -0,0 +1,80 @@
+from Babylon.commands.macro.helpers.workspace import superset_client
+from Babylon.commands.macro.helpers.workspace.superset_client import SupersetAssetIndex, SupersetSession, to_rison
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+def test_to_rison():
+    query = {"page": 0, "page_size": 100, "columns": ["id", "uuid"], "order_direction": "desc", "name": "It's 1!"}
+    assert to_rison(query) == "(page:0,page_size:100,columns:!(id,uuid),order_direction:desc,name:'It!'s 1!!')"
+
+
+def test_index_pages_through_all_results_and_updates_after_import(monkeypatch):
+    dashboards = [{"id": i, "uuid": f"UUID-{i}"} for i in range(250)]
+    queries = []
+
+    def fake_get(url, headers, params, timeout):
+        queries.append(params["q"])
+        page = int(params["q"].split("page:")[1].split(",")[0])
+        return FakeResponse({"count": len(dashboards), "result": dashboards[page * 100 : (page + 1) * 100]})
+
+    monkeypatch.setattr(superset_client.http_client, "get", fake_get)
+    index = SupersetAssetIndex("https://superset.example.com/", "jwt")
+    assert index.existing("dashboards", {"uuid-0", "uuid-249", "uuid-999"}) == {"uuid-0", "uuid-249"}
+    assert len(queries) == 3
+    assert "columns:!(id,uuid,dashboard_title,slug)" in queries[0]
+
+    # A later lookup uses the index; an import reads recent pages until the new UUIDs are found
+    assert index.existing("dashboards", {"uuid-1"}) == {"uuid-1"}
+    dashboards.insert(0, {"id": 999, "uuid": "uuid-new"})
+    index.record_import("dashboards", {"uuid-new"})
+    assert len(queries) == 4
+    assert "order_direction:desc" in queries[-1]
+    assert index.assets("dashboards")["uuid-new"]["id"] == 999
+
+
+class FakeHttpResponse(FakeResponse):
+    def __init__(self, status_code=200, payload=None, text=""):
+        super().__init__(payload or {})
+        self.status_code = status_code
+        self.text = text
+        self.cookies = {}
+
+
+def test_session_reuses_csrf_token_and_refreshes_on_rejection(monkeypatch):
+    calls = []
+    rejections = {"csrf": 1, "auth": 1}
+
+    def fake_request(method, url, headers, cookies, **kwargs):
+        calls.append((method, url.rsplit("/api/v1", 1)[1], headers.get("Authorization"), headers.get("X-CSRFToken")))
+        if url.endswith("/csrf_token/"):
+            return FakeHttpResponse(payload={"result": f"csrf-{len(calls)}"})
+        if method == "POST" and url.endswith("/2/embedded") and rejections["csrf"]:
+            rejections["csrf"] -= 1
+            return FakeHttpResponse(400, text='{"errors": "The CSRF token has expired."}')
+        if method == "GET" and rejections["auth"]:
+            rejections["auth"] -= 1
+            return FakeHttpResponse(401)
+        return FakeHttpResponse()
+
+    monkeypatch.setattr(superset_client.http_client, "request", fake_request)
+    session = SupersetSession("https://superset.example.com", "jwt-1", refresh_jwt=lambda: "jwt-2")
+
+    assert session.post("/api/v1/dashboard/1/embedded", json={}).status_code == 200
+    assert session.post("/api/v1/dashboard/2/embedded", json={}).status_code == 200
+    csrf_fetches = [call for call in calls if call[1] == "/security/csrf_token/"]
+    assert len(csrf_fetches) == 2  # first use, then after the CSRF rejection
+    assert calls[-1][3] == "csrf-4"
+
+    assert session.get("/api/v1/dashboard/1/embedded").status_code == 200
+    assert [call[2] for call in calls[-2:]] == ["Bearer jwt-1", "Bearer jwt-2"]
+    assert session.superset_jwt == "jwt-2"
@@ -0,0 +1,124 @@
+import threading
+import time
+from pathlib import Path
+from zipfile import ZIP_DEFLATED, ZipFile
+
+from Babylon.commands.macro.helpers.workspace import superset_helper
+
+
+def test_zips_are_processed_concurrently_and_aggregated(monkeypatch, tmp_path):
+    monkeypatch.setattr(superset_helper, "_setup_database_and_csrf", lambda *args: ("csrf", "db-uuid", "postgresql://"))
+    active, peak, seen = [], [], []
+    lock = threading.Lock()
+
+    def fake_process(report, **kwargs):
+        with lock:
+            active.append(report["name"])
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(report["name"])
+            seen.append(report["name"])
+        return report["name"] != "broken", {f"uuid-{report['name']}"}
+
+    monkeypatch.setattr(superset_helper, "_process_dashboard_zip", fake_process)
+    reports = [{"name": name, "path": f"{name}.zip"} for name in ("a", "b", "c", "broken")]
+
+    ok, uuids = superset_helper.deploy_superset_multiple_assets(
+        superset_token="jwt",
+        reports=reports,
+        state={"services": {"api": {"workspace_id": "w-1"}}},
+        superset_config={"superset_url": "https://superset.example.com"},
+        deploy_dir=Path(tmp_path),
+        max_workers=3,
+    )
+
+    assert not ok
+    assert uuids == {"uuid-a", "uuid-b", "uuid-c", "uuid-broken"}
+    assert 1 < max(peak) <= 3
+    assert sorted(seen) == ["a", "b", "broken", "c"]
+
+
+DATASET_UUID = "11111111-2222-3333-4444-555555555555"
+DASHBOARD_UUID = "aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee"
+DB_UUID = "99999999-8888-7777-6666-555555555555"
+
+
+def _export_zip(path: Path) -> Path:
+    members = {
+        "metadata.yaml": "version: 1.0.0\ntype: Dashboard\n",
+        "databases/db.yaml": f"database_name: old\nsqlalchemy_uri: postgresql://old\nuuid: {DB_UUID}\n",
+        "datasets/db/table.yaml": f"table_name: t\nschema: old_schema\nuuid: {DATASET_UUID}\ndatabase_uuid: {DB_UUID}\n",
+        "dashboards/board.yaml": f"dashboard_title: Board\nuuid: {DASHBOARD_UUID}\ndataset: {DATASET_UUID.upper()}\n",
+        "charts/unchanged.txt": "not yaml",
+    }
+    with ZipFile(path, "w", compression=ZIP_DEFLATED) as zf:
+        for name, content in members.items():
+            zf.writestr(f"export_20240101/{name}", content)
+    return path
+
+
+def test_bundle_is_patched_in_memory(monkeypatch, tmp_path):
+    zip_path = _export_zip(tmp_path / "board.zip")
+    source_bytes = zip_path.read_bytes()
+    imported = {}
+
+    def fake_import(base_url, jwt, csrf, bundle, bundle_name):
+        imported["name"] = bundle_name
+        imported["data"] = bundle.read()
+        return True
+
+    monkeypatch.setattr(superset_helper, "_assets_exist_in_superset", lambda *args: {"datasets": False, "dashboards": False})
+    monkeypatch.setattr(superset_helper, "_import_zip_to_superset", fake_import)
+    monkeypatch.setattr(superset_helper.env, "environ_id", "tenant", raising=False)
+
+    ok, new_uuids = superset_helper._process_dashboard_zip(
+        report={"name": "board", "path": "board.zip"},
+        abs_deploy_dir=tmp_path,
+        base_url="https://superset.example.com",
+        superset_token="jwt",
+        csrf_token="csrf",
+        sqlalchemy_uri="postgresql://new",
+        db_uuid="12345678-1234-1234-1234-123456789012",
+        schema_name="w_1",
+    )
+
+    assert ok
+    assert zip_path.read_bytes() == source_bytes
+    tmp_copy = tmp_path / "imported.zip"
+    tmp_copy.write_bytes(imported["data"])
+    with ZipFile(tmp_copy) as zf:
+        assert zf.testzip() is None
+        files = {info.filename: zf.read(info).decode() for info in zf.infolist()}
+    assert set(files) == {
+        f"board/{name}"
+        for name in ("metadata.yaml", "databases/db.yaml", "datasets/db/table.yaml", "dashboards/board.yaml", "charts/unchanged.txt")
+    }
+    assert "type: assets" in files["board/metadata.yaml"]
+    assert "sqlalchemy_uri: postgresql://new" in files["board/databases/db.yaml"]
+    dataset = files["board/datasets/db/table.yaml"]
+    assert "schema: w_1" in dataset and DATASET_UUID not in dataset
+    assert "database_uuid: 12345678-1234-1234-1234-123456789012" in dataset
+    dashboard = files["board/dashboards/board.yaml"]
+    assert DASHBOARD_UUID not in dashboard and DATASET_UUID.upper() not in dashboard
+    assert new_uuids and DASHBOARD_UUID not in new_uuids
+    assert files["board/charts/unchanged.txt"] == "not yaml"
+
+
+def test_bundle_rewrite_keeps_unchanged_member_metadata(tmp_path):
+    from zipfile import ZIP_STORED, ZipInfo
+
+    from Babylon.commands.macro.helpers.workspace.superset_bundle import SupersetBundle
+
+    zip_path = tmp_path / "export.zip"
+    with ZipFile(zip_path, "w") as zf:
+        info = ZipInfo("export/charts/logo.png", date_time=(2020, 1, 2, 3, 4, 6))
+        info.compress_type = ZIP_STORED
+        zf.writestr(info, b"\x89PNG")
+        zf.writestr("export/metadata.yaml", "version: 1.0.0\n")
+
+    with SupersetBundle(zip_path) as bundle, ZipFile(bundle.rewrite(lambda name, text: text, root_name="board")) as out:
+        assert out.testzip() is None
+        logo = out.getinfo("board/charts/logo.png")
+        assert (logo.date_time, logo.compress_type, out.read(logo)) == ((2020, 1, 2, 3, 4, 6), ZIP_STORED, b"\x89PNG")
+        assert out.read("board/metadata.yaml") == b"version: 1.0.0\n"
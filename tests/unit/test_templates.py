@@ -0,0 +1,35 @@
+import json
+
+import flatten_json
+from flatten_json import flatten
+
+from Babylon.utils.templates import StateFlattener, TemplateCache
+from Babylon.utils.yaml_utils import yaml_to_dict, yaml_to_json
+
+
+def test_template_cache_compiles_once_and_reuses_module_files(tmp_path):
+    cache = TemplateCache(tmp_path)
+    template = cache.get("name: ${name}\n")
+    assert cache.get("name: ${name}\n") is template
+    assert template.render(name="é") == "name: é\n"
+    assert len(list((tmp_path / "modules").glob("*.py"))) == 1
+
+    # A new process reloads the generated module
+    assert TemplateCache(tmp_path).get("name: ${name}\n").render(name="x") == "name: x\n"
+
+
+def test_state_flattener_matches_flatten_and_only_reflattens_changed_services(monkeypatch):
+    services = {"api": {"organization_id": "o-1", "ids": [1, 2]}, "postgres": {}, "webapp": {"url": "u"}}
+    flattener = StateFlattener()
+    assert flattener.flatten(services) == flatten(services, separator=".")
+
+    calls = []
+    monkeypatch.setattr(flatten_json, "flatten", lambda value, separator: calls.append(value) or flatten(value, separator=separator))
+    services["api"]["workspace_id"] = "w-1"
+    assert flattener.flatten(services) == flatten(services, separator=".")
+    assert calls == [{"api": services["api"]}]
+
+
+def test_yaml_to_dict_matches_json_round_trip():
+    text = "a: 2024-01-01\n1: x\nnested: {when: 2024-01-01T10:00:00, items: [1, 2.5, null]}\n"
+    assert yaml_to_dict(text) == json.loads(yaml_to_json(text))
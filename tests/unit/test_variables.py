@@ -0,0 +1,84 @@
+import pytest
+
+from Babylon.utils import variables
+from Babylon.utils.variables import VariablesFileEditor, VariablesFileError, VariableStore
+
+CONTENT = """# Babylon variables
+organization_name: "{{ org }}"  # templated
+expertview:
+  uuid: old-uuid
+  original_id: '3'
+"""
+
+
+def test_editor_applies_updates_in_one_write_and_keeps_comments(tmp_path):
+    path = tmp_path / "variables.yaml"
+    path.write_text(CONTENT, encoding="utf-8")
+
+    with VariablesFileEditor(path) as editor:
+        assert editor.update_entry("expertview", {"uuid": "new-uuid", "original_id": "3"})
+        assert editor.update_entry("overview", {"uuid": "u-2"})
+        assert [change.key for change in editor.changes] == ["expertview", "overview"]
+        assert editor.changes[0].old == {"uuid": "old-uuid", "original_id": "3"}
+        # Nothing written before the end of the transaction
+        assert path.read_text(encoding="utf-8") == CONTENT
+
+    text = path.read_text(encoding="utf-8")
+    assert '# Babylon variables\norganization_name: "{{ org }}"  # templated' in text
+    assert "uuid: new-uuid" in text and "overview:\n  uuid: u-2" in text
+    assert not list(tmp_path.glob(".variables.yaml.*"))
+
+
+def test_editor_leaves_file_untouched_without_changes(tmp_path):
+    path = tmp_path / "variables.yaml"
+    path.write_text(CONTENT, encoding="utf-8")
+    mtime = path.stat().st_mtime_ns
+
+    with VariablesFileEditor(path) as editor:
+        assert not editor.update_entry("expertview", {"uuid": "old-uuid", "original_id": "3"})
+        assert not editor.changed
+    assert not editor.commit()
+    assert path.stat().st_mtime_ns == mtime
+
+
+def test_editor_discards_updates_on_error(tmp_path):
+    path = tmp_path / "variables.yaml"
+    path.write_text(CONTENT, encoding="utf-8")
+    try:
+        with VariablesFileEditor(path) as editor:
+            editor.update_entry("expertview", {"uuid": "new-uuid"})
+            raise RuntimeError("interrupted")
+    except RuntimeError:
+        pass
+    assert path.read_text(encoding="utf-8") == CONTENT
+
+
+def test_store_parses_files_once_and_reloads_changed_files(tmp_path, monkeypatch):
+    first, second = tmp_path / "a.yaml", tmp_path / "b.yaml"
+    first.write_text("a: 1\nshared: x\n", encoding="utf-8")
+    second.write_text("b: 2\n", encoding="utf-8")
+    store = VariableStore([first, second])
+
+    parsed = []
+    real_load = variables.safe_load
+    monkeypatch.setattr(variables, "safe_load", lambda stream: parsed.append(stream.name) or real_load(stream))
+
+    merged = store.merged()
+    assert merged.data == {"a": 1, "shared": "x", "b": 2} and not merged.duplicates
+    merged.data["a"] = "mutated"
+    assert store.merged().data["a"] == 1
+    assert len(parsed) == 2
+
+    # Atomic rewrite, as done by VariablesFileEditor: only that file is parsed again
+    with VariablesFileEditor(second) as editor:
+        editor.update_entry("shared", {"uuid": "u"})
+    merged = store.merged()
+    assert merged.duplicates == {"shared": [str(first), str(second)]}
+    assert parsed == [str(first), str(second), str(second)]
+
+
+def test_store_rejects_empty_files(tmp_path):
+    empty = tmp_path / "empty.yaml"
+    empty.write_text("", encoding="utf-8")
+    with pytest.raises(VariablesFileError, match="is empty"):
+        VariableStore([empty]).merged()
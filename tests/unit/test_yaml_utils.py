@@ -0,0 +1,21 @@
+import datetime
+
+import yaml
+
+from Babylon.utils.yaml_utils import dump, safe_dump, safe_load
+
+
+class Name(str):
+    pass
+
+
+def test_fast_path_output_matches_pyyaml():
+    data = {"services": {"api": {"organization_id": "o-1", "names": ["é", None, 1.5]}}, "at": datetime.date(2024, 1, 1)}
+    assert dump(data) == yaml.dump(data)
+    assert dump(data, allow_unicode=True, sort_keys=False) == yaml.dump(data, allow_unicode=True, sort_keys=False)
+    assert safe_dump(data) == yaml.safe_dump(data)
+    assert safe_load(dump(data)) == yaml.safe_load(yaml.dump(data))
+
+
+def test_dump_falls_back_for_objects_the_safe_dumper_rejects():
+    assert dump({"name": Name("x")}) == yaml.dump({"name": Name("x")})